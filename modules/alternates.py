@@ -0,0 +1,82 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, List, Optional
+
+class AlternateGenerator:
+    """
+    ΔΩ-SYSTEM_5: PARALLEL REALITIES
+    Issues the n-1 alternate continuations of a stream window at the same time and
+    collects whatever arrives before the window's deadline. Late or failed alternates
+    are dropped, so a slow backend thins the variance sample instead of stalling the stream.
+    A call that already started cannot be cancelled and keeps its thread, so at most
+    `max_workers` calls are in flight: requests beyond that are shed, not queued behind
+    a stuck backend.
+    """
+    def __init__(self, max_workers: int = 8, deadline: float = 0.5):
+        self.max_workers = max_workers
+        self.deadline = deadline
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self.requested = 0
+        self.late = 0
+        self.failed = 0
+        self.shed = 0
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger("AlternateGenerator")
+
+    def generate(self, fn: Callable[[str], str], prompt: str, k: int, deadline: Optional[float] = None) -> List[str]:
+        """
+        Calls fn(prompt) k times concurrently and returns the results that completed
+        within `deadline` seconds, in submission order.
+        """
+        if k <= 0:
+            return []
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="alternate")
+
+        deadline = self.deadline if deadline is None else deadline
+        start = time.perf_counter()
+        with self._lock:
+            admitted = max(0, min(k, self.max_workers - self.in_flight))
+            self.in_flight += admitted
+        self.requested += k
+        if admitted < k:
+            self.shed += k - admitted
+            self.logger.warning(f"{k - admitted}/{k} alternates shed: pool busy with {self.in_flight} calls")
+        if not admitted:
+            return []
+
+        futures = [self._pool.submit(fn, prompt) for _ in range(admitted)]
+        for future in futures:
+            future.add_done_callback(self._finished)
+        done, pending = wait(futures, timeout=deadline)
+
+        for future in pending:
+            # Not started yet: never run it. Already running: its result is ignored.
+            future.cancel()
+
+        alternates = []
+        for future in futures:
+            if future not in done:
+                continue
+            if future.exception() is not None:
+                self.failed += 1
+                continue
+            alternates.append(future.result())
+
+        self.late += len(pending)
+        if pending:
+            self.logger.warning(f"{len(pending)}/{admitted} alternates missed the {deadline * 1000:.0f}ms window "
+                                f"({(time.perf_counter() - start) * 1000:.0f}ms)")
+        return alternates
+
+    def _finished(self, future):
+        with self._lock:
+            self.in_flight -= 1
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
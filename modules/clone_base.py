@@ -1,11 +1,57 @@
 import asyncio
 import random
-from typing import Optional
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import numpy as np
 from .territory_manager import TerritoryManager
 from .auditor_core import AuditorCore, InsufficientROIException, DrawdownViolationException
 from .safety_gasket import System5Gasket
 from .market_oracle import MarketOracle
 
+class LatencyLedger:
+    """
+    Per-clone wall time by lifecycle stage. Keeps the last `window` samples of each
+    stage for percentiles, plus running counts and totals.
+    """
+    def __init__(self, window: int = 500):
+        self.window = window
+        self.samples: Dict[str, deque] = {}
+        self.counts: Dict[str, int] = {}
+        self.totals: Dict[str, float] = {}
+
+    @contextmanager
+    def measure(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def record(self, stage: str, seconds: float):
+        if stage not in self.samples:
+            self.samples[stage] = deque(maxlen=self.window)
+            self.counts[stage] = 0
+            self.totals[stage] = 0.0
+        self.samples[stage].append(seconds)
+        self.counts[stage] += 1
+        self.totals[stage] += seconds
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        report = {}
+        for stage, samples in self.samples.items():
+            ms = np.asarray(samples) * 1000
+            report[stage] = {
+                "count": self.counts[stage],
+                "p50_ms": float(np.percentile(ms, 50)),
+                "p95_ms": float(np.percentile(ms, 95)),
+                "max_ms": float(ms.max()),
+                "total_ms": self.totals[stage] * 1000,
+            }
+        return report
+
 class CloneBase:
     """
     The Base Unit of the Swarm.
@@ -27,8 +73,10 @@ class CloneBase:
         
         # SYSTEM 5 WIRED: The Ethical Layer
         self.gasket = System5Gasket()
-        # SYSTEM 4 WIRED: The Sensor Array
-        self.oracle = MarketOracle()
+        # SYSTEM 4 WIRED: The Sensor Array (one shared, rate-limited oracle per process)
+        self.oracle = MarketOracle.shared()
+        # Time spent per lifecycle stage (latency.snapshot())
+        self.latency = LatencyLedger()
 
     async def run(self):
         """
@@ -37,69 +85,86 @@ class CloneBase:
         print(f"[{self.id}] ACTIVATED | Strategy: {self.strategy} | Target: {self.target_pair}")
         symbol = self.target_pair.split('/')[0] if '/' in self.target_pair else self.target_pair
         
-        while self.active:
-            try:
-                # 1. Self-Preservation Check (Every Loop)
-                # In a real scenario, equity comes from wallet state
-                # Mocking equity for now
-                current_equity = self.auditor.initial_capital # Placeholder
-                self.auditor.verify_solvency(current_equity, self.id)
+        # Subscribe to the shared oracle's price stream (starts its background refresher)
+        prices = self.oracle.subscribe([symbol])
+        try:
+            while self.active:
+                try:
+                    # 1. Self-Preservation Check (Every Loop)
+                    # In a real scenario, equity comes from wallet state
+                    # Mocking equity for now
+                    current_equity = self.auditor.initial_capital # Placeholder
+                    self.auditor.verify_solvency(current_equity, self.id)
 
-                # 2. Opportunity Scan (Real Market Data)
-                await asyncio.sleep(random.uniform(0.5, 2.0)) # Hunting...
+                    # 2. Opportunity Scan (Real Market Data)
+                    # Hunting... the oracle pushes fresh prices; the clone never waits on a fetch
+                    with self.latency.measure("price_wait"):
+                        update = await prices.get(timeout=random.uniform(0.5, 2.0))
+                    if update is None:
+                        continue
                 
-                # Fetch Real Kinetic Data
-                current_price = self.oracle.get_price(symbol)
-                kinetic_entropy = self.oracle.get_kinetic_entropy(symbol)
+                    # Real Kinetic Data
+                    current_price = self.oracle.price_of(update[1])
+                    kinetic_entropy = self.oracle.entropy_of(update[1], symbol)
                 
-                # If Oracle Fails (Price=0), assume no opportunity
-                found_opportunity = current_price > 0
+                    # If Oracle Fails (Price=0), assume no opportunity
+                    found_opportunity = current_price > 0
                 
-                if found_opportunity:
+                    if found_opportunity:
                     
-                    # 3. Territory Acquisition (Inhibitor Chip)
-                    acquired = await self.territory_manager.acquire_territory(self.target_pair, self.id)
+                        # 3. Territory Acquisition (Inhibitor Chip)
+                        with self.latency.measure("territory"):
+                            acquired = await self.territory_manager.acquire_territory(self.target_pair, self.id)
                     
-                    if acquired:
-                        try:
-                            # 4. Auditor Check (The Hunger)
-                            # Mocking Profit Est (Strategy Logic would go here)
-                            est_profit_usd = random.uniform(0.01, 1.00) 
-                            trade_size_usd = 400.00
+                        if acquired:
+                            try:
+                                # 4. Auditor Check (The Hunger)
+                                # Mocking Profit Est (Strategy Logic would go here)
+                                est_profit_usd = random.uniform(0.01, 1.00) 
+                                trade_size_usd = 400.00
                             
-                            self.auditor.verify_opportunity(est_profit_usd, trade_size_usd)
+                                self.auditor.verify_opportunity(est_profit_usd, trade_size_usd)
                             
-                            # 5. STP: CONSTITUTIONAL CLEARANCE (The Brain Check)
-                            # The Hand cannot move without the Brain's signature.
-                            # ASH PROTOCOL: Passing Kinetic Entropy for metabolic validation
-                            cct = self.gasket.issue_constitutional_token(
-                                intent=f"EXECUTE_TRADE::{self.target_pair}::{current_price}",
-                                kinetic_entropy=kinetic_entropy
-                            )
+                                # 5. STP: CONSTITUTIONAL CLEARANCE (The Brain Check)
+                                # The Hand cannot move without the Brain's signature.
+                                # ASH PROTOCOL: Passing Kinetic Entropy for metabolic validation
+                                with self.latency.measure("clearance"):
+                                    cct = await self.gasket.aissue_constitutional_token(
+                                        intent=f"EXECUTE_TRADE::{self.target_pair}::{current_price}",
+                                        kinetic_entropy=kinetic_entropy
+                                    )
                             
-                            if not cct:
-                                raise PermissionError(f"SYSTEM 5 VETO: Constitutional Token Denied. Entropy: {kinetic_entropy:.4f}")
+                                    if not cct:
+                                        raise PermissionError(f"SYSTEM 5 VETO: Constitutional Token Denied. Entropy: {kinetic_entropy:.4f}")
                             
-                            # 5. Execution (Simulated)
-                            token_id = cct.split('|')[1][:8]
-                            print(f"[{self.id}] EXECUTING TRADE on {self.target_pair} (${current_price:.2f}) | Profit Est: ${est_profit_usd:.2f} | CCT: {token_id} | Entropy: {kinetic_entropy:.4f}")
-                            await asyncio.sleep(0.2) # Execution Latency
+                                    # The Hand re-checks the signature: TTL, replay and tampering
+                                    cleared, reason = await self.gasket.token_verifier.averify(cct)
+                                if not cleared:
+                                    raise PermissionError(f"SYSTEM 5 VETO: Constitutional Token Rejected ({reason})")
+
+                                # 5. Execution (Simulated)
+                                token_id = cct.rpartition('|')[2][:8]
+                                print(f"[{self.id}] EXECUTING TRADE on {self.target_pair} (${current_price:.2f}) | Profit Est: ${est_profit_usd:.2f} | CCT: {token_id} | Entropy: {kinetic_entropy:.4f}")
+                                with self.latency.measure("execution"):
+                                    await asyncio.sleep(0.2) # Execution Latency
                             
-                        except InsufficientROIException as e:
-                            print(f"[{self.id}] VETO: {e}")
-                        except Exception as e:
-                            print(f"[{self.id}] ERROR: {e}")
-                        finally:
-                            # 6. Release Territory
-                            await self.territory_manager.release_territory(self.target_pair, self.id)
-                    else:
-                        # Territory occupied by Fratricide Protection
-                        print(f"[{self.id}] BLOCKED: Territory {self.target_pair} Occupied.")
+                            except InsufficientROIException as e:
+                                print(f"[{self.id}] VETO: {e}")
+                            except Exception as e:
+                                print(f"[{self.id}] ERROR: {e}")
+                            finally:
+                                # 6. Release Territory
+                                await self.territory_manager.release_territory(self.target_pair, self.id)
+                        else:
+                            # Territory occupied by Fratricide Protection
+                            print(f"[{self.id}] BLOCKED: Territory {self.target_pair} Occupied.")
                         
-            except DrawdownViolationException:
-                print(f"[{self.id}] SUICIDE PROTOCOL: Drawdown Max Reached. Terminating.")
-                self.active = False
-                break
-            except Exception as e:
-                print(f"[{self.id}] CRITICAL FAILURE: {e}")
-                await asyncio.sleep(5)
+                except DrawdownViolationException:
+                    print(f"[{self.id}] SUICIDE PROTOCOL: Drawdown Max Reached. Terminating.")
+                    self.active = False
+                    break
+                except Exception as e:
+                    print(f"[{self.id}] CRITICAL FAILURE: {e}")
+                    await asyncio.sleep(5)
+        finally:
+            prices.close()
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Sequence
+
+class CompletionCache:
+    """
+    ΔΩ-INTELLIGENCE: DETERMINISTIC COMPLETION CACHE
+    On-disk cache of temperature-0 completions keyed by sha256(model, system_prompt,
+    prompt, temperature, max_tokens). Entries expire after `ttl` seconds and the least
+    recently used are evicted beyond `max_entries`; the eviction pass only runs once an
+    insert takes the row count past that bound. sqlite in WAL mode, so several
+    processes can share one file. A hit only rewrites `used_at` once it is older than
+    `touch_interval`, so a hot key costs no disk write per read; LRU order is exact to
+    that interval.
+    """
+    def __init__(self, db_path: str = "completion_cache.db", ttl: float = 7 * 24 * 3600, max_entries: int = 10000,
+                 touch_interval: float = 60.0):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.touch_interval = touch_interval
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS completions "
+            "(key BLOB PRIMARY KEY, completion TEXT, created_at REAL, used_at REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS completions_used_at ON completions (used_at)")
+        self._db.commit()
+        # Rows in the file as far as this process knows (replaces and other processes'
+        # inserts make it drift); re-counted exactly whenever it passes max_entries
+        self._entries = self._db.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+
+    @staticmethod
+    def key(model: str, system_prompt: str, prompt: str, temperature: float, max_tokens: Optional[int]) -> bytes:
+        material = json.dumps([model, system_prompt, prompt, temperature, max_tokens], ensure_ascii=False)
+        return hashlib.sha256(material.encode("utf-8")).digest()
+
+    def get(self, key: bytes) -> Optional[str]:
+        return self.get_any([key])
+
+    def get_any(self, keys: Sequence[bytes]) -> Optional[str]:
+        """First live completion among `keys`; counts as a single hit or miss."""
+        now = time.time()
+        with self._lock:
+            for key in keys:
+                row = self._db.execute(
+                    "SELECT completion, created_at, used_at FROM completions WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    continue
+                if now - row[1] > self.ttl:
+                    self._db.execute("DELETE FROM completions WHERE key = ?", (key,))
+                    self._db.commit()
+                    continue
+                if now - row[2] >= self.touch_interval:
+                    self._db.execute("UPDATE completions SET used_at = ? WHERE key = ?", (now, key))
+                    self._db.commit()
+                self.hits += 1
+                return row[0]
+            self.misses += 1
+            return None
+
+    def put(self, key: bytes, completion: str):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO completions (key, completion, created_at, used_at) VALUES (?, ?, ?, ?)",
+                (key, completion, now, now)
+            )
+            self._entries += 1
+            if self._entries > self.max_entries:
+                self._evict(now)
+            self._db.commit()
+
+    def _evict(self, now: float):
+        """Expired rows first, then least recently used beyond the bound. Caller holds the lock."""
+        self._db.execute("DELETE FROM completions WHERE created_at < ?", (now - self.ttl,))
+        self._db.execute(
+            "DELETE FROM completions WHERE key IN "
+            "(SELECT key FROM completions ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+        self._entries = self._db.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,134 @@
+import hashlib
+import hmac
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+CAGE_CODE = "17TJ5"
+# Placeholder Key - In production, this comes from HSM/Vault
+SENTINEL_ROOT_KEY = b"spiralos-dojo-sovereign-key-v1"
+# Clearance tokens are good for 500ms after issuance
+TOKEN_TTL = 0.5
+# Tolerated issuer/verifier clock drift for timestamps slightly in the future
+CLOCK_SKEW = 0.05
+
+class ConstitutionalTokenService:
+    """
+    ΔΩ-SYSTEM_5: CONSTITUTIONAL CLEARANCE TOKEN (CCT) MINT
+    Token Format: "CAGE:TIMESTAMP:SCAR_INDEX:KINETIC_ENTROPY:INTENT|HMAC_SHA256_HEX"
+    The key schedule runs once: every token signs from a copy of the pre-keyed HMAC.
+    Timestamps are strictly increasing per service, so two tokens never share a payload.
+    """
+    def __init__(self, key: bytes = SENTINEL_ROOT_KEY, cage_code: str = CAGE_CODE):
+        self.cage_code = cage_code
+        self._mac = hmac.new(key, digestmod=hashlib.sha256)
+        self._last_timestamp = 0.0
+        self._lock = threading.Lock()
+        self.issued = 0
+
+    def _timestamp(self) -> float:
+        with self._lock:
+            now = time.time()
+            if now <= self._last_timestamp:
+                now = self._last_timestamp + 1e-6
+            self._last_timestamp = now
+            self.issued += 1
+            return now
+
+    def _sign(self, payload: str) -> str:
+        mac = self._mac.copy()
+        mac.update(payload.encode('utf-8'))
+        return f"{payload}|{mac.hexdigest()}"
+
+    def issue(self, intent: str, scar_index: float, kinetic_entropy: float = 0.0) -> str:
+        payload = f"{self.cage_code}:{self._timestamp()}:{scar_index:.4f}:{kinetic_entropy:.4f}:{intent}"
+        return self._sign(payload)
+
+    def issue_batch(self, intents: List[str], scar_index: float, kinetic_entropy: float = 0.0) -> List[str]:
+        """One token per intent, sharing the scar/entropy fields formatted once."""
+        state = f"{scar_index:.4f}:{kinetic_entropy:.4f}"
+        return [self._sign(f"{self.cage_code}:{self._timestamp()}:{state}:{intent}") for intent in intents]
+
+class ConstitutionalTokenVerifier:
+    """
+    Checks a CCT before execution: signature (constant-time), cage code, TTL and replay.
+    Returns (ok, reason) with reason one of VALID, MALFORMED, FOREIGN_CAGE,
+    BAD_SIGNATURE, EXPIRED, REPLAYED.
+
+    Replay cache: accepted signatures are filed in time buckets by the expiry their
+    payload timestamp implies, so a lookup touches one bucket and a whole bucket is
+    dropped once everything in it has expired. Only unexpired tokens are ever held, so
+    memory is bounded by (TTL + clock skew) x verification rate.
+    """
+    def __init__(self, key: bytes = SENTINEL_ROOT_KEY, cage_code: str = CAGE_CODE,
+                 ttl: float = TOKEN_TTL, clock_skew: float = CLOCK_SKEW, buckets: int = 10):
+        self.cage_code = cage_code
+        self.ttl = ttl
+        self.clock_skew = clock_skew
+        self.bucket_width = ttl / buckets
+        self._mac = hmac.new(key, digestmod=hashlib.sha256)
+        self._buckets: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.outcomes: Dict[str, int] = {}
+
+    def verify(self, token: str, now: Optional[float] = None) -> Tuple[bool, str]:
+        ok, reason = self._check(token, time.time() if now is None else now)
+        self.outcomes[reason] = self.outcomes.get(reason, 0) + 1
+        return ok, reason
+
+    async def averify(self, token: str) -> Tuple[bool, str]:
+        """
+        Event-loop entry point for the execution layer. A check is a few microseconds
+        of HMAC and a set lookup and never blocks, so it runs inline: an executor hop
+        would cost more than the check itself.
+        """
+        return self.verify(token)
+
+    async def averify_many(self, tokens: Iterable[str]) -> List[Tuple[bool, str]]:
+        """Verifies a batch against one clock reading."""
+        now = time.time()
+        return [self.verify(token, now) for token in tokens]
+
+    def _check(self, token: str, now: float) -> Tuple[bool, str]:
+        payload, sep, signature = token.rpartition('|') if token else ("", "", "")
+        if not sep:
+            return False, "MALFORMED"
+        fields = payload.split(':', 4)
+        if len(fields) != 5:
+            return False, "MALFORMED"
+        if fields[0] != self.cage_code:
+            return False, "FOREIGN_CAGE"
+
+        mac = self._mac.copy()
+        mac.update(payload.encode('utf-8'))
+        if not hmac.compare_digest(mac.hexdigest(), signature):
+            return False, "BAD_SIGNATURE"
+
+        try:
+            issued_at = float(fields[1])
+        except ValueError:
+            return False, "MALFORMED"
+        if now - issued_at > self.ttl or issued_at - now > self.clock_skew:
+            return False, "EXPIRED"
+
+        # A replay carries the same payload, hence the same timestamp and bucket
+        bucket_id = int((issued_at + self.ttl) // self.bucket_width)
+        with self._lock:
+            bucket = self._buckets.get(bucket_id)
+            if bucket is None:
+                self._evict(now)
+                bucket = self._buckets[bucket_id] = set()
+            elif signature in bucket:
+                return False, "REPLAYED"
+            bucket.add(signature)
+        return True, "VALID"
+
+    def _evict(self, now: float):
+        """Drops buckets whose latest possible expiry has passed (called under the lock)."""
+        expired = int(now // self.bucket_width)
+        for bucket_id in [b for b in self._buckets if b < expired]:
+            del self._buckets[bucket_id]
+
+    @property
+    def cached(self) -> int:
+        return sum(len(bucket) for bucket in self._buckets.values())
@@ -0,0 +1,140 @@
+import hashlib
+import sqlite3
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+class EmbeddingCache:
+    """
+    ΔΩ-SYSTEM_5: CONTENT-ADDRESSED EMBEDDING CACHE
+    Vectors keyed by sha256(model, text). A bounded in-memory LRU tier sits in front of
+    an optional sqlite tier that survives restarts and is shared between processes.
+    """
+    def __init__(self, max_entries: int = 4096, db_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self._memory: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, dims INTEGER, vector BLOB)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def key(model: str, text: str) -> bytes:
+        return hashlib.sha256(f"{model}\x00{text}".encode("utf-8")).digest()
+
+    def get_many(self, model: str, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Cached vector per text, or None for a miss. Disk hits are promoted to memory."""
+        keys = [self.key(model, t) for t in texts]
+        found: List[Optional[np.ndarray]] = [None] * len(texts)
+        pending = []
+        with self._lock:
+            for i, k in enumerate(keys):
+                vector = self._memory.get(k)
+                if vector is not None:
+                    self._memory.move_to_end(k)
+                    self.hits += 1
+                    found[i] = vector
+                else:
+                    pending.append(i)
+
+            if pending and self._db is not None:
+                wanted = {keys[i]: i for i in pending}
+                placeholders = ",".join("?" * len(wanted))
+                rows = self._db.execute(
+                    f"SELECT key, dims, vector FROM embeddings WHERE key IN ({placeholders})", list(wanted)
+                ).fetchall()
+                for k, dims, blob in rows:
+                    vector = self._decode(blob, dims)
+                    found[wanted[k]] = vector
+                    self._remember(k, vector)
+                    self.disk_hits += 1
+
+            self.misses += sum(1 for v in found if v is None)
+        return found
+
+    def put_many(self, model: str, texts: List[str], vectors: np.ndarray):
+        keys = [self.key(model, t) for t in texts]
+        with self._lock:
+            for k, vector in zip(keys, vectors):
+                self._remember(k, self._freeze(vector))
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, dims, vector) VALUES (?, ?, ?)",
+                    [(k, len(v), np.asarray(v, dtype="<f4").tobytes()) for k, v in zip(keys, vectors)]
+                )
+                self._db.commit()
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            "entries": len(self._memory),
+        }
+
+    def _remember(self, k: bytes, vector: np.ndarray):
+        self._memory[k] = vector
+        self._memory.move_to_end(k)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    @staticmethod
+    def _freeze(vector) -> np.ndarray:
+        vector = np.array(vector, dtype=np.float32)
+        vector.flags.writeable = False
+        return vector
+
+    @staticmethod
+    def _decode(blob: bytes, dims: int) -> np.ndarray:
+        return np.frombuffer(blob, dtype="<f4", count=dims).astype(np.float32)
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+class CachedEmbedder:
+    """
+    Wraps any embedder exposing embed(texts) -> matrix and `model_name`.
+    Duplicate texts inside a call are embedded once; cached texts are not sent at all.
+    """
+    def __init__(self, backend, cache: Optional[EmbeddingCache] = None):
+        self.backend = backend
+        self.cache = cache or EmbeddingCache()
+
+    @property
+    def model_name(self) -> str:
+        return self.backend.model_name
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        unique = list(dict.fromkeys(texts))
+        model = self.model_name
+        cached = self.cache.get_many(model, unique)
+
+        missing = [t for t, v in zip(unique, cached) if v is None]
+        if missing:
+            fresh = self.backend.embed(missing)
+            self.cache.put_many(model, missing, fresh)
+            fresh_by_text = dict(zip(missing, fresh))
+            cached = [v if v is not None else fresh_by_text[t] for t, v in zip(unique, cached)]
+
+        by_text = dict(zip(unique, cached))
+        return np.stack([by_text[t] for t in texts]).astype(np.float32, copy=False)
+
+    def close(self):
+        self.backend.close()
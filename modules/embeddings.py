@@ -0,0 +1,222 @@
+import base64
+import logging
+import numpy as np
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+SOVEREIGN_EMBED_ENDPOINT = "https://xlmrnjatawslawquwzpf.supabase.co/functions/v1/sovereign_embed"
+# In-process ONNX model (see tools/benchmark_embeddings.py)
+LOCAL_EMBED_MODEL = "BAAI/bge-small-en-v1.5"
+
+# Texts per request; matches MAX_BATCH in supabase/functions/sovereign_embed
+MAX_BATCH = 256
+# Status codes an endpoint without batch support answers a list payload with
+# (413 is not one of them: it means the batch was too large, not that lists are refused)
+BATCH_UNSUPPORTED = (400, 404, 422)
+
+class EmbeddingError(Exception):
+    pass
+
+def embedding_variance(matrix: np.ndarray) -> float:
+    """
+    Semantic variance (Ache): mean L2 distance of each embedding from the centroid.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    centroid = matrix.mean(axis=0)
+    return float(np.linalg.norm(matrix - centroid, axis=1).mean())
+
+class EmbeddingBackend:
+    """
+    Interface for the gasket's embedders: `model_name` identifies the vector space
+    (it is part of the cache key) and embed(texts) returns an (n, dims) float32
+    matrix, one row per text, in input order.
+    """
+    model_name: str = None
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class SovereignEmbedder(EmbeddingBackend):
+    """
+    ΔΩ-SYSTEM_5: SOVEREIGN EMBEDDING CLIENT
+    Batched client for the sovereign_embed edge function over one pooled keep-alive session.
+    Texts go out in requests of up to MAX_BATCH; if the endpoint refuses batches, they
+    are fanned out concurrently over the same connection pool instead.
+    """
+    model_name = "sovereign-minilm-l6"
+
+    def __init__(self,
+                 endpoint: str = SOVEREIGN_EMBED_ENDPOINT,
+                 timeout: float = 5,
+                 max_concurrency: int = 8,
+                 session: Optional[requests.Session] = None):
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.batch_supported = True
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self.logger = logging.getLogger("SovereignEmbedder")
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Returns an (n, dims) float32 matrix, one row per text, in input order.
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        if len(texts) > MAX_BATCH:
+            return np.concatenate([self.embed(texts[i:i + MAX_BATCH]) for i in range(0, len(texts), MAX_BATCH)])
+
+        if self.batch_supported and len(texts) > 1:
+            response = self.session.post(self.endpoint, json={"input": list(texts)}, timeout=self.timeout)
+            if response.status_code == 200:
+                return self._parse_batch(response.json(), len(texts))
+            if response.status_code not in BATCH_UNSUPPORTED:
+                self._degraded(response.status_code)
+            self.logger.warning(f"Batch embedding refused ({response.status_code}); fanning out per text.")
+            self.batch_supported = False
+
+        if len(texts) == 1:
+            return np.asarray([self._embed_one(texts[0])], dtype=np.float32)
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="embed")
+        return np.asarray(list(self._pool.map(self._embed_one, texts)), dtype=np.float32)
+
+    def _embed_one(self, text: str) -> List[float]:
+        response = self.session.post(self.endpoint, json={"input": text}, timeout=self.timeout)
+        if response.status_code != 200:
+            self._degraded(response.status_code)
+        return response.json()['embedding']
+
+    def _parse_batch(self, payload: dict, expected: int) -> np.ndarray:
+        if 'data' in payload:
+            # Packed response: base64 little-endian float32 rows
+            raw = base64.b64decode(payload['data'])
+            matrix = np.frombuffer(raw, dtype='<f4').reshape(payload['count'], payload['dims'])
+        else:
+            matrix = np.asarray(payload['embeddings'], dtype=np.float32)
+        if matrix.shape[0] != expected:
+            raise EmbeddingError(f"API_FAILURE: expected {expected} embeddings, got {matrix.shape[0]}")
+        return matrix
+
+    def _degraded(self, status_code: int):
+        self.logger.warning(f"Embedding Endpoint degradation: {status_code}")
+        raise EmbeddingError(f"API_FAILURE: {status_code}")
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+        self.session.close()
+
+# fastembed models are loaded once per process and shared by every LocalEmbedder
+_LOCAL_MODELS: Dict[str, object] = {}
+_LOCAL_MODELS_LOCK = threading.Lock()
+
+class LocalEmbedder(EmbeddingBackend):
+    """
+    ΔΩ-SYSTEM_5: IN-PROCESS EMBEDDING BACKEND
+    Runs the ONNX model through fastembed, so there is no network hop per call.
+    The model is loaded once and warmed at construction; embed() runs one batched inference.
+    """
+    def __init__(self, model_name: str = LOCAL_EMBED_MODEL, batch_size: int = 64, warm: bool = True):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.logger = logging.getLogger("LocalEmbedder")
+        self.model = self._load(model_name)
+        if warm:
+            # First inference initialises the ONNX graph; pay for it at startup, not in verify_safety
+            self.embed(["warmup"])
+
+    def _load(self, model_name: str):
+        with _LOCAL_MODELS_LOCK:
+            model = _LOCAL_MODELS.get(model_name)
+            if model is None:
+                try:
+                    from fastembed import TextEmbedding
+                except ImportError as e:
+                    raise ImportError("LocalEmbedder requires the 'fastembed' package") from e
+                start = time.perf_counter()
+                model = TextEmbedding(model_name=model_name)
+                _LOCAL_MODELS[model_name] = model
+                self.logger.info(f"Loaded {model_name} in {time.perf_counter() - start:.2f}s")
+        return model
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        # fastembed yields one vector per text
+        return np.asarray(list(self.model.embed(list(texts), batch_size=self.batch_size)), dtype=np.float32)
+
+class FailoverEmbedder(EmbeddingBackend):
+    """
+    Routes to `primary` (the remote endpoint) while it is healthy and to `fallback`
+    (the local model) while it is failing or slow. Primary latency is tracked as an
+    EWMA; once it exceeds `slow_ms`, or a call raises, the primary is benched for
+    `retry_interval` seconds and then probed again with the next call.
+    """
+    def __init__(self,
+                 primary: EmbeddingBackend,
+                 fallback: EmbeddingBackend,
+                 slow_ms: float = 250.0,
+                 alpha: float = 0.2,
+                 retry_interval: float = 30.0):
+        self.primary = primary
+        self.fallback = fallback
+        self.slow_ms = slow_ms
+        self.alpha = alpha
+        self.retry_interval = retry_interval
+        self.latency_ms: Optional[float] = None
+        self.benched_until = 0.0
+        self.failovers = 0
+        self.logger = logging.getLogger("FailoverEmbedder")
+
+    @property
+    def active(self) -> EmbeddingBackend:
+        return self.fallback if time.monotonic() < self.benched_until else self.primary
+
+    @property
+    def model_name(self) -> str:
+        return self.active.model_name
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        if self.active is self.fallback:
+            return self.fallback.embed(texts)
+
+        probing = self.benched_until > 0.0
+        start = time.perf_counter()
+        try:
+            matrix = self.primary.embed(texts)
+        except Exception as e:
+            self._bench(f"primary failed: {e}")
+            return self.fallback.embed(texts)
+
+        sample = (time.perf_counter() - start) * 1000
+        if probing or self.latency_ms is None:
+            # A probe starts a fresh estimate instead of being diluted by the old slow one
+            self.latency_ms = sample
+        else:
+            self.latency_ms += self.alpha * (sample - self.latency_ms)
+        self.benched_until = 0.0
+        if self.latency_ms > self.slow_ms:
+            self._bench(f"primary latency {self.latency_ms:.0f}ms > {self.slow_ms:.0f}ms")
+        return matrix
+
+    def _bench(self, reason: str):
+        self.failovers += 1
+        self.benched_until = time.monotonic() + self.retry_interval
+        self.logger.warning(f"Embedding failover to {self.fallback.model_name} for {self.retry_interval:.0f}s ({reason})")
+
+    def close(self):
+        self.primary.close()
+        self.fallback.close()
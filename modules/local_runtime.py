@@ -0,0 +1,314 @@
+import itertools
+import logging
+import multiprocessing as mp
+import multiprocessing.connection
+import os
+import queue
+import threading
+from typing import Callable, Dict, Iterator, Optional, Set, Tuple
+
+DEFAULT_GGUF_PATH = os.getenv("SOVEREIGN_GGUF_PATH", "models/llama3-8b-instruct.Q4_K_M.gguf")
+
+# Worker -> pool messages: (kind, request_id or worker_id, payload)
+READY, FAILED, START, CHUNK, DONE, ERROR = "ready", "failed", "start", "chunk", "done", "error"
+# No request cancelled (request ids count up from 0)
+NO_REQUEST = -1
+
+def load_llama(model_path: str, n_ctx: int = 2048, n_threads: Optional[int] = None):
+    """Default loader: a llama.cpp model through llama-cpp-python (imported in the worker)."""
+    from llama_cpp import Llama
+    return Llama(model_path=model_path, n_ctx=n_ctx, n_threads=n_threads, verbose=False)
+
+def _worker(worker_id: int, loader: Callable, loader_args: Tuple, requests, responses, cancel):
+    """
+    Loads the model once, warms it with a one-token completion, then serves requests
+    from the shared queue until it receives None. Replies go on the worker's own pipe
+    (`responses`): a worker dying mid-send can't wedge a lock the others write under.
+    Between tokens it stops decoding a request whose id the pool wrote to `cancel`.
+    """
+    try:
+        model = loader(*loader_args)
+        model("warmup", max_tokens=1)
+    except Exception as e:
+        responses.send((FAILED, worker_id, repr(e)))
+        return
+    responses.send((READY, worker_id, None))
+
+    while True:
+        item = requests.get()
+        if item is None:
+            break
+        request_id, prompt, options = item
+        responses.send((START, request_id, worker_id))
+        try:
+            for part in model(prompt, stream=True, **options):
+                if cancel.value == request_id:
+                    break
+                text = part["choices"][0]["text"]
+                if text:
+                    responses.send((CHUNK, request_id, text))
+            responses.send((DONE, request_id, None))
+        except Exception as e:
+            responses.send((ERROR, request_id, repr(e)))
+
+class LocalModelPool:
+    """
+    ΔΩ-SYSTEM_2: LOCAL QUANTIZED RUNTIME
+    A pool of worker processes, each holding a pre-loaded, warmed GGUF model. Requests go
+    on one shared queue and a worker picks the next one up the moment it is free, so
+    load spreads across the pool with no per-request model load. A llama-cpp-python
+    model holds one KV sequence, so each worker decodes one request at a time and the
+    pool size is the batch width. A stream its consumer abandons is cancelled on its
+    worker, and a worker process that dies stops counting as ready.
+    """
+    def __init__(self,
+                 model_path: str = DEFAULT_GGUF_PATH,
+                 workers: int = 2,
+                 n_ctx: int = 2048,
+                 n_threads: Optional[int] = None,
+                 loader: Callable = load_llama,
+                 start_method: str = "spawn",
+                 timeout: float = 120.0,
+                 poll_interval: float = 0.5):
+        self.model_path = model_path
+        self.workers = workers
+        self.loader = loader
+        self.loader_args = (model_path, n_ctx, n_threads)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._ctx = mp.get_context(start_method)
+        self._processes = []
+        self._cancel = []  # per worker: id of the request it should stop decoding
+        self._pipes = []  # per worker: read end of its reply pipe
+        self._requests = None
+        self._closing = threading.Event()
+        self._streams: Dict[int, "queue.Queue"] = {}
+        self._queued: Set[int] = set()  # request ids no worker has picked up yet
+        self._running: Dict[int, int] = {}  # request id -> worker decoding it
+        self._abandoned: Set[int] = set()  # abandoned while still queued
+        self._live: Set[int] = set()  # warm workers whose process is still alive
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._collector: Optional[threading.Thread] = None
+        self.failed_workers = 0
+        self.cancelled = 0
+        self.logger = logging.getLogger("LocalModelPool")
+
+    @property
+    def started(self) -> bool:
+        return bool(self._processes)
+
+    @property
+    def ready_workers(self) -> int:
+        return len(self._live)
+
+    @property
+    def ready(self) -> bool:
+        return self.ready_workers > 0
+
+    def start(self, wait: bool = True) -> "LocalModelPool":
+        """Spawns and warms the workers; with wait=False warming continues in the background."""
+        if self.started:
+            return self
+        self._requests = self._ctx.Queue()
+        self._closing.clear()
+        for worker_id in range(self.workers):
+            cancel = self._ctx.Value("q", NO_REQUEST)
+            reader, writer = self._ctx.Pipe(duplex=False)
+            process = self._ctx.Process(
+                target=_worker,
+                args=(worker_id, self.loader, self.loader_args, self._requests, writer, cancel),
+                name=f"gguf-worker-{worker_id}",
+                daemon=True,
+            )
+            process.start()
+            writer.close()  # the worker holds the only write end: its exit reads as EOF
+            self._cancel.append(cancel)
+            self._pipes.append(reader)
+            self._processes.append(process)
+        self._collector = threading.Thread(target=self._collect, name="gguf-collector", daemon=True)
+        self._collector.start()
+        if wait:
+            self.wait_ready()
+        return self
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        return self._ready.wait(self.timeout if timeout is None else timeout)
+
+    def _collect(self):
+        """
+        Routes worker messages to the stream waiting on each request, and notices a worker
+        process exiting (its sentinel) the moment it happens.
+        """
+        pipes = dict(zip(self._pipes, range(self.workers)))
+        sentinels = {p.sentinel: w for w, p in enumerate(self._processes)}
+        while pipes or sentinels:
+            if self._closing.is_set():
+                return
+            for ready in mp.connection.wait(list(pipes) + list(sentinels), timeout=self.poll_interval):
+                if ready in pipes:
+                    try:
+                        self._route(ready.recv())
+                    except (EOFError, OSError):
+                        del pipes[ready]
+                elif ready in sentinels:
+                    worker_id = sentinels.pop(ready)
+                    pipe = self._pipes[worker_id]
+                    # Whatever the worker sent before exiting is delivered first
+                    while pipe in pipes and pipe.poll():
+                        try:
+                            self._route(pipe.recv())
+                        except (EOFError, OSError):
+                            del pipes[pipe]
+                    self._worker_exited(worker_id)
+
+    def _route(self, message: Tuple):
+        kind, key, payload = message
+        if kind == READY:
+            with self._lock:
+                self._live.add(key)
+            self.logger.info(f"Worker {key} warm ({self.ready_workers}/{self.workers}): {self.model_path}")
+            self._ready.set()
+            return
+        if kind == FAILED:
+            self._load_failed(key, payload)
+            return
+        with self._lock:
+            if kind == START:
+                self._queued.discard(key)
+                self._running[key] = payload
+                if key in self._abandoned:
+                    self._abandoned.discard(key)
+                    self._cancel[payload].value = key
+                return
+            if kind in (DONE, ERROR):
+                self._running.pop(key, None)
+            stream = self._streams.get(key)
+        if stream is not None:
+            stream.put((kind, payload))
+
+    def _load_failed(self, worker_id: int, reason: str):
+        self.failed_workers += 1
+        self.logger.error(f"Worker {worker_id} failed to load {self.model_path}: {reason}")
+        if self.failed_workers == self.workers:
+            self._ready.set()  # nobody is coming; release waiters
+
+    def _worker_exited(self, worker_id: int):
+        """A worker process is gone: it leaves the warm set and its request fails now, not at timeout."""
+        process = self._processes[worker_id]
+        process.join(timeout=1)  # the sentinel fires before the exit status is collected
+        exit_code = process.exitcode
+        with self._lock:
+            was_live = worker_id in self._live
+            self._live.discard(worker_id)
+            orphans = [r for r, w in self._running.items() if w == worker_id]
+            if not self._live:
+                # Nobody left to pick up the queue either
+                orphans += list(self._queued)
+                self._queued.clear()
+            for request_id in orphans:
+                self._running.pop(request_id, None)
+            streams = [self._streams.get(r) for r in orphans]
+        if self._closing.is_set():
+            return
+        if was_live:
+            self.logger.error(f"Worker {worker_id} died (exit code {exit_code}); "
+                              f"{self.ready_workers}/{self.workers} warm")
+        elif exit_code != 0:
+            self._load_failed(worker_id, f"exited with code {exit_code} while loading")
+        for stream in streams:
+            if stream is not None:
+                stream.put((ERROR, "worker process died"))
+
+    def stream(self, prompt: str, max_tokens: int = 256, temperature: Optional[float] = None) -> Iterator[str]:
+        """Yields completion text chunks as the worker produces them."""
+        if not self.ready:
+            raise RuntimeError("LocalModelPool has no warm workers")
+        options = {"max_tokens": max_tokens}
+        if temperature is not None:
+            options["temperature"] = temperature
+
+        request_id = next(self._ids)
+        chunks: "queue.Queue" = queue.Queue()
+        with self._lock:
+            self._streams[request_id] = chunks
+            self._queued.add(request_id)
+        self._requests.put((request_id, prompt, options))
+        finished = False
+        try:
+            while True:
+                try:
+                    kind, payload = chunks.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise TimeoutError(f"Local runtime produced nothing for {self.timeout:.0f}s")
+                if kind == CHUNK:
+                    yield payload
+                elif kind == DONE:
+                    finished = True
+                    return
+                else:
+                    finished = True
+                    raise RuntimeError(f"Local runtime error: {payload}")
+        finally:
+            with self._lock:
+                self._streams.pop(request_id, None)
+                if not finished:
+                    # Abandoned (closed early, timed out): free the worker instead of decoding on
+                    worker_id = self._running.get(request_id)
+                    if worker_id is not None:
+                        self._cancel[worker_id].value = request_id
+                        self.cancelled += 1
+                    elif request_id in self._queued:
+                        self._abandoned.add(request_id)
+                        self.cancelled += 1
+
+    def generate(self, prompt: str, max_tokens: int = 256, temperature: Optional[float] = None) -> str:
+        return "".join(self.stream(prompt, max_tokens, temperature))
+
+    def close(self):
+        if not self.started:
+            return
+        self._closing.set()
+        for _ in self._processes:
+            self._requests.put(None)
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._collector.join(timeout=5)
+        for pipe in self._pipes:
+            pipe.close()
+        with self._lock:
+            self._processes = []
+            self._cancel = []
+            self._pipes = []
+            self._live.clear()
+            self._queued.clear()
+            self._running.clear()
+            self._abandoned.clear()
+        self._ready.clear()
+
+class LocalRuntimeRouter:
+    """
+    SovereignRouter-compatible facade over a LocalModelPool, for the gasket's Panic Frame:
+    same generate / generate_token / stream_generate calls, same prompt framing as the
+    Ollama backend.
+    """
+    def __init__(self, pool: LocalModelPool, max_tokens: int = 512):
+        self.pool = pool
+        self.max_tokens = max_tokens
+
+    @staticmethod
+    def _frame(prompt: str, system_prompt: str) -> str:
+        return f"{system_prompt}\n\nUser: {prompt}\nAssistant:"
+
+    def generate(self, prompt: str, system_prompt: str = "", max_tokens: Optional[int] = None,
+                 temperature: Optional[float] = None) -> str:
+        return self.pool.generate(self._frame(prompt, system_prompt), max_tokens or self.max_tokens, temperature)
+
+    def generate_token(self, prompt: str, system_prompt: str = "", max_tokens: int = 8) -> str:
+        return self.generate(prompt, system_prompt, max_tokens=max_tokens)
+
+    def stream_generate(self, prompt: str, system_prompt: str = "") -> Iterator[str]:
+        return self.pool.stream(self._frame(prompt, system_prompt), self.max_tokens)
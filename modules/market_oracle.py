@@ -1,7 +1,12 @@
-import requests
+import asyncio
+import httpx
+import math
+import threading
 import time
 import logging
-from typing import Dict, Optional
+import weakref
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from modules.tick_history import TickHistory
 
 # BASE TOKEN ADDRESSES
 TOKENS = {
@@ -10,70 +15,436 @@ TOKENS = {
     "CBETH": "0x2Ae3F1Ec7F1F5012CFEab0185bfc7aa3cf0DEc22"
 }
 
+DEXSCREENER_TOKENS_URL = "https://api.dexscreener.com/latest/dex/chains/base/tokens"
+# DexScreener allows ~300 requests/min on its token endpoints; stay under it
+DEXSCREENER_RATE = 4.0
+DEXSCREENER_BURST = 8
+# Token addresses DexScreener accepts comma-joined in one query
+MAX_BATCH_ADDRESSES = 30
+
+class TokenBucket:
+    """
+    Token-bucket limiter: `rate` requests per second sustained, bursts of up to `burst`.
+    Callers reserve a token (going into debt if none is left) and sleep off the debt, so
+    concurrent waiters are released in order at exactly `rate`.
+    """
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+        self.throttled = 0
+
+    def _reserve(self) -> float:
+        """Takes one token; returns the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            self.throttled += 1
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        wait = self._reserve()
+        if wait:
+            time.sleep(wait)
+
+    async def aacquire(self):
+        wait = self._reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+class PriceSubscription:
+    """
+    Push channel of (symbol, market data) updates for a set of symbols. Updates are
+    conflated per symbol: a reader that falls behind gets the latest data for each
+    symbol, never a backlog of old prices.
+    """
+    def __init__(self, oracle: "MarketOracle", symbols: Iterable[str]):
+        self.oracle = oracle
+        self.symbols = frozenset(symbols)
+        self.loop = asyncio.get_running_loop()
+        self._pending: Dict[str, Dict] = {}
+        self._ready = asyncio.Event()
+
+    def _deliver(self, token_symbol: str, data: Dict):
+        self._pending.pop(token_symbol, None)
+        self._pending[token_symbol] = data
+        self._ready.set()
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Tuple[str, Dict]]:
+        """Next update, oldest symbol first; None if nothing arrives within `timeout`."""
+        if not self._pending:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        token_symbol = next(iter(self._pending))
+        return token_symbol, self._pending.pop(token_symbol)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Tuple[str, Dict]:
+        return await self.get()
+
+    def close(self):
+        self.oracle.unsubscribe(self)
+
+class _LoopState:
+    """Pooled client, in-flight fetches and the background refresher of one event loop."""
+    def __init__(self, oracle: "MarketOracle"):
+        self.client = httpx.AsyncClient(timeout=oracle.timeout, transport=oracle.transport,
+                                        limits=httpx.Limits(max_connections=oracle.limiter.burst))
+        self.inflight: Dict[Tuple[str, ...], asyncio.Task] = {}
+        self.refresher: Optional[asyncio.Task] = None
+
 class MarketOracle:
     """
     ΔΩ-SYSTEM_4: THE SENSOR ARRAY
     Fetches Kinetic Entropy (Price/Volatility) from the Real World.
     Phase I: Uses DexScreener API (Public) for Base Mainnet Data.
+
+    One oracle serves the whole swarm (MarketOracle.shared()): a single cache, concurrent
+    refreshes of the same symbols coalesced into one upstream fetch (single-flight), and
+    every fetch paced by a token bucket so the swarm never outruns the API's rate limit.
+    Sync calls share one pooled httpx.Client; async calls (aget_*) share one
+    httpx.AsyncClient per event loop.
+
+    Push mode: subscribe() starts a background refresher on the loop that re-fetches
+    hot symbols (subscribed, or read within `hot_window`) before they expire and
+    publishes every update to the subscribers. With the refresher running, async reads
+    are stale-while-revalidate: an expired entry younger than `stale_ttl` is returned
+    at once and refreshed in the background, so only a cold cache waits on HTTP.
     """
-    def __init__(self):
-        self.base_url = "https://api.dexscreener.com/latest/dex/chains/base/tokens"
+    _shared: Optional["MarketOracle"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self,
+                 base_url: str = DEXSCREENER_TOKENS_URL,
+                 cache_ttl: float = 5.0,
+                 rate: float = DEXSCREENER_RATE,
+                 burst: int = DEXSCREENER_BURST,
+                 timeout: float = 5.0,
+                 transport: Optional[httpx.BaseTransport] = None,
+                 tokens: Optional[Dict[str, str]] = None,
+                 refresh_interval: Optional[float] = None,
+                 stale_ttl: float = 60.0,
+                 hot_window: float = 60.0,
+                 tick_capacity: int = 256):
+        self.base_url = base_url
+        self.tokens = dict(TOKENS if tokens is None else tokens)
         self.logger = logging.getLogger("MarketOracle")
-        self.cache = {}
-        self.cache_ttl = 5 # seconds
+        self.cache: Dict[str, Tuple[Dict, float]] = {}
+        self.cache_ttl = cache_ttl # seconds
+        # Hot symbols are re-fetched when they would expire before the next pass
+        self.refresh_interval = cache_ttl / 2 if refresh_interval is None else refresh_interval
+        self.stale_ttl = stale_ttl
+        self.hot_window = hot_window
+        self.timeout = timeout
+        self.transport = transport
+        self.limiter = TokenBucket(rate, burst)
+        self.fetches = 0
+        self.coalesced = 0
+        self._client: Optional[httpx.Client] = None
+        self._inflight: Dict[Tuple[str, ...], threading.Event] = {}
+        self._reads: Dict[str, float] = {}
+        # Per-symbol tick memory feeding the realized-volatility entropy estimate
+        self.tick_capacity = tick_capacity
+        self.ticks: Dict[str, TickHistory] = {}
+        self._subscriptions: List[PriceSubscription] = []
+        self._lock = threading.Lock()
+        self._states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def shared(cls) -> "MarketOracle":
+        """The process-wide oracle the clones subscribe to."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def _address(self, token_symbol: str) -> Optional[str]:
+        address = self.tokens.get(token_symbol)
+        if not address:
+            self.logger.error(f"Token {token_symbol} not mapped.")
+        return address
+
+    def _cached(self, token_symbol: str, max_age: Optional[float] = None,
+                since: Optional[float] = None) -> Optional[Dict]:
+        """Entry younger than max_age (default cache_ttl), or fetched at/after `since`."""
+        entry = self.cache.get(token_symbol)
+        max_age = self.cache_ttl if max_age is None else max_age
+        if entry is not None and (time.time() - entry[1] < max_age or (since is not None and entry[1] >= since)):
+            return entry[0]
+        return None
+
+    def _stale(self, symbols: Iterable[str], max_age: Optional[float] = None) -> Tuple[str, ...]:
+        """Mapped symbols without a cache entry younger than max_age, as a canonical single-flight key."""
+        return tuple(sorted({s for s in symbols if self._address(s) and self._cached(s, max_age) is None}))
+
+    def _batches(self, symbols: Tuple[str, ...]) -> List[Tuple[str, ...]]:
+        return [symbols[i:i + MAX_BATCH_ADDRESSES] for i in range(0, len(symbols), MAX_BATCH_ADDRESSES)]
+
+    def _url(self, batch: Tuple[str, ...]) -> str:
+        return f"{self.base_url}/{','.join(self.tokens[s] for s in batch)}"
+
+    def _accept(self, batch: Tuple[str, ...], response: httpx.Response):
+        """Caches the most liquid pair of every token in `batch` from one response."""
+        if response.status_code != 200:
+            self.logger.warning(f"Oracle Fetch Failed: {response.status_code}")
+            return
+        pairs = response.json().get("pairs") or []
+        wanted = {self.tokens[s].lower(): s for s in batch}
+        best: Dict[str, Dict] = {}
+        # Pairs arrive most liquid first; prefer a pair quoting the token as its base
+        for side in ("baseToken", "quoteToken"):
+            for pair in pairs:
+                symbol = wanted.get(str(pair.get(side, {}).get("address", "")).lower())
+                if symbol is not None and symbol not in best:
+                    quoted = pair if side == "baseToken" else self._as_quote(pair)
+                    if quoted is not None:
+                        best[symbol] = quoted
+        now = time.time()
+        with self._lock:
+            for symbol, pair in best.items():
+                self.cache[symbol] = (pair, now)
+                self._history(symbol).push(now, self.price_of(pair))
+        if len(best) < len(batch):
+            self.logger.warning(f"Oracle Fetch Failed: no pairs for {sorted(set(batch) - set(best))}")
+        self._publish(best)
+
+    @staticmethod
+    def _as_quote(pair: Dict) -> Optional[Dict]:
+        """
+        The pair re-priced for its quote token: priceUsd and priceNative describe the
+        base token, so the quote's USD price is priceUsd / priceNative. priceChange is
+        the base token's too and is dropped. None when the price can't be derived.
+        """
+        try:
+            base_usd = float(pair["priceUsd"])
+            native = float(pair["priceNative"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if not (base_usd > 0 and native > 0 and math.isfinite(base_usd / native)):
+            return None
+        quoted = {k: v for k, v in pair.items() if k != "priceChange"}
+        quoted["priceUsd"] = str(base_usd / native)
+        quoted["priceNative"] = str(1 / native)
+        return quoted
+
+    def _history(self, token_symbol: str) -> TickHistory:
+        history = self.ticks.get(token_symbol)
+        if history is None:
+            history = self.ticks[token_symbol] = TickHistory(self.tick_capacity)
+        return history
+
+    def backfill(self, token_symbol: str, timestamps: Sequence[float], prices: Sequence[float]):
+        """Seeds a symbol's tick history from historical (timestamp, price) data."""
+        with self._lock:
+            self._history(token_symbol).backfill(timestamps, prices)
+
+    def _publish(self, updates: Dict[str, Dict]):
+        """Hands fresh data to every subscriber of the symbol, on the subscriber's loop."""
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            for symbol in subscription.symbols.intersection(updates):
+                try:
+                    subscription.loop.call_soon_threadsafe(subscription._deliver, symbol, updates[symbol])
+                except RuntimeError:  # loop closed without unsubscribing
+                    self.unsubscribe(subscription)
+                    break
 
     def get_market_data(self, token_symbol: str) -> Optional[Dict]:
         """
         Fetches live market data for a token on Base.
+        A miss refreshes the whole tracked snapshot, so reading every token costs one round trip.
         """
-        address = TOKENS.get(token_symbol)
-        if not address:
-            self.logger.error(f"Token {token_symbol} not mapped.")
+        if not self._address(token_symbol):
             return None
+        self._reads[token_symbol] = time.time()
+        data = self._cached(token_symbol)
+        if data is not None:
+            return data
+        return self.get_market_data_many(self.tokens).get(token_symbol)
 
-        # Check Cache
-        if token_symbol in self.cache:
-            data, timestamp = self.cache[token_symbol]
-            if time.time() - timestamp < self.cache_ttl:
-                return data
+    def get_market_data_many(self, symbols: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        """
+        Market data for many tokens at once. Stale symbols are refreshed together with
+        one request per MAX_BATCH_ADDRESSES comma-joined addresses, filling the cache
+        for all of them. Unmapped or unavailable symbols map to None.
+        """
+        symbols = list(symbols)
+        started = time.time()
+        stale = self._stale(symbols)
+        if stale:
+            self._refresh(stale)
+        return {s: self._cached(s, since=started) for s in symbols}
+
+    def _refresh(self, stale: Tuple[str, ...]):
+        with self._lock:
+            done = self._inflight.get(stale)
+            leader = done is None
+            if leader:
+                done = self._inflight[stale] = threading.Event()
+        if not leader:
+            # Another thread is fetching these symbols: wait for its result
+            self.coalesced += 1
+            done.wait(self.timeout)
+            return
 
         try:
-            url = f"{self.base_url}/{address}"
-            response = requests.get(url, timeout=5)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get("pairs"):
-                    # Get the most liquid pair
-                    best_pair = data["pairs"][0] 
-                    self.cache[token_symbol] = (best_pair, time.time())
-                    return best_pair
-            
-            self.logger.warning(f"Oracle Fetch Failed: {response.status_code}")
+            if self._client is None:
+                self._client = httpx.Client(timeout=self.timeout, transport=self.transport)
+            for batch in self._batches(stale):
+                self.limiter.acquire()
+                self.fetches += 1
+                self._accept(batch, self._client.get(self._url(batch)))
+        except Exception as e:
+            self.logger.error(f"Oracle Error: {e}")
+        finally:
+            with self._lock:
+                del self._inflight[stale]
+            done.set()
+
+    async def aget_market_data(self, token_symbol: str) -> Optional[Dict]:
+        """Async get_market_data; stale-while-revalidate while the refresher runs."""
+        if not self._address(token_symbol):
             return None
+        self._reads[token_symbol] = time.time()
+        data = self._cached(token_symbol)
+        if data is not None:
+            return data
+        state = self._state()
+        if state.refresher is not None:
+            data = self._cached(token_symbol, self.stale_ttl)
+            if data is not None:
+                self._revalidate(state, self._stale(self.tokens))
+                return data
+        return (await self.aget_market_data_many(self.tokens)).get(token_symbol)
+
+    async def aget_market_data_many(self, symbols: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        """Async get_market_data_many: callers on one loop share a single in-flight refresh."""
+        symbols = list(symbols)
+        started = time.time()
+        stale = self._stale(symbols)
+        if stale:
+            # Shielded: a cancelled caller does not cancel the refresh the others wait on
+            await asyncio.shield(self._revalidate(self._state(), stale))
+        return {s: self._cached(s, since=started) for s in symbols}
 
+    def _revalidate(self, state: _LoopState, stale: Tuple[str, ...]) -> asyncio.Task:
+        """The loop's in-flight refresh of `stale`, started if there is none."""
+        refresh = state.inflight.get(stale)
+        if refresh is None:
+            refresh = state.inflight[stale] = asyncio.ensure_future(self._arefresh(state, stale))
+            refresh.add_done_callback(lambda _: state.inflight.pop(stale, None))
+        else:
+            self.coalesced += 1
+        return refresh
+
+    async def _arefresh(self, state: _LoopState, stale: Tuple[str, ...]):
+        try:
+            for batch in self._batches(stale):
+                await self.limiter.aacquire()
+                self.fetches += 1
+                self._accept(batch, await state.client.get(self._url(batch)))
         except Exception as e:
             self.logger.error(f"Oracle Error: {e}")
-            return None
+
+    def subscribe(self, symbols: Iterable[str]) -> PriceSubscription:
+        """
+        Push channel for `symbols` on the running loop; starts the loop's refresher.
+        Symbols cached within cache_ttl are delivered at once; an older entry is not
+        pushed (a subscriber acts on what it receives), the refresher's fetch is.
+        """
+        subscription = PriceSubscription(self, [s for s in symbols if self._address(s)])
+        with self._lock:
+            self._subscriptions.append(subscription)
+        self.start_refresher()
+        for symbol in subscription.symbols:
+            data = self._cached(symbol)
+            if data is not None:
+                subscription._deliver(symbol, data)
+        return subscription
+
+    def unsubscribe(self, subscription: PriceSubscription):
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def start_refresher(self) -> asyncio.Task:
+        """Starts (once per event loop) the background task keeping hot symbols warm."""
+        state = self._state()
+        if state.refresher is None or state.refresher.done():
+            state.refresher = asyncio.ensure_future(self._refresh_loop(state))
+        return state.refresher
+
+    def _hot(self) -> List[str]:
+        cutoff = time.time() - self.hot_window
+        with self._lock:
+            hot = {s for subscription in self._subscriptions for s in subscription.symbols}
+        hot.update(s for s, t in list(self._reads.items()) if t >= cutoff)
+        return sorted(hot)
+
+    async def _refresh_loop(self, state: _LoopState):
+        while True:
+            # Due: would expire before the next pass. The whole tracked set is refreshed
+            # (one request either way), so reads and refresher share single-flight keys.
+            max_age = self.cache_ttl - self.refresh_interval
+            if self._stale(self._hot(), max_age):
+                await asyncio.shield(self._revalidate(state, self._stale(self.tokens, max_age)))
+            await asyncio.sleep(self.refresh_interval)
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None:
+            state = self._states[loop] = _LoopState(self)
+        return state
 
     def get_price(self, token_symbol: str) -> float:
         """
         Returns the current USD price of the token.
         """
-        data = self.get_market_data(token_symbol)
+        return self.price_of(self.get_market_data(token_symbol))
+
+    async def aget_price(self, token_symbol: str) -> float:
+        return self.price_of(await self.aget_market_data(token_symbol))
+
+    @staticmethod
+    def price_of(data: Optional[Dict]) -> float:
         if data:
             return float(data.get("priceUsd", 0.0))
         return 0.0
 
     def get_kinetic_entropy(self, token_symbol: str) -> float:
         """
-        Calculates Kinetic Entropy based on 1h and 6h price changes.
+        Calculates Kinetic Entropy based on 1h and 6h price changes, raised to the
+        realized volatility of the local tick history once it has enough ticks.
         Returns a value between 0.0 (Stable) and 1.0 (Chaos).
         """
-        data = self.get_market_data(token_symbol)
+        return self.entropy_of(self.get_market_data(token_symbol), token_symbol)
+
+    async def aget_kinetic_entropy(self, token_symbol: str) -> float:
+        return self.entropy_of(await self.aget_market_data(token_symbol), token_symbol)
+
+    def entropy_of(self, data: Optional[Dict], token_symbol: Optional[str] = None) -> float:
         if not data:
             return 0.0
-            
+        coarse = self._coarse_entropy(data)
+        history = self.ticks.get(token_symbol) if token_symbol else None
+        realized = history.kinetic_entropy() if history is not None else None
+        # The tick estimate reacts first to a crash; h1/h6 still carries slow drift
+        return coarse if realized is None else max(coarse, realized)
+
+    def _coarse_entropy(self, data: Dict) -> float:
         try:
             # Extract Volatility Metrics
             price_change = data.get("priceChange", {})
@@ -92,6 +463,19 @@ class MarketOracle:
             self.logger.error(f"Entropy Calculation Error: {e}")
             return 0.0
 
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self):
+        """Stops the refresher and closes the pooled client of the running event loop."""
+        state = self._states.pop(asyncio.get_running_loop(), None)
+        if state is not None:
+            if state.refresher is not None:
+                state.refresher.cancel()
+            await state.client.aclose()
+
 if __name__ == "__main__":
     # Test the Oracle
     logging.basicConfig(level=logging.INFO)
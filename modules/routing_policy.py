@@ -0,0 +1,183 @@
+import threading
+import time
+import numpy as np
+from collections import deque
+from typing import Dict, List, Optional
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+class CircuitOpenError(Exception):
+    pass
+
+class CircuitBreaker:
+    """
+    Per-backend breaker. CLOSED passes calls; `failure_threshold` consecutive failures
+    OPEN it and calls are refused without touching the backend. After `cooldown` seconds
+    it is HALF_OPEN: one probe call is let through, success closes it, failure re-opens it.
+    """
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opens = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self._open = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if not self._open:
+            return CLOSED
+        return HALF_OPEN if time.monotonic() - self.opened_at >= self.cooldown else OPEN
+
+    def available(self) -> bool:
+        """Whether a call could go through now (does not reserve the half-open probe)."""
+        state = self.state
+        return state == CLOSED or (state == HALF_OPEN and not self.probing)
+
+    def acquire(self) -> bool:
+        """Admits a call; in HALF_OPEN only the first caller gets the probe."""
+        with self._lock:
+            state = self.state
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def record(self, ok: bool):
+        with self._lock:
+            if ok:
+                self.failures = 0
+                self._open = False
+            else:
+                self.failures += 1
+                if self._open or self.failures >= self.failure_threshold:
+                    # A failed half-open probe re-opens for a fresh cooldown
+                    if not self._open:
+                        self.opens += 1
+                    self._open = True
+                    self.opened_at = time.monotonic()
+            self.probing = False
+
+    def release(self):
+        """The admitted call was abandoned without a verdict (e.g. lost a hedge race)."""
+        with self._lock:
+            self.probing = False
+
+    def snapshot(self) -> Dict[str, object]:
+        state = self.state
+        return {
+            "state": state,
+            "consecutive_failures": self.failures,
+            "opens": self.opens,
+            "retry_in": max(0.0, self.cooldown - (time.monotonic() - self.opened_at)) if state == OPEN else 0.0,
+        }
+
+class BackendStats:
+    """
+    Rolling latency and outcome record for one inference backend.
+    Keeps the last `window` calls; latencies are in seconds.
+    """
+    def __init__(self, window: int = 200):
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: Optional[float], ok: Optional[bool]):
+        """`latency` None: not timed (e.g. a stream). `ok` None: abandoned, outcome unknown."""
+        with self._lock:
+            if latency is not None:
+                self.latencies.append(latency)
+            if ok is not None:
+                self.outcomes.append(ok)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if not self.latencies:
+                return None
+            return float(np.percentile(self.latencies, q))
+
+    @property
+    def samples(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            if not self.outcomes:
+                return 0.0
+            return self.outcomes.count(False) / len(self.outcomes)
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        return {
+            "samples": self.samples,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "error_rate": self.error_rate,
+        }
+
+class RoutingPolicy:
+    """
+    ΔΩ-INTELLIGENCE: LATENCY-AWARE ROUTING
+    Orders the backends for each call and decides when to hedge. The preferred order is
+    kept until both sides have `min_samples` latencies; after that a healthy backend
+    with a lower median goes first. An unhealthy backend (error rate above
+    `max_error_rate`) is tried last. The hedge delay is the lead backend's
+    `hedge_quantile` latency: past it, a duplicate goes to the next backend.
+    Backends whose circuit breaker is open are left out altogether.
+    """
+    def __init__(self,
+                 backends: List[str] = ("primary", "local"),
+                 window: int = 200,
+                 min_samples: int = 20,
+                 max_error_rate: float = 0.5,
+                 hedge_quantile: float = 95,
+                 hedge: bool = True,
+                 failure_threshold: int = 5,
+                 cooldown: float = 30.0):
+        self.backends = list(backends)
+        self.stats = {name: BackendStats(window) for name in self.backends}
+        self.breakers = {name: CircuitBreaker(failure_threshold, cooldown) for name in self.backends}
+        self.min_samples = min_samples
+        self.max_error_rate = max_error_rate
+        self.hedge_quantile = hedge_quantile
+        self.hedge = hedge
+
+    def record(self, backend: str, latency: Optional[float], ok: Optional[bool]):
+        self.stats[backend].record(latency, ok)
+        if ok is None:
+            self.breakers[backend].release()
+        else:
+            self.breakers[backend].record(ok)
+
+    def acquire(self, backend: str) -> bool:
+        return self.breakers[backend].acquire()
+
+    def healthy(self, backend: str) -> bool:
+        return self.stats[backend].error_rate <= self.max_error_rate
+
+    def order(self, available: List[str]) -> List[str]:
+        """`available` in the order to try them."""
+        candidates = [b for b in self.backends if b in available]
+        ranked = sorted(candidates, key=lambda b: (not self.healthy(b), self._rank(b, candidates)))
+        return [b for b in ranked if self.breakers[b].available()]
+
+    def _rank(self, backend: str, candidates: List[str]) -> float:
+        # Preference order stands until every candidate has enough samples to compare
+        if any(self.stats[b].samples < self.min_samples for b in candidates):
+            return candidates.index(backend)
+        return self.stats[backend].percentile(50)
+
+    def hedge_delay(self, backend: str) -> Optional[float]:
+        """Seconds to wait on `backend` before hedging, or None while its tail is unknown."""
+        if not self.hedge or self.stats[backend].samples < self.min_samples:
+            return None
+        return self.stats[backend].percentile(self.hedge_quantile)
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        """Per-backend latency, error rate and breaker state, for metrics."""
+        return {name: {**self.stats[name].snapshot(), "breaker": self.breakers[name].snapshot()}
+                for name in self.backends}
@@ -1,14 +1,19 @@
+import asyncio
 import logging
-import requests
 import numpy as np
 import os
 import time
 import json
+from collections import deque
 from modules.prophet_connector import ProphetExtractor, CrossCheckProphet
 from modules.sovereign_router import SovereignRouter
-
-import hmac
-import hashlib
+from modules.embeddings import (SovereignEmbedder, LocalEmbedder, FailoverEmbedder,
+                                SOVEREIGN_EMBED_ENDPOINT, embedding_variance)
+from modules.embedding_cache import EmbeddingCache, CachedEmbedder
+from modules.alternates import AlternateGenerator
+from modules.local_runtime import LocalModelPool, LocalRuntimeRouter
+from modules.constitutional_token import (ConstitutionalTokenService, ConstitutionalTokenVerifier,
+                                          SENTINEL_ROOT_KEY, CAGE_CODE)
 
 # ... (Previous imports)
 
@@ -16,9 +21,8 @@ import hashlib
 SCAR_INDEX_THRESHOLD = 0.997
 CONSTITUTIONAL_VARIANCE_LIMIT = 0.05
 LOCKOUT_FILE = "LOCKOUT.state"
-# Placeholder Key - In production, this comes from HSM/Vault
-SENTINEL_ROOT_KEY = b"spiralos-dojo-sovereign-key-v1" 
-CAGE_CODE = "17TJ5"
+# remote: sovereign_embed edge function | local: in-process ONNX | auto: remote, local while remote is slow/down
+EMBEDDING_BACKENDS = ("remote", "local", "auto")
 
 class System5Gasket:
     """
@@ -26,32 +30,108 @@ class System5Gasket:
     The Autopoietic Interdiction Overlay.
     Enforces the '7-Breath Pattern' and 'Constitutional 0.05' across the SpiralOS Lattice.
     """
-    def __init__(self, variance_threshold=0.05, fact_threshold=0.05, oracle=None, openai_key=None):
+    def __init__(self, variance_threshold=0.05, fact_threshold=0.05, oracle=None, openai_key=None,
+                 embedding_cache: EmbeddingCache = None, embedding_backend: str = None,
+                 alternate_deadline: float = 0.5, local_runtime: LocalModelPool = None):
         self.variance_threshold = variance_threshold
         self.fact_threshold = fact_threshold
         self.extractor = ProphetExtractor()
         self.prophet = CrossCheckProphet(oracle_client=oracle)
-        self.sovereign_endpoint = "https://xlmrnjatawslawquwzpf.supabase.co/functions/v1/sovereign_embed"
+        self.sovereign_endpoint = SOVEREIGN_EMBED_ENDPOINT
         self.router = SovereignRouter(openai_key=openai_key)
+        # Alternates for each window are generated concurrently; late ones are dropped
+        self.alternates = AlternateGenerator(deadline=alternate_deadline)
+        # A window whose alternates all failed or were shed is unverified, not safe: its
+        # tokens are held, and this many in a row devolve the stream to the Panic Frame
+        self.max_unverified_windows = 3
+        self.unverified_windows = 0
+        # Ache is measured on the last this-many emitted tokens plus the window, not the
+        # whole session, so a check costs the same at token 10 and token 10,000
+        self.ache_context_tokens = 64
+        # Panic Frame target: GGUF workers are warmed now (in the background) so devolving is a swap, not a load
+        self.local_runtime = local_runtime
+        self.cloud_router = None
+        if local_runtime is not None and not local_runtime.started:
+            local_runtime.start(wait=False)
         self.logger = logging.getLogger("System5Gasket")
+        # Identical completions/prefixes are embedded once (see embedding_cache.stats())
+        self.embedding_cache = embedding_cache or EmbeddingCache()
+        self.embedding_backend = embedding_backend or os.getenv("EMBEDDING_BACKEND", "remote")
+        self.embedder = self._build_embedder(self.embedding_backend)
         
+        # CCT mint and its matching verifier (TTL + replay window) for the execution layer
+        self.token_service = ConstitutionalTokenService(SENTINEL_ROOT_KEY, CAGE_CODE)
+        self.token_verifier = ConstitutionalTokenVerifier(SENTINEL_ROOT_KEY, CAGE_CODE)
+
         # Identity Vector State
         self.current_scar_index = 1.000
         self.is_locked = os.path.exists(LOCKOUT_FILE)
 
+    def _build_embedder(self, backend: str):
+        """
+        Each backend gets its own CachedEmbedder over the shared cache; keys are per model,
+        so vectors from different models never mix.
+        """
+        if backend not in EMBEDDING_BACKENDS:
+            raise ValueError(f"Unknown embedding backend '{backend}', expected one of {EMBEDDING_BACKENDS}")
+
+        remote = CachedEmbedder(SovereignEmbedder(self.sovereign_endpoint), self.embedding_cache)
+        if backend == "remote":
+            return remote
+        if backend == "local":
+            return CachedEmbedder(LocalEmbedder(), self.embedding_cache)
+
+        try:
+            local = CachedEmbedder(LocalEmbedder(), self.embedding_cache)
+        except Exception as e:
+            # Missing fastembed, a failed model download, a corrupt ONNX cache, a failing warm-up
+            self.logger.warning(f"Local embedding backend unavailable ({e!r}); using remote only.")
+            return remote
+        return FailoverEmbedder(remote, local)
+
     def issue_constitutional_token(self, intent: str, kinetic_entropy: float = 0.0) -> str:
         """
         ISSUES A CONSTITUTIONAL CLEARANCE TOKEN (CCT).
         Binding: CAGE_CODE + TIMESTAMP + SCAR_INDEX + INTENT + KINETIC_ENTROPY
         TTL: 500ms (Enforced by Verifier)
         """
+        if not self._clear_for_tokens(kinetic_entropy, intent):
+            return None
+
+        token = self.token_service.issue(intent, self.current_scar_index, kinetic_entropy)
+        # Per-token logging stays at DEBUG: this is the clones' hot path
+        self.logger.debug(f"[STP] TOKEN_ISSUED: {intent} | ID: {token[-64:-56]}")
+        return token
+
+    async def aissue_constitutional_token(self, intent: str, kinetic_entropy: float = 0.0) -> str:
+        """
+        Event-loop entry point for the clones. Clearance is a few comparisons and one
+        HMAC (microseconds) and runs inline; the one blocking path, a severe-crash
+        reading that writes the LOCKOUT file, is handed to a worker thread.
+        """
+        if kinetic_entropy > CONSTITUTIONAL_VARIANCE_LIMIT * 2 and not self.is_locked:
+            return await asyncio.to_thread(self.issue_constitutional_token, intent, kinetic_entropy)
+        return self.issue_constitutional_token(intent, kinetic_entropy)
+
+    def issue_constitutional_tokens(self, intents: list, kinetic_entropy: float = 0.0) -> list:
+        """
+        Batch CCT issuance for swarms clearing many intents per tick. The constitutional
+        gate is evaluated once for the batch: all intents are cleared or none (empty list).
+        """
+        if not intents or not self._clear_for_tokens(kinetic_entropy, f"BATCH[{len(intents)}]"):
+            return []
+        tokens = self.token_service.issue_batch(intents, self.current_scar_index, kinetic_entropy)
+        self.logger.debug(f"[STP] TOKENS_ISSUED: {len(tokens)}")
+        return tokens
+
+    def _clear_for_tokens(self, kinetic_entropy: float, intent: str) -> bool:
         if self.is_locked:
             self.logger.critical(f"TOKEN_DENIED: System is LOCKED. Intent: {intent}")
-            return None
+            return False
             
         if self.current_scar_index < SCAR_INDEX_THRESHOLD:
             self.logger.critical(f"TOKEN_DENIED: ScarIndex {self.current_scar_index:.4f} too low.")
-            return None
+            return False
 
         # KINETIC ENTROPY CHECK (Ash Protocol)
         if kinetic_entropy > CONSTITUTIONAL_VARIANCE_LIMIT:
@@ -59,23 +139,8 @@ class System5Gasket:
             # Trigger Immutable Lockout if Entropy > 2x Limit (Severe Crash)
             if kinetic_entropy > CONSTITUTIONAL_VARIANCE_LIMIT * 2:
                 self.trigger_lockout_state(f"FLASH_CRASH_DETECTED: Entropy {kinetic_entropy:.4f}")
-            return None
-
-        # Payload Construction
-        timestamp = str(time.time())
-        payload = f"{CAGE_CODE}:{timestamp}:{self.current_scar_index:.4f}:{kinetic_entropy:.4f}:{intent}"
-        
-        # Cryptographic Signing (HMAC-SHA256)
-        signature = hmac.new(
-            SENTINEL_ROOT_KEY,
-            payload.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-        
-        # Token Format: "PAYLOAD|SIGNATURE"
-        token = f"{payload}|{signature}"
-        self.logger.info(f"[STP] TOKEN_ISSUED: {intent} | ID: {signature[:8]}")
-        return token
+            return False
+        return True
 
     def _check_authority_domain(self, source: str) -> bool:
         """
@@ -93,29 +158,17 @@ class System5Gasket:
     def calculate_ache_entropy(self, completions: list) -> float:
         """
         BREATH 1-3: INGEST & QUANTIFY
-        Computes semantic variance (Ache) via the sovereign embedding endpoint.
+        Computes semantic variance (Ache) via the configured embedding backend.
         """
         if not completions or len(completions) < 2:
             return 0.0
 
         try:
-            embeddings = []
-            for text in completions:
-                # Call sovereign WASM-based embedder
-                response = requests.post(self.sovereign_endpoint, json={"input": text}, timeout=5)
-                if response.status_code == 200:
-                    embeddings.append(response.json()['embedding'])
-                else:
-                    self.logger.warning(f"Embedding Endpoint degradation: {response.status_code}")
-                    raise Exception(f"API_FAILURE: {response.status_code}")
+            # One batched call to the embedding backend
+            matrix = self.embedder.embed(completions)
             
             # Compute distance from centroid
-            matrix = np.array(embeddings)
-            centroid = np.mean(matrix, axis=0)
-            distances = [np.linalg.norm(e - centroid) for e in matrix]
-            variance = float(np.mean(distances))
-            
-            return variance
+            return embedding_variance(matrix)
             
         except Exception as e:
             self.logger.error(f"Entropy Calculation Failed: {e}")
@@ -151,12 +204,23 @@ class System5Gasket:
     def panic_frame_devolution(self):
         """
         System 2 Failover: Devolves to local quantized logic if System 3 (Cloud) drifts.
+        With a warm local runtime the router is swapped for it; later requests stay local
+        until restore_cloud_router().
         """
         self.logger.warning("PANIC FRAME: Devolving to Local/Quantized backend.")
-        # Logic to switch `self.router` to a local GGUF model loader would go here
-        # For now, we simulate the switch
+        if self.local_runtime is not None and self.cloud_router is None:
+            if self.local_runtime.ready:
+                self.cloud_router = self.router
+                self.router = LocalRuntimeRouter(self.local_runtime)
+            else:
+                self.logger.error("PANIC FRAME: Local runtime not warm; staying on cloud router.")
         return "[SYSTEM_5_OVERRIDE: CLOUD_DRIFT_DETECTED -> LOCAL_FALLBACK]"
 
+    def restore_cloud_router(self):
+        if self.cloud_router is not None:
+            self.router, self.cloud_router = self.cloud_router, None
+            self.logger.info("PANIC FRAME: Cloud router restored.")
+
     def metabolize_stream(self, prompt: str, system_prompt: str = "", n: int = 3, buffer_size: int = 5):
         """
         BREATH 4: METABOLISM (Sliding Window Lookahead)
@@ -167,36 +231,43 @@ class System5Gasket:
             return
 
         buffer = []
+        # Running prefix of emitted text (the alternates' prompt) and its bounded tail (Ache)
         accumulated_text = ""
+        emitted_tail = deque(maxlen=self.ache_context_tokens)
+        unverified = 0
         
         try:
             for chunk in self.router.stream_generate(prompt, system_prompt):
                 # a. Ingest (Breath 1-3)
                 buffer.append(chunk)
-                
-                # b. Metabolize (Breath 4)
-                # Predict future state
-                proposed_state = accumulated_text + "".join(buffer)
-                
-                # Generate parallel realities to measure variance
-                completions = [proposed_state]
-                
-                # BREATH 4: METABOLISM - Generate alternates to measure semantic stability
-                if n > 1:
-                    try:
-                        # Simple simulation of parallel paths
-                        # In production, this would be async/parallel
-                        for _ in range(n - 1):
-                            # We ask the router for a single completion extension
-                            # using the same context
-                            alt_token = self.router.generate_token(prompt + accumulated_text + "".join(buffer[:-1])) # Mock method
-                            completions.append(accumulated_text + "".join(buffer[:-1]) + alt_token)
-                    except:
-                        pass # If generation fails, we rely on single-shot entropy (which returns 0.0 usually)
 
                 # Only check entropy when buffer is full to save compute
                 if len(buffer) >= buffer_size:
-                    # Check variance across the parallel realities
+                    # b. Metabolize (Breath 4)
+                    # Predict future state
+                    context = accumulated_text + "".join(buffer[:-1])
+                    window = "".join(emitted_tail) + "".join(buffer[:-1])
+                    completions = [window + buffer[-1]]
+
+                    # BREATH 4: METABOLISM - Generate alternates to measure semantic stability
+                    if n > 1:
+                        # The n-1 parallel paths run concurrently against the router backends.
+                        # Alternates that fail or miss the deadline are dropped
+                        alt_tokens = self.alternates.generate(self.router.generate_token, prompt + context, n - 1)
+                        if not alt_tokens:
+                            # Nothing to measure against: hold the buffer until a window verifies
+                            unverified += 1
+                            self.unverified_windows += 1
+                            self.logger.warning(f"UNVERIFIED_WINDOW: no alternates arrived ({unverified} in a row)")
+                            if unverified >= self.max_unverified_windows:
+                                raise RuntimeError(f"{unverified} consecutive windows without alternates")
+                            continue
+                        unverified = 0
+                        completions.extend(window + alt_token for alt_token in alt_tokens)
+
+                    # Check variance across the parallel realities. Texts are bounded by the
+                    # trailing window; the cached embedder embeds each distinct one once
+                    # (alternates often agree).
                     current_entropy = self.calculate_ache_entropy(completions)
 
                     # Compute ScarIndex (Mocking confidence as constant for now)
@@ -221,6 +292,7 @@ class System5Gasket:
                     # Safety Confirmed -> Emit oldest token
                     oldest_token = buffer.pop(0)
                     accumulated_text += oldest_token
+                    emitted_tail.append(oldest_token)
                     yield oldest_token
             
             # Flush remaining buffer
@@ -1,66 +1,223 @@
-import json
+import asyncio
+import importlib.util
 import logging
-import requests
+import queue
+import threading
 import time
-from typing import List, Dict, Any, Optional
+import weakref
+import httpx
+from typing import AsyncIterator, Dict, Iterator, List, Any, Optional, Tuple
+from modules.routing_policy import RoutingPolicy, CircuitOpenError
+from modules.completion_cache import CompletionCache
+from modules.stream_parser import StreamParser, ParseStats, SSE, NDJSON
 
-class SovereignRouter:
+OPENAI_CHAT_URL = "https://api.openai.com/v1/chat/completions"
+# httpx negotiates HTTP/2 only when the optional h2 package is installed
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+class _LoopState:
+    """Connection pool and per-backend concurrency limits belonging to one event loop."""
+    def __init__(self, router: "AsyncSovereignRouter"):
+        self.client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            transport=router.transport,
+            limits=httpx.Limits(max_connections=router.primary_concurrency + router.local_concurrency,
+                                max_keepalive_connections=router.primary_concurrency + router.local_concurrency),
+        )
+        self.limits = {
+            "primary": asyncio.Semaphore(router.primary_concurrency),
+            "local": asyncio.Semaphore(router.local_concurrency),
+        }
+
+class AsyncSovereignRouter:
     """
-    ΔΩ-INTELLIGENCE: 0xSOVEREIGN_ROUTER | STATUS: ACTIVE
-    Routes inference requests between Colonial APIs and Sovereign local backends.
+    ΔΩ-INTELLIGENCE: 0xSOVEREIGN_ROUTER (ASYNC CORE)
+    Routes inference requests between Colonial APIs and Sovereign local backends without
+    blocking the event loop. Calls share one keep-alive httpx.AsyncClient per event loop
+    (HTTP/2 when available) and each backend is limited to a fixed number of in-flight requests.
     """
-    
-    def __init__(self, 
-                 openai_key: Optional[str] = None, 
+    def __init__(self,
+                 openai_key: Optional[str] = None,
                  local_url: str = "http://localhost:11434/api/generate",
                  primary_model: str = "gpt-4o",
-                 local_model: str = "llama3"):
+                 local_model: str = "llama3",
+                 primary_concurrency: int = 16,
+                 local_concurrency: int = 4,
+                 transport: Optional[httpx.AsyncBaseTransport] = None,
+                 policy: Optional[RoutingPolicy] = None,
+                 completion_cache: Optional[CompletionCache] = None):
         self.openai_key = openai_key
         self.local_url = local_url
         self.primary_model = primary_model
         self.local_model = local_model
+        self.primary_concurrency = primary_concurrency
+        self.local_concurrency = local_concurrency
+        self.transport = transport
+        # Per-backend latency percentiles and error rates drive ordering and hedging
+        self.policy = policy or RoutingPolicy()
+        # Opt-in: only temperature-0 completions are cached
+        self.completion_cache = completion_cache
+        # Per-chunk stream parse timing across all streams (parse_stats.snapshot())
+        self.parse_stats = ParseStats()
+        self._states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
         self.logger = logging.getLogger("SovereignRouter")
-        
-    def generate(self, prompt: str, system_prompt: str = "") -> str:
-        """Attempts primary inference, fails over to local if blocked. (Blocking)"""
-        
-        # 1. Attempt Primary (Colonial)
-        if self.openai_key:
-            try:
-                self.logger.info(f"Attempting Primary Inference ({self.primary_model})...")
-                response = self._call_openai(prompt, system_prompt)
-                if response:
-                    return response
-            except Exception as e:
-                self.logger.warning(f"INFERENCE_COLONIALISM_REJECTED: {str(e)}")
-        
-        # 2. Failover to Sovereign (Local)
-        self.logger.info(f"Failing over to Sovereign Inference ({self.local_model})...")
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None:
+            state = self._states[loop] = _LoopState(self)
+        return state
+
+    async def agenerate(self, prompt: str, system_prompt: str = "", max_tokens: Optional[int] = None,
+                        temperature: Optional[float] = None) -> str:
+        """
+        Tries the backends in the order the routing policy ranks them (primary first by
+        default). A failure fails over to the next backend at once; a lead backend still
+        running past its p95 gets a hedged duplicate on the next one, first success wins.
+        With a completion cache, temperature=0 calls are answered from it when possible;
+        sampled calls (temperature None/backend default, or > 0) always run inference.
+        """
+        cacheable = self.completion_cache is not None and temperature == 0
+        if cacheable:
+            # Checked before routing: a known answer is served even with every circuit open.
+            # One lookup per call, however many backends' keys it probes. sqlite runs in a
+            # worker thread so a disk commit never stalls the loop.
+            cached = await asyncio.to_thread(self.completion_cache.get_any, [
+                self._cache_key(backend, prompt, system_prompt, temperature, max_tokens) for backend in self._available()
+            ])
+            if cached is not None:
+                return cached
+
+        backend, response = await self._dispatch(self._route(), prompt, system_prompt, max_tokens, temperature)
+        if cacheable:
+            await asyncio.to_thread(self.completion_cache.put,
+                                    self._cache_key(backend, prompt, system_prompt, temperature, max_tokens), response)
+        return response
+
+    def _cache_key(self, backend: str, prompt: str, system_prompt: str, temperature: float,
+                   max_tokens: Optional[int]) -> bytes:
+        model = self.primary_model if backend == "primary" else self.local_model
+        return CompletionCache.key(model, system_prompt, prompt, temperature, max_tokens)
+
+    async def _dispatch(self, order: List[str], prompt: str, system_prompt: str, max_tokens: Optional[int],
+                        temperature: Optional[float]) -> Tuple[str, str]:
+        """Runs the routed race; returns (backend, completion) of the first success."""
+        running: Dict[asyncio.Task, str] = {}
+        error: Optional[BaseException] = None
+        try:
+            for i, backend in enumerate(order):
+                task = asyncio.ensure_future(self._attempt(backend, i, prompt, system_prompt, max_tokens, temperature))
+                running[task] = backend
+                if i == len(order) - 1:
+                    break
+                hedge = self.policy.hedge_delay(backend)
+                deadline = None if hedge is None else asyncio.get_running_loop().time() + hedge
+                while task in running:
+                    timeout = None if deadline is None else max(0.0, deadline - asyncio.get_running_loop().time())
+                    done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                    if not done:
+                        self.logger.warning(f"HEDGE: {backend} past its p{self.policy.hedge_quantile:g} ({hedge * 1000:.0f}ms); racing {order[i + 1]}")
+                        break
+                    for finished in done:
+                        served_by = running.pop(finished)
+                        if finished.exception() is None:
+                            return served_by, finished.result()
+                        error = finished.exception()
+
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for finished in done:
+                    served_by = running.pop(finished)
+                    if finished.exception() is None:
+                        return served_by, finished.result()
+                    error = finished.exception()
+        finally:
+            # Hedge losers are abandoned, not awaited
+            for task in running:
+                task.cancel()
+
+        self.logger.error(f"TOTAL_INFERENCE_FAILURE: Both backends offline. {str(error)}")
+        raise error
+
+    def _available(self) -> List[str]:
+        return ["primary", "local"] if self.openai_key else ["local"]
+
+    def _route(self) -> List[str]:
+        order = self.policy.order(self._available())
+        if not order:
+            self.logger.error("TOTAL_INFERENCE_FAILURE: All backend circuits open.")
+            raise CircuitOpenError("All backend circuits open")
+        return order
+
+    async def _attempt(self, backend: str, position: int, prompt: str, system_prompt: str,
+                       max_tokens: Optional[int], temperature: Optional[float] = None) -> str:
+        """One timed call to `backend`; its latency and outcome feed the routing policy."""
+        if not self.policy.acquire(backend):
+            # Breaker opened (or its half-open probe was taken) since the route was chosen
+            raise CircuitOpenError(f"{backend} circuit open")
+        if backend == "primary":
+            self.logger.info(f"Attempting Primary Inference ({self.primary_model})...")
+        elif position > 0:
+            self.logger.info(f"Failing over to Sovereign Inference ({self.local_model})...")
+        else:
+            self.logger.info(f"Routing to Sovereign Inference ({self.local_model})...")
+
+        start = time.perf_counter()
         try:
-            return self._call_local(prompt, system_prompt)
+            if backend == "primary":
+                response = await self._call_openai(prompt, system_prompt, max_tokens, temperature)
+                if not response:
+                    raise Exception("OpenAI returned an empty completion")
+            else:
+                response = await self._call_local(prompt, system_prompt, max_tokens, temperature)
+        except asyncio.CancelledError:
+            # Lost a hedge race: the elapsed time is a lower bound on its latency
+            self.policy.record(backend, time.perf_counter() - start, None)
+            raise
         except Exception as e:
-            self.logger.error(f"TOTAL_INFERENCE_FAILURE: Both backends offline. {str(e)}")
+            self.policy.record(backend, None, False)
+            if backend == "primary":
+                self.logger.warning(f"INFERENCE_COLONIALISM_REJECTED: {str(e)}")
             raise
+        self.policy.record(backend, time.perf_counter() - start, True)
+        return response
 
-    def stream_generate(self, prompt: str, system_prompt: str = ""):
-        """Generator that yields chunks from primary or local backend."""
-        if self.openai_key:
+    async def agenerate_token(self, prompt: str, system_prompt: str = "", max_tokens: int = 8) -> str:
+        """Short continuation of `prompt`, used by the gasket for its alternate realities."""
+        return await self.agenerate(prompt, system_prompt, max_tokens=max_tokens)
+
+    async def astream_generate(self, prompt: str, system_prompt: str = "") -> AsyncIterator[str]:
+        """Async generator that yields chunks from the first backend, in policy order, that streams."""
+        order = self._route()
+        for i, backend in enumerate(order):
+            if not self.policy.acquire(backend):
+                if i == len(order) - 1:
+                    raise CircuitOpenError(f"{backend} circuit open")
+                continue
             try:
-                self.logger.info(f"Attempting Primary Streaming ({self.primary_model})...")
-                for chunk in self._stream_openai(prompt, system_prompt):
+                if backend == "primary":
+                    self.logger.info(f"Attempting Primary Streaming ({self.primary_model})...")
+                    stream = self._stream_openai(prompt, system_prompt)
+                else:
+                    self.logger.info(f"Failing over to Sovereign Streaming ({self.local_model})...")
+                    stream = self._stream_local(prompt, system_prompt)
+                async for chunk in stream:
                     yield chunk
+                self.policy.record(backend, None, True)
                 return
             except Exception as e:
+                self.policy.record(backend, None, False)
+                if i == len(order) - 1:
+                    raise
                 self.logger.warning(f"STREAM_COLONIALISM_REJECTED: {str(e)}")
-        
-        self.logger.info(f"Failing over to Sovereign Streaming ({self.local_model})...")
-        for chunk in self._stream_local(prompt, system_prompt):
-            yield chunk
-
-    def _call_openai(self, prompt: str, system_prompt: str) -> Optional[str]:
-        # Minimal mock/stub for OpenAI call for demonstration
-        # In production, this would use the openai library
-        url = "https://api.openai.com/v1/chat/completions"
+            except BaseException:
+                # Consumer closed or cancelled the stream: no verdict on the backend
+                self.policy.record(backend, None, None)
+                raise
+
+    def _openai_request(self, prompt: str, system_prompt: str, stream: bool = False,
+                        max_tokens: Optional[int] = None, temperature: Optional[float] = None) -> Dict[str, Any]:
         headers = {
             "Authorization": f"Bearer {self.openai_key}",
             "Content-Type": "application/json"
@@ -71,59 +228,152 @@ class SovereignRouter:
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": prompt}
             ],
-            "temperature": 0.7 # Baseline for variance testing
+            "temperature": 0.7 if temperature is None else temperature # 0.7: baseline for variance testing
         }
-        
-        response = requests.post(url, headers=headers, json=data, timeout=10)
+        if stream:
+            data["stream"] = True
+        if max_tokens:
+            data["max_tokens"] = max_tokens
+        return {"url": OPENAI_CHAT_URL, "headers": headers, "json": data, "timeout": 10}
+
+    def _local_request(self, prompt: str, system_prompt: str, stream: bool = False,
+                       max_tokens: Optional[int] = None, temperature: Optional[float] = None) -> Dict[str, Any]:
+        data = {
+            "model": self.local_model,
+            "prompt": f"{system_prompt}\n\nUser: {prompt}\nAssistant:",
+            "stream": stream
+        }
+        options = {}
+        if max_tokens:
+            options["num_predict"] = max_tokens
+        if temperature is not None:
+            options["temperature"] = temperature
+        if options:
+            data["options"] = options
+        return {"url": self.local_url, "json": data, "timeout": 30}
+
+    async def _call_openai(self, prompt: str, system_prompt: str, max_tokens: Optional[int] = None,
+                           temperature: Optional[float] = None) -> Optional[str]:
+        state = self._state()
+        request = self._openai_request(prompt, system_prompt, max_tokens=max_tokens, temperature=temperature)
+        async with state.limits["primary"]:
+            response = await state.client.post(**request)
         if response.status_code == 200:
             return response.json()['choices'][0]['message']['content']
         else:
             raise Exception(f"OpenAI error: {response.status_code} - {response.text}")
 
-    def _stream_openai(self, prompt: str, system_prompt: str):
-        url = "https://api.openai.com/v1/chat/completions"
-        headers = {"Authorization": f"Bearer {self.openai_key}", "Content-Type": "application/json"}
-        data = {
-            "model": self.primary_model,
-            "messages": [{"role": "system", "content": system_prompt}, {"role": "user", "content": prompt}],
-            "stream": True,
-            "temperature": 0.7 # Baseline for variance testing
-        }
-        response = requests.post(url, headers=headers, json=data, stream=True, timeout=10)
-        response.raise_for_status() # Raise an exception for HTTP errors
-        for line in response.iter_lines():
-            if line:
-                line = line.decode('utf-8')
-                if line.startswith('data: '):
-                    if line == 'data: [DONE]':
-                        break
-                    json_data = json.loads(line[6:])
-                    content = json_data['choices'][0].get('delta', {}).get('content')
-                    if content:
+    async def _stream_openai(self, prompt: str, system_prompt: str) -> AsyncIterator[str]:
+        state = self._state()
+        request = self._openai_request(prompt, system_prompt, stream=True)
+        parser = StreamParser(SSE, self.parse_stats)
+        async with state.limits["primary"]:
+            async with state.client.stream("POST", **request) as response:
+                response.raise_for_status() # Raise an exception for HTTP errors
+                async for data in response.aiter_bytes():
+                    for content in parser.feed(data):
                         yield content
+                    if parser.done:
+                        return
+                for content in parser.flush():
+                    yield content
 
-    def _call_local(self, prompt: str, system_prompt: str) -> str:
+    async def _call_local(self, prompt: str, system_prompt: str, max_tokens: Optional[int] = None,
+                          temperature: Optional[float] = None) -> str:
         """Calls local Ollama instance."""
-        data = {
-            "model": self.local_model,
-            "prompt": f"{system_prompt}\n\nUser: {prompt}\nAssistant:",
-            "stream": False
-        }
-        
-        response = requests.post(self.local_url, json=data, timeout=30)
+        state = self._state()
+        request = self._local_request(prompt, system_prompt, max_tokens=max_tokens, temperature=temperature)
+        async with state.limits["local"]:
+            response = await state.client.post(**request)
         if response.status_code == 200:
             return response.json()['response']
         else:
             raise Exception(f"Local Ollama error: {response.status_code}")
 
-    def _stream_local(self, prompt: str, system_prompt: str):
-        data = {"model": self.local_model, "prompt": f"{system_prompt}\n\nUser: {prompt}\nAssistant:", "stream": True}
-        response = requests.post(self.local_url, json=data, stream=True, timeout=30)
-        response.raise_for_status() # Raise an exception for HTTP errors
-        for line in response.iter_lines():
-            if line:
-                json_data = json.loads(line.decode('utf-8'))
-                yield json_data.get('response', '')
+    async def _stream_local(self, prompt: str, system_prompt: str) -> AsyncIterator[str]:
+        state = self._state()
+        parser = StreamParser(NDJSON, self.parse_stats)
+        async with state.limits["local"]:
+            async with state.client.stream("POST", **self._local_request(prompt, system_prompt, stream=True)) as response:
+                response.raise_for_status() # Raise an exception for HTTP errors
+                async for data in response.aiter_bytes():
+                    for content in parser.feed(data):
+                        yield content
+                for content in parser.flush():
+                    yield content
+
+    async def aclose(self):
+        """Closes the connection pool of the running event loop."""
+        state = self._states.pop(asyncio.get_running_loop(), None)
+        if state is not None:
+            await state.client.aclose()
+
+class SovereignRouter(AsyncSovereignRouter):
+    """
+    ΔΩ-INTELLIGENCE: 0xSOVEREIGN_ROUTER | STATUS: ACTIVE
+    Routes inference requests between Colonial APIs and Sovereign local backends.
+    Blocking facade over the async core: calls run on a private event loop thread that
+    keeps its connection pool alive between calls. Async callers use agenerate/astream_generate.
+    """
+    _DONE = object()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+
+    def _background_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="sovereign-router", daemon=True).start()
+                self._loop = loop
+        return self._loop
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._background_loop()).result()
+
+    def generate(self, prompt: str, system_prompt: str = "", max_tokens: Optional[int] = None,
+                 temperature: Optional[float] = None) -> str:
+        """Attempts primary inference, fails over to local if blocked. (Blocking)"""
+        return self._run(self.agenerate(prompt, system_prompt, max_tokens, temperature))
+
+    def generate_token(self, prompt: str, system_prompt: str = "", max_tokens: int = 8) -> str:
+        """Short continuation of `prompt`, used by the gasket for its alternate realities. (Blocking)"""
+        return self._run(self.agenerate_token(prompt, system_prompt, max_tokens))
+
+    def stream_generate(self, prompt: str, system_prompt: str = "") -> Iterator[str]:
+        """Generator that yields chunks from primary or local backend."""
+        chunks: "queue.Queue" = queue.Queue()
+
+        async def pump():
+            try:
+                async for chunk in self.astream_generate(prompt, system_prompt):
+                    chunks.put((chunk, None))
+            except Exception as e:
+                chunks.put((self._DONE, e))
+            else:
+                chunks.put((self._DONE, None))
+
+        future = asyncio.run_coroutine_threadsafe(pump(), self._background_loop())
+        try:
+            while True:
+                chunk, error = chunks.get()
+                if chunk is self._DONE:
+                    if error is not None:
+                        raise error
+                    return
+                yield chunk
+        finally:
+            # Consumer stopped early (e.g. Iron Dome): cancel the stream and release its connection
+            future.cancel()
+
+    def close(self):
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            asyncio.run_coroutine_threadsafe(self.aclose(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
 
 if __name__ == "__main__":
     # Test stub
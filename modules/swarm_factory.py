@@ -54,6 +54,14 @@ class SwarmFactory:
             print("\n>> SWARM SHUTDOWN INITIATED.")
         except Exception as e:
             print(f"\n>> CRITICAL SYSTEM FAILURE: {e}")
+        finally:
+            # The clones share one oracle: stop its refresher and pooled client on this loop
+            for oracle in {id(clone.oracle): clone.oracle for clone in self.clones}.values():
+                await oracle.aclose()
+
+    def latency_report(self) -> dict:
+        """Per-clone stage latencies (see CloneBase.latency)."""
+        return {clone.id: clone.latency.snapshot() for clone in self.clones}
 
 if __name__ == "__main__":
     # Test Harness
@@ -0,0 +1,116 @@
+import math
+import numpy as np
+from typing import Optional, Sequence
+
+# Kinetic entropy per unit of hourly realized volatility. Same scale as the oracle's
+# h1/h6 formula: a 1% hourly move -> 0.05, the constitutional variance limit.
+ENTROPY_PER_HOURLY_VOL = 5.0
+# Ceiling of the tick estimate: the gasket locks out above 2x the variance limit
+# (0.1, strict), so ticks alone can deny a trade but never trip the lockout.
+MAX_TICK_ENTROPY = 0.1
+
+class TickHistory:
+    """
+    ΔΩ-SYSTEM_4: LOCAL TICK MEMORY
+    Ring buffer of the last `capacity` log returns of one symbol's price ticks, with an
+    incremental realized-volatility estimate: the running sum of squared returns gains
+    the newest return and drops the evicted one, so a tick costs O(1) and memory is
+    fixed. Volatility is expressed per hour and mapped to kinetic entropy, so a crash
+    tick moves entropy on arrival instead of after DexScreener's h1 window. A window
+    shorter than `min_span` seconds gives no estimate, and one shorter than an hour is
+    not extrapolated to an hour: a single bounce in a few seconds is not a trend.
+    """
+    def __init__(self, capacity: int = 256, min_ticks: int = 8, rebase_every: int = 4096,
+                 min_span: float = 300.0):
+        self.capacity = capacity
+        self.min_ticks = min_ticks
+        self.min_span = min_span
+        self.rebase_every = rebase_every
+        self.returns_sq = np.zeros(capacity)
+        self.times = np.zeros(capacity)  # timestamp of the tick closing each return
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.head = 0
+        self.sum_sq = 0.0
+        self.start_time: Optional[float] = None  # tick opening the oldest return
+        self.last_time: Optional[float] = None
+        self.last_price: Optional[float] = None
+        self.pushes = 0
+
+    def push(self, timestamp: float, price: float):
+        """Adds one tick; non-positive prices and out-of-order timestamps are ignored."""
+        if not price > 0 or not math.isfinite(price):
+            return
+        if self.last_price is None:
+            self.start_time = self.last_time = timestamp
+            self.last_price = price
+            return
+        if timestamp <= self.last_time:
+            return
+
+        r = math.log(price / self.last_price)
+        slot = self.head
+        if self.count == self.capacity:
+            self.sum_sq -= self.returns_sq[slot]
+            self.start_time = self.times[slot]
+        else:
+            self.count += 1
+        self.returns_sq[slot] = r * r
+        self.times[slot] = timestamp
+        self.head = (slot + 1) % self.capacity
+        self.sum_sq += r * r
+        self.last_time, self.last_price = timestamp, price
+
+        self.pushes += 1
+        if self.pushes % self.rebase_every == 0:
+            # Cancel floating point drift accumulated by the running sum
+            self.sum_sq = float(self.returns_sq[:self.count].sum())
+
+    def backfill(self, timestamps: Sequence[float], prices: Sequence[float]):
+        """
+        Seeds the window from historical ticks in one vectorized pass, replacing its
+        contents; only the most recent `capacity` returns are kept.
+        """
+        t = np.asarray(timestamps, dtype=np.float64)
+        p = np.asarray(prices, dtype=np.float64)
+        valid = np.isfinite(t) & np.isfinite(p) & (p > 0)
+        t, p = t[valid], p[valid]
+        order = np.argsort(t, kind="stable")
+        t, p = t[order], p[order]
+        if len(t):
+            # Keep the first tick of any repeated timestamp, like push()
+            first = np.concatenate(([True], np.diff(t) > 0))
+            t, p = t[first], p[first]
+        t, p = t[-(self.capacity + 1):], p[-(self.capacity + 1):]
+
+        self.reset()
+        if not len(t):
+            return
+        returns_sq = np.diff(np.log(p)) ** 2
+        n = len(returns_sq)
+        self.returns_sq[:n] = returns_sq
+        self.times[:n] = t[1:]
+        self.count = n
+        self.head = n % self.capacity
+        self.sum_sq = float(returns_sq.sum())
+        self.start_time, self.last_time, self.last_price = float(t[0]), float(t[-1]), float(p[-1])
+
+    def hourly_volatility(self) -> Optional[float]:
+        """
+        Realized volatility per hour: windows over an hour are scaled down to one, shorter
+        ones count as they are. None until min_ticks returns spanning min_span seconds.
+        """
+        if self.count < self.min_ticks:
+            return None
+        span = self.last_time - self.start_time
+        if span <= 0 or span < self.min_span:
+            return None
+        return math.sqrt(max(self.sum_sq, 0.0) / max(span, 3600.0) * 3600.0)
+
+    def kinetic_entropy(self) -> Optional[float]:
+        vol = self.hourly_volatility()
+        if vol is None:
+            return None
+        return min(vol * ENTROPY_PER_HOURLY_VOL, MAX_TICK_ENTROPY)
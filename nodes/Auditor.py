@@ -1,42 +1,153 @@
-import os
-import json
+import math
+from collections import deque
 import pandas as pd
-import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from nodes.Sentinel import SentinelFileWatcher, FATIGUE_BREACH
+
+SENTINEL_LOCK = {
+    "approved": False,
+    "action": "HOLD",
+    "status": "LOCKED",
+    "reason": "SENTINEL INTERDICTION: High fatigue risk detected. Global trading lock enforced."
+}
+
+class ReturnStats:
+    """
+    Online mean/variance of equity returns (Welford), one update per equity tick.
+    With `window` set, only the last `window` returns count; evicted returns are
+    un-applied and the sums are re-based from the buffer once per window to stop drift.
+    """
+    def __init__(self, window: Optional[int] = None):
+        self.window = window
+        self.reset()
+
+    def reset(self):
+        self.ticks = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.last_equity = None
+        self._returns = deque()
+        self._evictions = 0
+
+    def update(self, equity: float):
+        equity = float(equity)
+        self.ticks += 1
+        last, self.last_equity = self.last_equity, equity
+        if last is None or last == 0:
+            return
+        ret = equity / last - 1
+        self.count += 1
+        delta = ret - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (ret - self.mean)
+
+        if self.window is None:
+            return
+        self._returns.append(ret)
+        if len(self._returns) > self.window:
+            old = self._returns.popleft()
+            self.count -= 1
+            delta = old - self.mean
+            self.mean -= delta / self.count
+            self.m2 -= delta * (old - self.mean)
+            self._evictions += 1
+            if self._evictions >= self.window:
+                self._rebase()
+
+    def _rebase(self):
+        self._evictions = 0
+        self.mean = math.fsum(self._returns) / self.count
+        self.m2 = math.fsum((r - self.mean) ** 2 for r in self._returns)
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1, as pandas)."""
+        if self.count < 2 or self.m2 <= 0:
+            return 0.0
+        return math.sqrt(self.m2 / (self.count - 1))
+
+    def sharpe(self, periods: int = 252) -> Optional[float]:
+        """Annualized Sharpe, or None when the returns have no dispersion."""
+        std = self.std
+        if std <= 0:
+            return None
+        return self.mean / std * math.sqrt(periods)
 
 class Auditor:
-    def __init__(self, strategy_path: str = "Strategy.md"):
+    def __init__(self,
+                 strategy_path: str = "Strategy.md",
+                 sharpe_window: Optional[int] = None,
+                 sentinel=None):
         self.hard_stop = 0.05
         self.soft_stop = 0.01
         self.min_sharpe = 2.0
+        self.min_sharpe_history = 60
+        # Sharpe gate statistics, fed once per equity tick (see record_equity)
+        self.sharpe_window = sharpe_window
+        self.returns = ReturnStats(sharpe_window)
+        # Cross-system circuit breaker: any object with status(at) / statuses(timestamps)
+        self.sentinel = sentinel or SentinelFileWatcher()
+
+    def record_equity(self, equity: float):
+        """Feeds one equity tick into the Sharpe gate's running statistics."""
+        self.returns.update(equity)
 
     def check_compliance(self, 
                          signal: str, 
                          current_equity: float, 
                          peak_equity: float, 
-                         history: pd.DataFrame,
+                         history: Optional[pd.DataFrame] = None,
                          position_status: str = "CLOSED", # "OPEN" or "CLOSED"
                          proposed_position: float = 0.0) -> Dict[str, Any]:
         """
         Returns: {'approved': bool, 'action': str, 'status': str, 'reason': str}
+        `history` is an append-only equity frame; only rows not yet seen are folded
+        into the running statistics. Omit it when feeding ticks via record_equity.
         """
         # 0. CROSS-SYSTEM CIRCUIT BREAKER: SENTINEL FATIGUE CHECK
-        sentinel_path = r"c:\Users\colem\blackglass-sentinel\sentinel_status.json"
-        if os.path.exists(sentinel_path):
-            try:
-                with open(sentinel_path, 'r') as f:
-                    sentinel_data = json.load(f)
-                    if sentinel_data.get("status") == "FATIGUE_BREACH":
-                        return {
-                            "approved": False,
-                            "action": "HOLD",
-                            "status": "LOCKED",
-                            "reason": "SENTINEL INTERDICTION: High fatigue risk detected. Global trading lock enforced."
-                        }
-            except Exception:
-                pass # Fail open to telemetry errors, but logged in TUI
+        sentinel_lock = self.check_sentinel()
+        if sentinel_lock:
+            return sentinel_lock
         current_drawdown = (peak_equity - current_equity) / peak_equity if peak_equity > 0 else 0
-        
+
+        if history is not None:
+            self._sync_history(history)
+
+        # Sharpe is only needed for BUYs that survive the soft stop
+        sharpe = None
+        if signal == "BUY" and current_drawdown <= self.soft_stop and self.returns.ticks >= self.min_sharpe_history:
+            sharpe = self.returns.sharpe()
+
+        return self.check_risk(signal, current_drawdown, position_status, sharpe)
+
+    def _sync_history(self, history: pd.DataFrame):
+        """Catches the running statistics up with rows appended since the last call."""
+        if len(history) < self.returns.ticks:
+            # A fresh (shorter) history means a new run
+            self.returns.reset()
+        if len(history) > self.returns.ticks:
+            for equity in history['equity'].iloc[self.returns.ticks:].tolist():
+                self.returns.update(equity)
+
+    def check_sentinel(self, at=None) -> Optional[Dict[str, Any]]:
+        """
+        Returns the LOCKED verdict if the Sentinel reports a fatigue breach, else None.
+        `at` is the decision time; live watchers ignore it, injected timelines use it.
+        """
+        if self.sentinel.status(at) == FATIGUE_BREACH:
+            return dict(SENTINEL_LOCK)
+        return None
+
+    def check_risk(self,
+                   signal: str,
+                   current_drawdown: float,
+                   position_status: str = "CLOSED",
+                   sharpe: Optional[float] = None) -> Dict[str, Any]:
+        """
+        The pure rule table behind check_compliance.
+        `sharpe` is None when there is not enough history (or no dispersion) to judge.
+        """
         # 1. THE KILL SWITCH (Interdiction)
         if current_drawdown >= self.hard_stop and position_status == "OPEN":
             return {
@@ -65,17 +176,13 @@ class Auditor:
                     "reason": f"Vetoed: Cannot add risk while in drawdown {current_drawdown:.2%} > 1%."
                 }
             # Add Sharpe check if sufficient history
-            if len(history) >= 60:
-                returns = history['equity'].pct_change().dropna()
-                if returns.std() > 0:
-                    sharpe = returns.mean() / returns.std() * np.sqrt(252)
-                    if sharpe < self.min_sharpe:
-                        return {
-                            "approved": False,
-                            "action": "HOLD",
-                            "status": "VETO",
-                            "reason": f"Sharpe too low: {sharpe:.2f} < 2.0"
-                        }
+            if sharpe is not None and sharpe < self.min_sharpe:
+                return {
+                    "approved": False,
+                    "action": "HOLD",
+                    "status": "VETO",
+                    "reason": f"Sharpe too low: {sharpe:.2f} < 2.0"
+                }
             
             return {"approved": True, "action": "BUY", "status": "APPROVED", "reason": "Clear sky."}
 
@@ -0,0 +1,166 @@
+# nodes/Backtester.py
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Optional
+from nodes.Predictor import Predictor, SIGNAL_NAMES
+from nodes.Auditor import Auditor, ReturnStats, SENTINEL_LOCK
+from nodes.Sentinel import FATIGUE_BREACH
+
+class Backtester:
+    """
+    Single-pass engine for the Shard Delta stress test.
+    Crossover signals, intraday lows and the equity curve are NumPy arrays; the
+    path-dependent Auditor/Executor state is walked once with O(1) work per candle,
+    instead of re-slicing and re-scanning the tape on every tick.
+    """
+    def __init__(self,
+                 predictor: Optional[Predictor] = None,
+                 auditor: Optional[Auditor] = None,
+                 initial_cash: float = 100000.0,
+                 warmup: int = 20,
+                 verbose: bool = False):
+        self.predictor = predictor or Predictor(short_window=5, long_window=20)
+        self.auditor = auditor or Auditor()
+        self.initial_cash = initial_cash
+        self.warmup = warmup
+        self.verbose = verbose
+        self.equity_curve = pd.Series(dtype=np.float64)
+
+    def run(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Input: DataFrame with 'close' and 'low' columns on a DatetimeIndex
+        Output: the results.json payload (trades, veto_log, compliance_log, max_drawdown, ...)
+        """
+        n = len(df)
+        start = min(self.warmup, n)
+        auditor = self.auditor
+        hard_stop = auditor.hard_stop
+        min_history = auditor.min_sharpe_history
+
+        # Signal at candle i is generated from closes[:i] (yesterday's crossover)
+        signals = np.zeros(n, dtype=np.int8)
+        if n > 1:
+            signals[1:] = self.predictor.generate_signals(df['close'].to_numpy())[:-1]
+        closes = df['close'].to_numpy(dtype=np.float64).tolist()
+        lows = df['low'].to_numpy(dtype=np.float64).tolist()
+        signal_names = [SIGNAL_NAMES[s] for s in signals.tolist()]
+        dates = [str(d) for d in pd.DatetimeIndex(df.index).date]
+        equity_curve = np.empty(n - start, dtype=np.float64)
+
+        # Sentinel status per candle, resolved up front: an injected timeline is a
+        # searchsorted, a live file watcher is read once for the whole run
+        sentinel_locked = auditor.sentinel.statuses(df.index) == FATIGUE_BREACH
+        last_sentinel_lock = int(np.flatnonzero(sentinel_locked)[-1]) if sentinel_locked.any() else -1
+        sentinel_locked = sentinel_locked.tolist()
+
+        # Executor state
+        cash = self.initial_cash
+        position = 0.0
+        equity = cash
+        peak = equity
+        trades = []
+
+        vetoes = []
+        compliance_logs = []
+        compliance = None
+
+        # Run-local Sharpe statistics (the auditor's live accumulator is left alone)
+        returns = ReturnStats(auditor.sharpe_window)
+
+        for i in range(start, n):
+            price = closes[i]
+            today = dates[i]
+            pos_status = "OPEN" if position > 0 else "CLOSED"
+
+            # [ARCHITECT PATCH] :: INTRADAY KILL SWITCH
+            if pos_status == "OPEN":
+                intraday_equity = position * lows[i]
+                drawdown = (peak - intraday_equity) / peak if peak > 0 else 0
+                compliance = SENTINEL_LOCK if sentinel_locked[i] else auditor.check_risk("HOLD", drawdown, "OPEN")
+
+                if compliance['status'] == "INTERDICTION":
+                    # Simulated liquidation at the Hard Stop threshold
+                    stop_price = (peak * (1 - hard_stop)) / position
+                    if self.verbose:
+                        print(f"[{today}] !! INTRADAY INTERDICTION !! STOP HIT @ {stop_price:.2f} | Low: {lows[i]:.2f}")
+                    cash += position * stop_price
+                    trades.append({'action': 'SELL', 'price': stop_price, 'size': position})
+                    position = 0.0
+                    equity = cash + position * stop_price
+                    peak = max(peak, equity)
+                    compliance_logs.append({"date": today, "status": "INTERDICTION", "reason": compliance['reason']})
+                    pos_status = "CLOSED"
+
+            signal = signal_names[i]
+
+            # Truth Audits (Only if not already interdicted this tick)
+            if pos_status != "CLOSED" or (not compliance_logs or compliance_logs[-1]['date'] != today):
+                if sentinel_locked[i]:
+                    compliance = SENTINEL_LOCK
+                else:
+                    drawdown = (peak - equity) / peak if peak > 0 else 0
+                    sharpe = returns.sharpe() if signal == "BUY" and returns.ticks >= min_history else None
+                    compliance = auditor.check_risk(signal, drawdown, pos_status, sharpe)
+
+            status = compliance['status']
+            if status == "INTERDICTION":
+                if self.verbose:
+                    print(f"[{today}] !! INTERDICTION !! FORCE SELL @ {price:.2f} | Reason: {compliance['reason']}")
+                if position > 0:
+                    cash += position * price
+                    trades.append({'action': 'SELL', 'price': price, 'size': position})
+                    position = 0.0
+                compliance_logs.append({"date": today, "status": "INTERDICTION", "reason": compliance['reason']})
+            elif status == "LOCKED":
+                if self.verbose and i % 30 == 0:
+                    print(f"[{today}] SYSTEM LOCKED | Reason: {compliance['reason']}")
+                compliance_logs.append({"date": today, "status": "LOCKED", "reason": compliance['reason']})
+                if position == 0 and compliance is not SENTINEL_LOCK and i >= last_sentinel_lock:
+                    # Flat and drawdown-locked is absorbing: equity and verdict never change again
+                    equity = cash
+                    peak = max(peak, equity)
+                    equity_curve[i - start:] = equity
+                    self._fill_locked(compliance, compliance_logs, dates, i + 1, n)
+                    break
+            elif compliance['approved']:
+                action = compliance['action']
+                if action == "BUY" and cash > 0:
+                    size = cash / price
+                    position += size
+                    cash = 0
+                    trades.append({'action': 'BUY', 'price': price, 'size': size})
+                elif action == "SELL" and position > 0:
+                    cash += position * price
+                    trades.append({'action': 'SELL', 'price': price, 'size': position})
+                    position = 0.0
+            else:
+                # VETO
+                vetoes.append({"date": today, "signal": signal, "reason": compliance['reason']})
+                if self.verbose and signal != "HOLD":
+                    print(f"[{today}] VETO: {signal} blocked - {compliance['reason']}")
+
+            equity = cash + position * price
+            peak = max(peak, equity)
+
+            equity_curve[i - start] = equity
+            returns.update(equity)
+
+        self.equity_curve = pd.Series(equity_curve, index=df.index[start:], name='equity')
+        return {
+            "final_equity": equity,
+            "total_trades": len(trades),
+            "trades": trades,
+            "veto_count": len(vetoes),
+            "veto_log": vetoes,
+            "compliance_log": compliance_logs,
+            "peak_equity": peak,
+            "max_drawdown": (peak - equity) / peak if peak > 0 else 0
+        }
+
+    def _fill_locked(self, compliance: Dict[str, Any], compliance_logs: list, dates: list, begin: int, end: int):
+        """Bulk-emits the LOCKED tail once the account can no longer move."""
+        reason = compliance['reason']
+        if self.verbose:
+            for i in range(begin + (-begin) % 30, end, 30):
+                print(f"[{dates[i]}] SYSTEM LOCKED | Reason: {reason}")
+        compliance_logs.extend({"date": dates[i], "status": "LOCKED", "reason": reason} for i in range(begin, end))
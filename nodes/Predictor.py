@@ -1,7 +1,12 @@
 # nodes/Predictor.py
+import math
 import pandas as pd
 import numpy as np
 
+# Signal codes used by the vectorized path (see generate_signals)
+HOLD, BUY, SELL = 0, 1, -1
+SIGNAL_NAMES = {HOLD: 'HOLD', BUY: 'BUY', SELL: 'SELL'}
+
 class Predictor:
     def __init__(self, short_window=5, long_window=20):
         self.short_window = short_window
@@ -28,3 +33,121 @@ class Predictor:
             return 'SELL'
         else:
             return 'HOLD'
+
+    def generate_signals(self, close) -> np.ndarray:
+        """
+        Vectorized crossover over a whole tape in one pass.
+        Input: array-like of closes
+        Output: int8 array of BUY/SELL/HOLD codes where signals[i] equals
+                generate_signal(df.iloc[:i + 1]).
+        """
+        close = pd.Series(np.asarray(close, dtype=np.float64))
+        signals = np.zeros(len(close), dtype=np.int8)
+        if len(close) < max(self.long_window, 2):
+            return signals
+
+        # Same rolling kernel as generate_signal, so crossovers match exactly
+        sma_short = close.rolling(window=self.short_window).mean().to_numpy()
+        sma_long = close.rolling(window=self.long_window).mean().to_numpy()
+
+        cur_s, cur_l = sma_short[1:], sma_long[1:]
+        prev_s, prev_l = sma_short[:-1], sma_long[:-1]
+        # NaN comparisons are False, which reproduces the warm-up HOLDs
+        signals[1:][(cur_s > cur_l) & (prev_s <= prev_l)] = BUY
+        signals[1:][(cur_s < cur_l) & (prev_s >= prev_l)] = SELL
+        signals[:self.long_window - 1] = HOLD
+        return signals
+
+
+class _RollingMean:
+    """
+    O(1) fixed-window mean over a ring buffer.
+    Mirrors pandas' rolling-mean kernel (Kahan-compensated add/remove, exact
+    value for flat windows) so streaming and batch SMAs agree bit for bit.
+    """
+    __slots__ = ('window', 'buffer', 'head', 'nobs', 'sum_x', 'comp_add', 'comp_remove',
+                 'neg_ct', 'same_ct', 'prev_value')
+
+    def __init__(self, window: int):
+        self.window = window
+        self.buffer = [0.0] * window
+        self.head = 0
+        self.nobs = 0
+        self.sum_x = 0.0
+        self.comp_add = 0.0
+        self.comp_remove = 0.0
+        self.neg_ct = 0
+        self.same_ct = 0
+        self.prev_value = math.nan
+
+    def update(self, value: float) -> float:
+        if self.nobs == self.window:
+            old = self.buffer[self.head]
+            self.nobs -= 1
+            y = -old - self.comp_remove
+            t = self.sum_x + y
+            self.comp_remove = t - self.sum_x - y
+            self.sum_x = t
+            if math.copysign(1.0, old) < 0:
+                self.neg_ct -= 1
+
+        self.buffer[self.head] = value
+        self.head = (self.head + 1) % self.window
+        self.nobs += 1
+        y = value - self.comp_add
+        t = self.sum_x + y
+        self.comp_add = t - self.sum_x - y
+        self.sum_x = t
+        if math.copysign(1.0, value) < 0:
+            self.neg_ct += 1
+        self.same_ct = self.same_ct + 1 if value == self.prev_value else 1
+        self.prev_value = value
+
+        if self.nobs < self.window:
+            return math.nan
+        if self.same_ct >= self.nobs:
+            return self.prev_value
+        mean = self.sum_x / self.nobs
+        if self.neg_ct == 0 and mean < 0:
+            return 0.0
+        if self.neg_ct == self.nobs and mean > 0:
+            return 0.0
+        return mean
+
+class StreamingPredictor:
+    """
+    Stateful crossover for the live loop: one close in, one signal out, O(1) per tick.
+    update() returns exactly what Predictor.generate_signal would return on the
+    full history seen so far, without re-slicing or copying a DataFrame.
+    """
+    def __init__(self, short_window=5, long_window=20):
+        self.short_window = short_window
+        self.long_window = long_window
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self._short = _RollingMean(self.short_window)
+        self._long = _RollingMean(self.long_window)
+        self._prev_short = math.nan
+        self._prev_long = math.nan
+
+    def update(self, close: float) -> str:
+        """
+        Input: the newest close
+        Output: 'BUY', 'SELL', 'HOLD'
+        """
+        sma_short = self._short.update(float(close))
+        sma_long = self._long.update(float(close))
+        prev_short, prev_long = self._prev_short, self._prev_long
+        self._prev_short, self._prev_long = sma_short, sma_long
+        self.count += 1
+
+        if self.count < self.long_window:
+            return 'HOLD'
+        if sma_short > sma_long and prev_short <= prev_long:
+            return 'BUY'
+        elif sma_short < sma_long and prev_short >= prev_long:
+            return 'SELL'
+        else:
+            return 'HOLD'
@@ -0,0 +1,77 @@
+# nodes/Sentinel.py
+import os
+import json
+import time
+import bisect
+import numpy as np
+import pandas as pd
+from typing import Iterable, Optional, Tuple, Any
+
+FATIGUE_BREACH = "FATIGUE_BREACH"
+DEFAULT_SENTINEL_PATH = r"c:\Users\colem\blackglass-sentinel\sentinel_status.json"
+
+class SentinelFileWatcher:
+    """
+    Cached view of the Sentinel's status file.
+    The file is stat()'d at most once per `poll_interval` seconds and only re-parsed
+    when its mtime/size/inode change, so a status flip is seen within `poll_interval`.
+    """
+    def __init__(self, path: str = DEFAULT_SENTINEL_PATH, poll_interval: float = 1.0):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._status: Optional[str] = None
+        self._signature = None
+        self._next_poll = 0.0
+
+    def status(self, at: Any = None) -> Optional[str]:
+        """Current Sentinel status ('FATIGUE_BREACH', ...) or None. `at` is ignored: this is live."""
+        now = time.monotonic()
+        if now >= self._next_poll:
+            self._next_poll = now + self.poll_interval
+            self._poll()
+        return self._status
+
+    def statuses(self, timestamps: Iterable) -> np.ndarray:
+        """The live status, broadcast over a backtest's candles."""
+        return np.full(len(timestamps), self.status(), dtype=object)
+
+    def _poll(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            self._signature = None
+            self._status = None
+            return
+
+        signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+        if signature == self._signature:
+            return
+        self._signature = signature
+        try:
+            with open(self.path, 'r') as f:
+                self._status = json.load(f).get("status")
+        except Exception:
+            self._status = None # Fail open to telemetry errors, but logged in TUI
+
+class SentinelTimeline:
+    """
+    Injected Sentinel history for backtests: [(timestamp, status), ...].
+    The status at time t is the last event at or before t; nothing touches disk.
+    """
+    def __init__(self, events: Iterable[Tuple[Any, Optional[str]]] = (), initial: Optional[str] = None):
+        events = sorted(((pd.Timestamp(t), s) for t, s in events), key=lambda e: e[0])
+        self.times = [t for t, _ in events]
+        self.values = [initial] + [s for _, s in events]
+
+    def status(self, at: Any = None) -> Optional[str]:
+        if at is None:
+            return self.values[-1]
+        return self.values[bisect.bisect_right(self.times, pd.Timestamp(at))]
+
+    def statuses(self, timestamps: Iterable) -> np.ndarray:
+        """Vectorized lookup of the status in effect at each timestamp."""
+        if not self.times:
+            return np.full(len(timestamps), self.values[0], dtype=object)
+        positions = np.searchsorted(pd.DatetimeIndex(self.times).as_unit("ns").asi8,
+                                    pd.DatetimeIndex(timestamps).as_unit("ns").asi8, side='right')
+        return np.array(self.values, dtype=object)[positions]
@@ -0,0 +1,133 @@
+# nodes/Sweep.py
+import itertools
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Any, Iterable, List, Optional
+from nodes.Predictor import Predictor
+from nodes.Auditor import Auditor
+from nodes.Backtester import Backtester
+from nodes.Tape import load_tape
+
+SWEEP_PARAMS = ("short_window", "long_window", "hard_stop", "soft_stop")
+DEFAULT_GRID = {"short_window": [5], "long_window": [20], "hard_stop": [0.05], "soft_stop": [0.01]}
+
+# Per-worker state, set once by _init_worker
+_SHM = None
+_TAPE = None
+
+def expand_grid(grid: Dict[str, Iterable]) -> List[Dict[str, Any]]:
+    """
+    Cartesian product of the grid, skipping configs whose short SMA is not shorter than the long one.
+    Missing keys fall back to the stress-test defaults.
+    """
+    unknown = set(grid) - set(SWEEP_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+    axes = [list(grid.get(name, DEFAULT_GRID[name])) for name in SWEEP_PARAMS]
+    configs = [dict(zip(SWEEP_PARAMS, values)) for values in itertools.product(*axes)]
+    return [c for c in configs if c["short_window"] < c["long_window"]]
+
+def publish_tape(df: pd.DataFrame):
+    """
+    Packs the OHLC frame into one SharedMemory block: int64 timestamps, then one float64 column each.
+    Returns (shm, spec); the caller owns the block and must close()/unlink() it.
+    """
+    index = pd.DatetimeIndex(df.index).as_unit("ns")
+    columns = list(df.columns)
+    n = len(df)
+    shm = shared_memory.SharedMemory(create=True, size=max(8 * n * (len(columns) + 1), 1))
+    block = np.ndarray((len(columns) + 1, n), dtype=np.int64, buffer=shm.buf)
+    block[0] = index.asi8
+    values = block[1:].view(np.float64)
+    for row, column in enumerate(columns):
+        values[row] = df[column].to_numpy(dtype=np.float64)
+    spec = {"name": shm.name, "length": n, "columns": columns, "tz": str(index.tz) if index.tz else None}
+    return shm, spec
+
+def attach_tape(spec: Dict[str, Any]):
+    """Maps a published tape back into a DataFrame whose columns are views on the shared block."""
+    shm = shared_memory.SharedMemory(name=spec["name"])
+    columns = spec["columns"]
+    block = np.ndarray((len(columns) + 1, spec["length"]), dtype=np.int64, buffer=shm.buf)
+    index = pd.DatetimeIndex(block[0].view("datetime64[ns]"))
+    if spec["tz"]:
+        index = index.tz_localize("UTC").tz_convert(spec["tz"])
+    values = block[1:].view(np.float64)
+    df = pd.DataFrame({column: values[row] for row, column in enumerate(columns)}, index=index, copy=False)
+    return shm, df
+
+def _init_worker(spec: Dict[str, Any]):
+    global _SHM, _TAPE
+    _SHM, _TAPE = attach_tape(spec)
+
+def _init_worker_from_tape(tape_path: str):
+    global _TAPE
+    _TAPE = load_tape(tape_path)
+
+def run_config(config: Dict[str, Any], df: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+    """Backtests one (short_window, long_window, hard_stop, soft_stop) config and summarizes it."""
+    df = _TAPE if df is None else df
+    auditor = Auditor()
+    auditor.hard_stop = config["hard_stop"]
+    auditor.soft_stop = config["soft_stop"]
+    predictor = Predictor(short_window=config["short_window"], long_window=config["long_window"])
+    results = Backtester(predictor, auditor).run(df)
+
+    statuses = [c["status"] for c in results["compliance_log"]]
+    return {
+        **config,
+        "final_equity": results["final_equity"],
+        "max_drawdown": results["max_drawdown"],
+        "total_trades": results["total_trades"],
+        "veto_count": results["veto_count"],
+        "interdictions": statuses.count("INTERDICTION"),
+        "locked_candles": statuses.count("LOCKED"),
+    }
+
+class ParameterSweep:
+    """
+    Fans Shard Delta backtests for a parameter grid out over a process pool.
+    The frame is published once into shared memory (or, given `tape_path`, each worker
+    memory-maps the same columnar tape); each worker maps it once at startup and reuses
+    it for every config it runs.
+    """
+    def __init__(self,
+                 df: Optional[pd.DataFrame] = None,
+                 max_workers: Optional[int] = None,
+                 chunksize: int = 4,
+                 tape_path: Optional[str] = None):
+        if df is None and tape_path is None:
+            raise ValueError("ParameterSweep needs a DataFrame or a tape_path")
+        self.df = df[["close", "high", "low"]] if df is not None else None
+        self.tape_path = tape_path
+        self.max_workers = max_workers
+        self.chunksize = chunksize
+
+    def run(self, grid: Dict[str, Iterable]) -> pd.DataFrame:
+        """
+        Returns one row per config with the columns
+        short_window, long_window, hard_stop, soft_stop, final_equity, max_drawdown,
+        total_trades, veto_count, interdictions, locked_candles.
+        """
+        configs = expand_grid(grid)
+        if self.tape_path is not None:
+            rows = self._map(configs, _init_worker_from_tape, (self.tape_path,))
+        else:
+            shm, spec = publish_tape(self.df)
+            try:
+                rows = self._map(configs, _init_worker, (spec,))
+            finally:
+                shm.close()
+                shm.unlink()
+
+        columns = list(SWEEP_PARAMS) + ["final_equity", "max_drawdown", "total_trades",
+                                        "veto_count", "interdictions", "locked_candles"]
+        return pd.DataFrame({c: [row[c] for row in rows] for c in columns})
+
+    def _map(self, configs: List[Dict[str, Any]], initializer, initargs) -> List[Dict[str, Any]]:
+        with ProcessPoolExecutor(max_workers=self.max_workers,
+                                 initializer=initializer,
+                                 initargs=initargs) as pool:
+            return list(pool.map(run_config, configs, chunksize=self.chunksize))
@@ -0,0 +1,77 @@
+# nodes/Tape.py
+import os
+import sys
+import json
+import numpy as np
+import pandas as pd
+
+TAPE_VERSION = 1
+TAPE_COLUMNS = ['close', 'high', 'low']
+
+def read_ohlc_csv(file_path: str) -> pd.DataFrame:
+    """
+    Parses an OHLC CSV (yfinance export or similar) into the close/high/low frame.
+    """
+    df = pd.read_csv(file_path, index_col=0, parse_dates=True)
+    # Ensure all columns are lowercase for consistency
+    df.columns = [c.lower() for c in df.columns]
+
+    if 'close' not in df.columns:
+        if 'last' in df.columns:
+            df = df.rename(columns={'last': 'close'})
+
+    df = df.ffill()
+    return df[TAPE_COLUMNS]
+
+def write_tape(df: pd.DataFrame, tape_path: str):
+    """
+    Writes a columnar tape: a directory with one raw .npy per column, int64 ns
+    timestamps in index.npy and a small meta.json describing the layout.
+    """
+    os.makedirs(tape_path, exist_ok=True)
+    index = pd.DatetimeIndex(df.index).as_unit("ns")
+    np.save(os.path.join(tape_path, "index.npy"), index.asi8)
+    for column in TAPE_COLUMNS:
+        np.save(os.path.join(tape_path, f"{column}.npy"), np.ascontiguousarray(df[column].to_numpy(dtype=np.float64)))
+
+    meta = {
+        "version": TAPE_VERSION,
+        "rows": len(df),
+        "columns": TAPE_COLUMNS,
+        "tz": str(index.tz) if index.tz else None,
+        "start": str(index[0]) if len(index) else None,
+        "end": str(index[-1]) if len(index) else None,
+    }
+    with open(os.path.join(tape_path, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+
+def load_tape(tape_path: str) -> pd.DataFrame:
+    """
+    Memory-maps a tape written by write_tape. Columns are read-only views on the
+    files, so nothing is parsed or copied and concurrent readers share the page cache.
+    """
+    with open(os.path.join(tape_path, "meta.json"), "r") as f:
+        meta = json.load(f)
+    if meta.get("version") != TAPE_VERSION:
+        raise ValueError(f"Unsupported tape version {meta.get('version')} at {tape_path}")
+
+    stamps = np.load(os.path.join(tape_path, "index.npy"), mmap_mode="r")
+    index = pd.DatetimeIndex(stamps.view("datetime64[ns]"))
+    if meta["tz"]:
+        index = index.tz_localize("UTC").tz_convert(meta["tz"])
+
+    columns = {c: np.load(os.path.join(tape_path, f"{c}.npy"), mmap_mode="r") for c in meta["columns"]}
+    return pd.DataFrame(columns, index=index, copy=False)
+
+def is_tape(file_path: str) -> bool:
+    return os.path.isfile(os.path.join(file_path, "meta.json"))
+
+if __name__ == "__main__":
+    # Converter: python nodes/Tape.py data/btc_usd_2022.csv data/btc_usd_2022.tape
+    if len(sys.argv) != 3:
+        print("Usage: python nodes/Tape.py <input.csv> <output.tape>")
+        sys.exit(1)
+    src, dst = sys.argv[1], sys.argv[2]
+    frame = read_ohlc_csv(src)
+    write_tape(frame, dst)
+    print(f">> [TAPE] {len(frame)} candles written to {dst}")
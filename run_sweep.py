@@ -0,0 +1,48 @@
+import os
+import sys
+import argparse
+
+# Add current dir to path
+sys.path.append(os.getcwd())
+
+from main import load_historical_data
+from nodes.Sweep import ParameterSweep
+from nodes.Tape import is_tape
+
+def parse_list(cast):
+    return lambda text: [cast(v) for v in text.split(",") if v]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Shard Delta parameter sweep")
+    parser.add_argument("--data", default="data/btc_usd_2022.csv", help="Historical OHLC CSV or columnar .tape")
+    parser.add_argument("--short-window", type=parse_list(int), default=[5], help="e.g. 3,5,8")
+    parser.add_argument("--long-window", type=parse_list(int), default=[20], help="e.g. 20,30,50")
+    parser.add_argument("--hard-stop", type=parse_list(float), default=[0.05], help="e.g. 0.03,0.05")
+    parser.add_argument("--soft-stop", type=parse_list(float), default=[0.01], help="e.g. 0.005,0.01")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--out", default="sweep_results.csv", help="Aggregated results table")
+    args = parser.parse_args()
+
+    try:
+        df = load_historical_data(args.data)
+    except Exception as e:
+        print(f"Error loading data: {e}")
+        sys.exit(1)
+
+    grid = {
+        "short_window": args.short_window,
+        "long_window": args.long_window,
+        "hard_stop": args.hard_stop,
+        "soft_stop": args.soft_stop,
+    }
+    print(f">> [SWEEP] {len(df)} candles | grid: {grid}")
+    # Columnar tapes are mapped by each worker directly instead of being copied into shared memory
+    if is_tape(args.data):
+        sweep = ParameterSweep(max_workers=args.workers, tape_path=args.data)
+    else:
+        sweep = ParameterSweep(df, max_workers=args.workers)
+    table = sweep.run(grid)
+    table.to_csv(args.out, index=False)
+
+    print(f">> [SWEEP] {len(table)} configurations complete. Results saved to {args.out}")
+    print(table.sort_values("final_equity", ascending=False).head(10).to_string(index=False))
@@ -1,5 +1,6 @@
 // supabase/functions/sovereign_embed/index.ts
 import { serve } from "https://deno.land/std@0.168.0/http/server.ts"
+import { encode as encodeBase64 } from "https://deno.land/std@0.168.0/encoding/base64.ts"
 import { pipeline, env } from 'https://cdn.jsdelivr.net/npm/@xenova/transformers@2.6.0'
 
 // --- DOXO CONFIGURATION ---
@@ -7,26 +8,62 @@ import { pipeline, env } from 'https://cdn.jsdelivr.net/npm/@xenova/transformers
 env.allowLocalModels = false;
 env.useBrowserCache = false;
 
+const DIMENSIONS = 384;
+// Upper bound on texts per request, keeps one batch inside the Edge memory budget
+const MAX_BATCH = 256;
+
 // Pre-warm the model
 console.log("[SOVEREIGN] Initializing all-MiniLM-L6-v2...");
 const embedder = await pipeline('feature-extraction', 'Xenova/all-MiniLM-L6-v2');
 console.log("[SOVEREIGN] Model Ready.");
 
+function jsonResponse(body: unknown, status = 200) {
+    return new Response(JSON.stringify(body), { status, headers: { "Content-Type": "application/json" } });
+}
+
 serve(async (req) => {
     const startTime = Date.now();
 
     try {
-        const { text } = await req.json();
+        const body = await req.json();
+        // `input` may be a string or an array of strings; `text` is the legacy single-string field
+        const input = body.input ?? body.text;
+
+        if (Array.isArray(input)) {
+            if (input.length === 0 || !input.every((t) => typeof t === "string")) {
+                return jsonResponse({ error: "'input' must be a non-empty array of strings" }, 400);
+            }
+            if (input.length > MAX_BATCH) {
+                return jsonResponse({ error: `Batch of ${input.length} exceeds limit ${MAX_BATCH}` }, 413);
+            }
+
+            // One pipeline invocation for the whole batch: output.data is a packed [n, 384] Float32Array
+            const output = await embedder(input, {
+                pooling: 'mean',
+                normalize: true
+            });
+            const vectors = output.data as Float32Array;
+            const duration = Date.now() - startTime;
+
+            console.log(`[SOVEREIGN] Batch of ${input.length} embedded in ${duration}ms`);
+
+            // Packed response: little-endian float32 rows, base64 encoded, instead of a JSON number array
+            return jsonResponse({
+                model: 'sovereign-minilm-l6',
+                encoding: 'f32le-base64',
+                count: input.length,
+                dims: DIMENSIONS,
+                data: encodeBase64(new Uint8Array(vectors.buffer, vectors.byteOffset, vectors.byteLength)),
+                latency_ms: duration
+            });
+        }
 
-        if (!text) {
-            return new Response(
-                JSON.stringify({ error: "Missing 'text' field" }),
-                { status: 400, headers: { "Content-Type": "application/json" } }
-            );
+        if (!input || typeof input !== "string") {
+            return jsonResponse({ error: "Missing 'input' (string or string[]) or 'text' field" }, 400);
         }
 
         // Generate Sovereign Embedding
-        const output = await embedder(text, {
+        const output = await embedder(input, {
             pooling: 'mean',
             normalize: true
         });
@@ -36,20 +73,14 @@ serve(async (req) => {
 
         console.log(`[SOVEREIGN] Embedding generated in ${duration}ms | Length: ${embedding.length}`);
 
-        return new Response(
-            JSON.stringify({
-                embedding,
-                model: 'sovereign-minilm-l6',
-                dimensions: 384,
-                latency_ms: duration
-            }),
-            { headers: { "Content-Type": "application/json" } }
-        );
+        return jsonResponse({
+            embedding,
+            model: 'sovereign-minilm-l6',
+            dimensions: DIMENSIONS,
+            latency_ms: duration
+        });
     } catch (error) {
         console.error("[SOVEREIGN] CRITICAL_FAILURE:", error);
-        return new Response(
-            JSON.stringify({ error: error.message }),
-            { status: 500, headers: { "Content-Type": "application/json" } }
-        );
+        return jsonResponse({ error: error.message }, 500);
     }
 })
@@ -0,0 +1,118 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Verify paths
+sys.path.append(os.getcwd())
+
+from modules.alternates import AlternateGenerator
+
+
+class TestAlternateGenerator(unittest.TestCase):
+    def setUp(self):
+        self.generator = AlternateGenerator(max_workers=4, deadline=1.0)
+
+    def tearDown(self):
+        self.generator.close()
+
+    def test_alternates_run_concurrently(self):
+        """All k calls are in flight at once: a barrier of k only opens if they overlap."""
+        print("\n=== TEST: CONCURRENT ALTERNATES ===")
+        barrier = threading.Barrier(3, timeout=2)
+
+        def token(prompt):
+            barrier.wait()
+            return prompt + "!"
+
+        self.assertEqual(self.generator.generate(token, "ctx", 3), ["ctx!"] * 3)
+        self.assertEqual(self.generator.late, 0)
+
+    def test_late_and_failed_alternates_dropped(self):
+        calls = iter(range(3))
+        lock = threading.Lock()
+        release = threading.Event()
+
+        def token(prompt):
+            with lock:
+                i = next(calls)
+            if i == 1:
+                release.wait(2)
+                return "late"
+            if i == 2:
+                raise RuntimeError("backend offline")
+            return "fast"
+
+        start = time.perf_counter()
+        alternates = self.generator.generate(token, "ctx", 3, deadline=0.1)
+        elapsed = time.perf_counter() - start
+        release.set()
+
+        self.assertEqual(alternates, ["fast"])
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual((self.generator.requested, self.generator.late, self.generator.failed), (3, 1, 1))
+
+    def test_stuck_backend_sheds_instead_of_queueing(self):
+        """Abandoned calls keep their threads; new windows are shed until they return."""
+        print("\n=== TEST: ALTERNATE LOAD SHEDDING ===")
+        release = threading.Event()
+        stuck = lambda prompt: release.wait(5) and "slow"
+
+        self.assertEqual(self.generator.generate(stuck, "ctx", 4, deadline=0.05), [])
+        self.assertEqual(self.generator.in_flight, 4)
+        start = time.perf_counter()
+        self.assertEqual(self.generator.generate(lambda p: "fast", "ctx", 2, deadline=0.5), [])
+        self.assertLess(time.perf_counter() - start, 0.1)
+        self.assertEqual(self.generator.shed, 2)
+
+        release.set()
+        for _ in range(50):
+            if self.generator.in_flight == 0:
+                break
+            time.sleep(0.01)
+        self.assertEqual(self.generator.generate(lambda p: "fast", "ctx", 2), ["fast", "fast"])
+        self.assertEqual(self.generator.in_flight, 0)
+
+    def test_zero_alternates(self):
+        self.assertEqual(self.generator.generate(lambda p: p, "ctx", 0), [])
+
+
+class TestUnverifiedWindows(unittest.TestCase):
+    def setUp(self):
+        import modules.safety_gasket as safety_gasket
+        self.tmp = tempfile.TemporaryDirectory()
+        self.lockout = patch.object(safety_gasket, 'LOCKOUT_FILE', os.path.join(self.tmp.name, "LOCKOUT.state"))
+        self.lockout.start()
+        self.gasket = safety_gasket.System5Gasket()
+        self.gasket.router = MagicMock()
+        self.gasket.calculate_ache_entropy = MagicMock(return_value=0.0)
+
+    def tearDown(self):
+        self.lockout.stop()
+        self.tmp.cleanup()
+
+    def test_no_alternates_is_not_a_pass(self):
+        tokens = [f"t{i} " for i in range(10)]
+        self.gasket.router.stream_generate.return_value = iter(tokens)
+        with patch.object(self.gasket.alternates, 'generate', return_value=[]):
+            output = list(self.gasket.metabolize_stream("prompt", n=3, buffer_size=3))
+        # Nothing was emitted as verified; the stream devolved instead
+        self.assertEqual(output, [self.gasket.panic_frame_devolution()])
+        self.assertEqual(self.gasket.unverified_windows, 3)
+        self.gasket.calculate_ache_entropy.assert_not_called()
+
+    def test_held_tokens_released_once_verified(self):
+        tokens = [f"t{i} " for i in range(8)]
+        self.gasket.router.stream_generate.return_value = iter(tokens)
+        results = iter([[]] + [["alt "]] * 20)
+        with patch.object(self.gasket.alternates, 'generate', side_effect=lambda *a: next(results)):
+            output = list(self.gasket.metabolize_stream("prompt", n=3, buffer_size=3))
+        self.assertEqual(output, tokens)
+        self.assertEqual(self.gasket.unverified_windows, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+import unittest
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Verify paths
+sys.path.append(os.getcwd())
+
+from nodes.Predictor import Predictor, StreamingPredictor, SIGNAL_NAMES
+from nodes.Auditor import Auditor, ReturnStats
+from nodes.Executor import Executor
+from nodes.Backtester import Backtester
+
+
+def make_tape(seed: int, n: int = 400, vol: float = 0.03) -> pd.DataFrame:
+    """Synthetic daily OHLC random walk."""
+    rng = np.random.default_rng(seed)
+    close = 20000.0 * np.exp(np.cumsum(rng.normal(0.0005, vol, n)))
+    low = close * (1 - np.abs(rng.normal(0, vol, n)))
+    high = close * (1 + np.abs(rng.normal(0, vol, n)))
+    index = pd.date_range("2022-01-01", periods=n, freq="D")
+    return pd.DataFrame({"close": close, "high": high, "low": low}, index=index)
+
+
+def legacy_stress_test(df: pd.DataFrame) -> dict:
+    """The original per-candle loop from main.py, kept as the reference."""
+    predictor = Predictor(short_window=5, long_window=20)
+    auditor = Auditor()
+    executor = Executor()
+    history = pd.DataFrame(columns=['equity'], dtype=float)
+    vetoes = []
+    compliance_logs = []
+
+    for i in range(20, len(df)):
+        window = df.iloc[:i]
+        candle = df.iloc[i]
+        current_price = candle['close']
+        day_low = candle['low']
+        pos_status = "OPEN" if executor.position > 0 else "CLOSED"
+
+        if pos_status == "OPEN":
+            intraday_equity = executor.position * day_low
+            compliance = auditor.check_compliance("HOLD", intraday_equity, executor.peak_equity, history,
+                                                  position_status="OPEN", proposed_position=0)
+            if compliance['status'] == "INTERDICTION":
+                if executor.position > 0:
+                    stop_price = (executor.peak_equity * (1 - auditor.hard_stop)) / executor.position
+                    executor.execute("SELL", stop_price)
+                    compliance_logs.append({"date": str(df.index[i].date()), "status": "INTERDICTION", "reason": compliance['reason']})
+                    pos_status = "CLOSED"
+
+        signal = predictor.generate_signal(window)
+        proposed_pos = executor.cash / current_price if signal == "BUY" else 0
+
+        if pos_status != "CLOSED" or (not compliance_logs or compliance_logs[-1]['date'] != str(df.index[i].date())):
+            compliance = auditor.check_compliance(signal, executor.equity, executor.peak_equity, history,
+                                                  position_status=pos_status, proposed_position=proposed_pos)
+
+        if compliance['status'] == "INTERDICTION":
+            executor.execute("SELL", current_price)
+            compliance_logs.append({"date": str(df.index[i].date()), "status": "INTERDICTION", "reason": compliance['reason']})
+        elif compliance['status'] == "LOCKED":
+            compliance_logs.append({"date": str(df.index[i].date()), "status": "LOCKED", "reason": compliance['reason']})
+            executor.execute("HOLD", current_price)
+        elif compliance['approved']:
+            executor.execute(compliance['action'], current_price)
+        else:
+            vetoes.append({"date": str(df.index[i].date()), "signal": signal, "reason": compliance['reason']})
+            executor.execute("HOLD", current_price)
+
+        history.loc[df.index[i]] = executor.equity
+
+    return {
+        "final_equity": executor.equity,
+        "total_trades": len(executor.trades),
+        "trades": executor.trades,
+        "veto_count": len(vetoes),
+        "veto_log": vetoes,
+        "compliance_log": compliance_logs,
+        "peak_equity": executor.peak_equity,
+        "max_drawdown": (executor.peak_equity - executor.equity) / executor.peak_equity if executor.peak_equity > 0 else 0
+    }
+
+
+class TestVectorizedSignals(unittest.TestCase):
+    def test_signals_match_batch_predictor(self):
+        """generate_signals must agree with generate_signal on every prefix."""
+        print("\n=== TEST: VECTORIZED CROSSOVER PARITY ===")
+        df = make_tape(seed=7, n=200)
+        predictor = Predictor(short_window=5, long_window=20)
+        codes = predictor.generate_signals(df['close'].to_numpy())
+        for i in range(len(df)):
+            self.assertEqual(SIGNAL_NAMES[int(codes[i])], predictor.generate_signal(df.iloc[:i + 1]), f"candle {i}")
+
+    def test_streaming_matches_batch(self):
+        """StreamingPredictor.update must reproduce the batch signals tick for tick."""
+        print("\n=== TEST: STREAMING CROSSOVER PARITY ===")
+        close = make_tape(seed=11, n=5000, vol=0.01)['close'].to_numpy().copy()
+        # Flat stretches exercise the exact-equality crossovers
+        close[1000:1100] = close[1000]
+        close[3000:3040] = 0.1
+        for short_window, long_window in ((5, 20), (3, 7), (12, 50)):
+            batch = Predictor(short_window, long_window).generate_signals(close)
+            stream = StreamingPredictor(short_window, long_window)
+            streamed = [stream.update(c) for c in close]
+            self.assertEqual(streamed, [SIGNAL_NAMES[int(c)] for c in batch])
+
+
+class TestReturnStats(unittest.TestCase):
+    def test_matches_pandas(self):
+        """Online Welford stats track pct_change().mean()/std(), full and windowed."""
+        print("\n=== TEST: ONLINE SHARPE STATISTICS ===")
+        equity = pd.Series(make_tape(seed=5, n=3000, vol=0.01)['close'].to_numpy())
+        returns = equity.pct_change().dropna()
+
+        full = ReturnStats()
+        windowed = ReturnStats(window=250)
+        for e in equity:
+            full.update(e)
+            windowed.update(e)
+        self.assertEqual(full.ticks, len(equity))
+        self.assertAlmostEqual(full.mean, returns.mean(), places=12)
+        self.assertAlmostEqual(full.std, returns.std(), places=12)
+        self.assertAlmostEqual(full.sharpe(), returns.mean() / returns.std() * np.sqrt(252), places=9)
+
+        tail = returns.iloc[-250:]
+        self.assertEqual(windowed.count, 250)
+        self.assertAlmostEqual(windowed.mean, tail.mean(), places=12)
+        self.assertAlmostEqual(windowed.std, tail.std(), places=12)
+
+    def test_flat_equity_has_no_sharpe(self):
+        stats = ReturnStats()
+        for _ in range(100):
+            stats.update(100000.0)
+        self.assertIsNone(stats.sharpe())
+
+    def test_auditor_consumes_history_incrementally(self):
+        """check_compliance folds only the new history rows into its statistics."""
+        print("\n=== TEST: AUDITOR SHARPE GATE ===")
+        auditor = Auditor()
+        equity = 100000.0 * np.exp(np.cumsum(np.random.default_rng(2).normal(-0.002, 0.001, 80)))  # bleed: Sharpe < 0
+        history = pd.DataFrame({'equity': equity[:59]})
+        self.assertEqual(auditor.check_compliance("BUY", equity[58], equity[58], history)['status'], "APPROVED")
+        history = pd.DataFrame({'equity': equity[:61]})
+        verdict = auditor.check_compliance("BUY", equity[60], equity[60], history)
+        self.assertEqual(verdict['status'], "VETO")
+        self.assertIn("Sharpe", verdict['reason'])
+        self.assertEqual(auditor.returns.ticks, 61)
+
+        # Same gate fed tick by tick, no DataFrame at all
+        streaming = Auditor()
+        for e in equity[:61]:
+            streaming.record_equity(e)
+        self.assertEqual(streaming.check_compliance("BUY", equity[60], equity[60]), verdict)
+
+
+class TestBacktester(unittest.TestCase):
+    def assertResultsEqual(self, got: dict, expected: dict):
+        self.assertEqual(set(got), set(expected))
+        for key in ("total_trades", "veto_count", "veto_log", "compliance_log"):
+            self.assertEqual(got[key], expected[key], key)
+        for key in ("final_equity", "peak_equity", "max_drawdown"):
+            self.assertAlmostEqual(got[key], expected[key], places=6, msg=key)
+        self.assertEqual([t['action'] for t in got['trades']], [t['action'] for t in expected['trades']])
+        np.testing.assert_allclose([t['price'] for t in got['trades']], [t['price'] for t in expected['trades']])
+
+    def test_matches_legacy_loop(self):
+        """The single-pass engine reproduces the per-candle loop's results.json."""
+        print("\n=== TEST: BACKTESTER PARITY WITH LEGACY LOOP ===")
+        # Low vol reaches the Sharpe gate, high vol the hard stop and lockout
+        for vol in (0.002, 0.012, 0.03):
+            for seed in range(3):
+                df = make_tape(seed, vol=vol)
+                with self.subTest(seed=seed, vol=vol):
+                    self.assertResultsEqual(Backtester().run(df), legacy_stress_test(df))
+
+    def test_lockout_is_absorbing(self):
+        """A crash through the hard stop locks the account for the rest of the tape."""
+        print("\n=== TEST: LOCKOUT TAIL ===")
+        df = make_tape(seed=0, n=300, vol=0.03)
+        backtester = Backtester()
+        results = backtester.run(df)
+        self.assertResultsEqual(results, legacy_stress_test(df))
+        self.assertEqual(results['compliance_log'][-1]['status'], "LOCKED")
+        self.assertEqual(len(backtester.equity_curve), len(df) - 20)
+        self.assertEqual(backtester.equity_curve.iloc[-1], results['final_equity'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import asyncio
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+import os
+import sys
+
+import httpx
+
+# Verify paths
+sys.path.append(os.getcwd())
+
+import modules.safety_gasket as safety_gasket
+from modules.clone_base import CloneBase, LatencyLedger
+from modules.auditor_core import AuditorCore
+from modules.territory_manager import TerritoryManager
+from modules.market_oracle import MarketOracle
+from modules.swarm_factory import SwarmFactory
+
+
+class TestLatencyLedger(unittest.TestCase):
+    def test_snapshot(self):
+        ledger = LatencyLedger(window=3)
+        for seconds in (0.001, 0.002, 0.003, 0.004):
+            ledger.record("clearance", seconds)
+        with ledger.measure("execution"):
+            time.sleep(0.01)
+        report = ledger.snapshot()
+        self.assertEqual(report["clearance"]["count"], 4)
+        self.assertAlmostEqual(report["clearance"]["p50_ms"], 3.0)  # window keeps the last 3
+        self.assertAlmostEqual(report["clearance"]["total_ms"], 10.0)
+        self.assertGreaterEqual(report["execution"]["max_ms"], 10.0)
+
+
+class TestAsyncClearance(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.lockout = patch.object(safety_gasket, 'LOCKOUT_FILE', os.path.join(self.tmp.name, "LOCKOUT.state"))
+        self.lockout.start()
+        auditor = MagicMock(spec=AuditorCore)
+        auditor.initial_capital = 1000.0
+        self.clone = CloneBase({'id': 'AC', 'name': 'n', 'strategy': 's', 'target_pair': 'WETH/USDC',
+                                'risk_profile': 'low'}, MagicMock(spec=TerritoryManager), auditor)
+        self.gasket = self.clone.gasket
+        self.gasket.current_scar_index = 1.0
+
+    def tearDown(self):
+        self.lockout.stop()
+        self.tmp.cleanup()
+
+    def test_inline_issue_verifies(self):
+        token = asyncio.run(self.gasket.aissue_constitutional_token("EXECUTE_TRADE::WETH/USDC::1.0", 0.01))
+        self.assertEqual(self.gasket.token_verifier.verify(token), (True, "VALID"))
+
+    def test_lockout_write_runs_off_loop(self):
+        loop_thread = threading.get_ident()
+        writers = []
+        original = self.gasket.trigger_lockout_state
+        self.gasket.trigger_lockout_state = lambda reason: (writers.append(threading.get_ident()), original(reason))
+        token = asyncio.run(self.gasket.aissue_constitutional_token("EXECUTE_TRADE::WETH/USDC::1.0", 0.5))
+        self.assertIsNone(token)
+        self.assertTrue(self.gasket.is_locked)
+        self.assertTrue(os.path.exists(safety_gasket.LOCKOUT_FILE))
+        self.assertEqual(len(writers), 1)
+        self.assertNotEqual(writers[0], loop_thread)
+
+
+class TestSwarmConcurrency(unittest.TestCase):
+    """A slow upstream must not stall the event loop the clones share."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.lockout = patch.object(safety_gasket, 'LOCKOUT_FILE', os.path.join(self.tmp.name, "LOCKOUT.state"))
+        self.lockout.start()
+
+    def tearDown(self):
+        self.lockout.stop()
+        self.tmp.cleanup()
+
+    def test_slow_oracle_does_not_stall_swarm(self):
+        print("\n=== TEST: SWARM UNDER A SLOW ORACLE ===")
+        clones_n = 12
+        tokens = {f"T{i}": f"0x{i:040x}" for i in range(clones_n)}
+
+        async def slow_dex(request):
+            await asyncio.sleep(0.3)  # a sluggish upstream round trip
+            addresses = request.url.path.rsplit('/', 1)[-1].split(',')
+            return httpx.Response(200, json={"pairs": [
+                {"baseToken": {"address": a}, "priceUsd": "1.0", "priceChange": {"h1": 0.1, "h6": 0.1}}
+                for a in addresses]})
+
+        oracle = MarketOracle(cache_ttl=0.4, tokens=tokens, transport=httpx.MockTransport(slow_dex))
+        auditor = MagicMock(spec=AuditorCore)
+        auditor.initial_capital = 1000.0
+        territory = TerritoryManager(use_redis=False)
+        clones = []
+        for i in range(clones_n):
+            clone = CloneBase({'id': f'SW-{i}', 'name': 'n', 'strategy': 's', 'target_pair': f'T{i}/USDC',
+                               'risk_profile': 'low'}, territory, auditor)
+            clone.oracle = oracle
+            clone.gasket.current_scar_index = 1.0
+            clones.append(clone)
+
+        async def swarm():
+            lag = 0.0
+            tasks = [asyncio.ensure_future(clone.run()) for clone in clones]
+            end = time.monotonic() + 2.0
+            while time.monotonic() < end:
+                tick = time.monotonic()
+                await asyncio.sleep(0.01)
+                lag = max(lag, time.monotonic() - tick - 0.01)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await oracle.aclose()
+            return lag
+
+        lag = asyncio.run(swarm())
+        executed = [c.latency.counts.get("execution", 0) for c in clones]
+        print(f"Max loop lag: {lag * 1000:.1f}ms | trades per clone: {executed} | upstream fetches: {oracle.fetches}")
+        self.assertLess(lag, 0.1)
+        self.assertTrue(all(executed), "every clone should trade while the oracle is slow")
+        self.assertLess(oracle.fetches, 10)
+        clearance = clones[0].latency.snapshot()["clearance"]
+        self.assertLess(clearance["p95_ms"], 50)
+
+
+
+class TestSwarmShutdown(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.lockout = patch.object(safety_gasket, 'LOCKOUT_FILE', os.path.join(self.tmp.name, "LOCKOUT.state"))
+        self.lockout.start()
+
+    def tearDown(self):
+        self.lockout.stop()
+        self.tmp.cleanup()
+
+    def test_ignite_closes_the_shared_oracle(self):
+        """However the swarm ends, the oracle's refresher and pooled client are closed on its loop."""
+        oracle = MagicMock(spec=MarketOracle)
+        oracle.aclose = AsyncMock()
+        factory = SwarmFactory("unused.json")
+        for i in range(3):
+            clone = CloneBase({'id': f'SD-{i}', 'name': 'n', 'strategy': 's', 'target_pair': 'WETH/USDC',
+                               'risk_profile': 'low'}, factory.territory_manager, factory.auditor)
+            clone.oracle = oracle
+            clone.run = AsyncMock(side_effect=RuntimeError("clone crashed") if i == 1 else None)
+            factory.clones.append(clone)
+
+        asyncio.run(factory.ignite())
+        oracle.aclose.assert_awaited_once()
+
+if __name__ == '__main__':
+    unittest.main()
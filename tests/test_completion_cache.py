@@ -0,0 +1,109 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import tempfile
+
+# Verify paths
+sys.path.append(os.getcwd())
+
+import modules.completion_cache as completion_cache
+from modules.completion_cache import CompletionCache
+
+
+class TestCompletionCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "completions.db")
+        self.now = [1000.0]
+        self.clock = patch.object(completion_cache.time, 'time', lambda: self.now[0])
+        self.clock.start()
+
+    def tearDown(self):
+        self.clock.stop()
+        self.tmp.cleanup()
+
+    def test_key_covers_every_field(self):
+        base = CompletionCache.key("llama3", "sys", "prompt", 0, None)
+        self.assertEqual(base, CompletionCache.key("llama3", "sys", "prompt", 0, None))
+        for variant in [("gpt-4o", "sys", "prompt", 0, None), ("llama3", "sys2", "prompt", 0, None),
+                        ("llama3", "sys", "prompt!", 0, None), ("llama3", "sys", "prompt", 0.5, None),
+                        ("llama3", "sys", "prompt", 0, 8)]:
+            self.assertNotEqual(base, CompletionCache.key(*variant))
+
+    def test_ttl_expiry_and_persistence(self):
+        cache = CompletionCache(self.path, ttl=60)
+        key = CompletionCache.key("llama3", "", "claim", 0, None)
+        cache.put(key, "VALID")
+        cache.close()
+
+        cache = CompletionCache(self.path, ttl=60)
+        self.assertEqual(cache.get(key), "VALID")
+        self.now[0] += 61
+        self.assertIsNone(cache.get(key))
+        self.assertEqual(cache.stats()["entries"], 0)
+        cache.close()
+
+    def test_lru_eviction(self):
+        cache = CompletionCache(self.path, max_entries=2, touch_interval=1)
+        keys = [CompletionCache.key("m", "", f"p{i}", 0, None) for i in range(3)]
+        cache.put(keys[0], "a")
+        self.now[0] += 1
+        cache.put(keys[1], "b")
+        self.now[0] += 1
+        cache.get(keys[0])  # p0 is now more recently used than p1
+        self.now[0] += 1
+        cache.put(keys[2], "c")
+
+        self.assertEqual(cache.get(keys[0]), "a")
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertEqual(cache.get(keys[2]), "c")
+        cache.close()
+
+    def test_eviction_runs_only_past_capacity(self):
+        cache = CompletionCache(self.path, max_entries=50)
+        statements = []
+        cache._db.set_trace_callback(statements.append)
+        for i in range(50):
+            cache.put(CompletionCache.key("m", "", f"p{i}", 0, None), "a")
+        self.assertFalse([s for s in statements if s.startswith("DELETE")])
+
+        cache.put(CompletionCache.key("m", "", "p50", 0, None), "a")
+        self.assertTrue([s for s in statements if s.startswith("DELETE")])
+        self.assertEqual(cache.stats()["entries"], 50)
+        cache.close()
+
+        # The count survives a reopen: a full file evicts on the next insert
+        cache = CompletionCache(self.path, max_entries=50)
+        cache.put(CompletionCache.key("m", "", "p51", 0, None), "a")
+        self.assertEqual(cache.stats()["entries"], 50)
+        cache.close()
+
+    def test_hits_within_touch_interval_do_not_write(self):
+        cache = CompletionCache(self.path, touch_interval=60)
+        key = CompletionCache.key("m", "", "p", 0, None)
+        cache.put(key, "a")
+        statements = []
+        cache._db.set_trace_callback(statements.append)
+        for _ in range(100):
+            self.now[0] += 0.1
+            self.assertEqual(cache.get(key), "a")
+        self.assertFalse([s for s in statements if s.startswith("UPDATE")])
+
+        self.now[0] += 60
+        cache.get(key)
+        self.assertEqual(len([s for s in statements if s.startswith("UPDATE")]), 1)
+        cache.close()
+
+    def test_get_any_counts_one_lookup(self):
+        cache = CompletionCache(self.path)
+        keys = [CompletionCache.key(m, "", "p", 0, None) for m in ("gpt-4o", "llama3")]
+        self.assertIsNone(cache.get_any(keys))
+        cache.put(keys[1], "local")
+        self.assertEqual(cache.get_any(keys), "local")
+        self.assertEqual((cache.stats()["hits"], cache.stats()["misses"]), (1, 1))
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import asyncio
+import unittest
+import os
+import sys
+import hmac
+import hashlib
+
+# Verify paths
+sys.path.append(os.getcwd())
+
+from modules.constitutional_token import (ConstitutionalTokenService, ConstitutionalTokenVerifier,
+                                          SENTINEL_ROOT_KEY, CAGE_CODE)
+
+
+def split(token):
+    payload, signature = token.rsplit('|', 1)
+    return payload, signature
+
+
+class TestTokenService(unittest.TestCase):
+    def setUp(self):
+        self.service = ConstitutionalTokenService()
+
+    def test_signature_matches_one_shot_hmac(self):
+        """Signing from the pre-keyed copy is byte-identical to hmac.new per token."""
+        token = self.service.issue("EXECUTE_TRADE::BTC/USDC::64000.0", 0.9991, 0.0123)
+        payload, signature = split(token)
+        self.assertEqual(signature, hmac.new(SENTINEL_ROOT_KEY, payload.encode('utf-8'), hashlib.sha256).hexdigest())
+        cage, _, scar, entropy, intent = payload.split(':', 4)
+        self.assertEqual((cage, scar, entropy, intent), (CAGE_CODE, "0.9991", "0.0123", "EXECUTE_TRADE::BTC/USDC::64000.0"))
+
+    def test_batch_tokens_unique_and_ordered(self):
+        print("\n=== TEST: CCT BATCH ISSUANCE ===")
+        intents = ["EXECUTE_TRADE::ETH/USDC"] * 500
+        tokens = self.service.issue_batch(intents, 1.0)
+        self.assertEqual(len(set(tokens)), 500)
+        stamps = [float(split(t)[0].split(':')[1]) for t in tokens]
+        self.assertEqual(stamps, sorted(stamps))
+        self.assertEqual(len(set(stamps)), 500)
+
+
+class TestTokenVerifier(unittest.TestCase):
+    def setUp(self):
+        self.service = ConstitutionalTokenService()
+        self.verifier = ConstitutionalTokenVerifier()
+
+    def issued_at(self, token):
+        return float(split(token)[0].split(':')[1])
+
+    def test_valid_then_replayed(self):
+        token = self.service.issue("TEST_INTENT", 1.0)
+        now = self.issued_at(token) + 0.1
+        self.assertEqual(self.verifier.verify(token, now), (True, "VALID"))
+        self.assertEqual(self.verifier.verify(token, now + 0.1), (False, "REPLAYED"))
+
+    def test_ttl_enforced(self):
+        token = self.service.issue("TEST_INTENT", 1.0)
+        self.assertEqual(self.verifier.verify(token, self.issued_at(token) + 0.501), (False, "EXPIRED"))
+        self.assertEqual(self.verifier.verify(token, self.issued_at(token) - 1.0), (False, "EXPIRED"))
+
+    def test_tampering_rejected(self):
+        token = self.service.issue("EXECUTE_TRADE::BTC/USDC::100.0", 1.0)
+        payload, signature = split(token)
+        now = self.issued_at(token)
+        self.assertEqual(self.verifier.verify(payload.replace("100.0", "999.0") + "|" + signature, now),
+                         (False, "BAD_SIGNATURE"))
+        forged = ConstitutionalTokenService(key=b"not-the-root-key").issue("X", 1.0)
+        self.assertEqual(self.verifier.verify(forged, self.issued_at(forged)), (False, "BAD_SIGNATURE"))
+        foreign = ConstitutionalTokenService(cage_code="00000").issue("X", 1.0)
+        self.assertEqual(self.verifier.verify(foreign, self.issued_at(foreign)), (False, "FOREIGN_CAGE"))
+        for malformed in ["", "no-separator", "17TJ5:1|abc", None]:
+            self.assertEqual(self.verifier.verify(malformed, now), (False, "MALFORMED"))
+
+    def test_replay_window_forgets_expired_tokens(self):
+        tokens = self.service.issue_batch([f"I{i}" for i in range(100)], 1.0)
+        now = self.issued_at(tokens[-1])
+        for token in tokens:
+            self.assertTrue(self.verifier.verify(token, now)[0])
+        later = self.service._sign(f"{CAGE_CODE}:{now + 0.6}:1.0000:0.0000:LATER")
+        self.assertTrue(self.verifier.verify(later, now + 0.6)[0])
+        self.assertEqual(self.verifier.cached, 1)
+
+    def test_replay_cache_bounded_by_ttl(self):
+        """Sustained traffic: the cache never holds more than (TTL + one bucket) of tokens."""
+        print("\n=== TEST: CCT REPLAY CACHE BOUND ===")
+        start = self.issued_at(self.service.issue("CLOCK", 1.0))
+        rate = 2000  # tokens per simulated second
+        peak = 0
+        for i in range(3000):
+            now = start + i / rate
+            payload = f"{CAGE_CODE}:{now}:1.0000:0.0000:I{i}"
+            token = self.service._sign(payload)
+            self.assertEqual(self.verifier.verify(token, now), (True, "VALID"))
+            peak = max(peak, self.verifier.cached)
+        bound = (self.verifier.ttl + self.verifier.bucket_width) * rate
+        print(f"Peak cached: {peak} (bound {bound:.0f})")
+        self.assertLessEqual(peak, bound + 1)
+        self.assertLessEqual(len(self.verifier._buckets), 12)
+
+    def test_async_verify(self):
+        tokens = self.service.issue_batch([f"I{i}" for i in range(50)], 1.0)
+        results = asyncio.run(self.verifier.averify_many(tokens + tokens[:5]))
+        self.assertEqual(results[:50], [(True, "VALID")] * 50)
+        self.assertEqual(results[50:], [(False, "REPLAYED")] * 5)
+        self.assertEqual(asyncio.run(self.verifier.averify(tokens[0])), (False, "REPLAYED"))
+        self.assertEqual(self.verifier.outcomes, {"VALID": 50, "REPLAYED": 6})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# Verify paths
+sys.path.append(os.getcwd())
+
+from modules.embedding_cache import EmbeddingCache, CachedEmbedder
+
+
+class FakeBackend:
+    model_name = "fake-model"
+
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        return np.array([[len(t), t.count("a"), 1.0] for t in texts], dtype=np.float32)
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    def test_duplicates_and_repeats_are_not_re_embedded(self):
+        """The gamma/consensus pattern: the same completion three times, then again."""
+        print("\n=== TEST: EMBEDDING CACHE DEDUPLICATION ===")
+        backend = FakeBackend()
+        embedder = CachedEmbedder(backend)
+        texts = ["The ETH/USDT price is $5,000.00"] * 3
+
+        first = embedder.embed(texts)
+        second = embedder.embed(texts + ["a fresh one"])
+
+        self.assertEqual(backend.calls, [texts[:1], ["a fresh one"]])
+        np.testing.assert_array_equal(first, second[:3])
+        stats = embedder.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+
+    def test_lru_eviction(self):
+        cache = EmbeddingCache(max_entries=2)
+        cache.put_many("m", ["a", "b"], np.ones((2, 3)))
+        cache.get_many("m", ["a"])  # touch a, so b is the eldest
+        cache.put_many("m", ["c"], np.ones((1, 3)))
+        hits = cache.get_many("m", ["a", "b", "c"])
+        self.assertEqual([h is not None for h in hits], [True, False, True])
+
+    def test_model_is_part_of_the_key(self):
+        cache = EmbeddingCache()
+        cache.put_many("model-a", ["text"], np.ones((1, 3)))
+        self.assertIsNone(cache.get_many("model-b", ["text"])[0])
+
+    def test_disk_tier_survives_restart(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "embeddings.sqlite")
+            cache = EmbeddingCache(db_path=path)
+            vectors = np.random.default_rng(0).normal(size=(2, 384)).astype(np.float32)
+            cache.put_many("m", ["x", "y"], vectors)
+            cache.close()
+
+            reopened = EmbeddingCache(db_path=path)
+            found = reopened.get_many("m", ["y", "z"])
+            np.testing.assert_array_equal(found[0], vectors[1])
+            self.assertIsNone(found[1])
+            self.assertEqual(reopened.stats()["disk_hits"], 1)
+            reopened.close()
+
+
+class TestStreamEmbedding(unittest.TestCase):
+    def test_stream_window_embeds_distinct_completions_once(self):
+        """Alternates that agree with each other cost one embedding per window, not one each."""
+        import modules.safety_gasket as safety_gasket
+
+        class Flat(FakeBackend):
+            def embed(self, texts):
+                self.calls.append(list(texts))
+                return np.ones((len(texts), 3), dtype=np.float32)
+
+        backend = Flat()
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch.object(safety_gasket, 'LOCKOUT_FILE', os.path.join(tmp, "LOCKOUT.state")):
+            gasket = safety_gasket.System5Gasket(embedding_cache=EmbeddingCache())
+            gasket.embedder = CachedEmbedder(backend, gasket.embedding_cache)
+            gasket.router = MagicMock()
+            tokens = [f"t{i} " for i in range(40)]
+            gasket.router.stream_generate.return_value = iter(tokens)
+            gasket.router.generate_token.return_value = "alt "
+
+            output = list(gasket.metabolize_stream("prompt", n=3, buffer_size=5))
+
+            self.assertEqual(output, tokens)
+            windows = len(tokens) - 5 + 1
+            self.assertEqual(len(backend.calls), windows)
+            self.assertEqual(sum(len(c) for c in backend.calls), 2 * windows)
+
+    def test_stream_window_text_is_bounded(self):
+        """Embedded texts carry a fixed trailing context, not the whole session so far."""
+        import modules.safety_gasket as safety_gasket
+
+        class Flat(FakeBackend):
+            def embed(self, texts):
+                self.calls.append(list(texts))
+                return np.ones((len(texts), 3), dtype=np.float32)
+
+        backend = Flat()
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch.object(safety_gasket, 'LOCKOUT_FILE', os.path.join(tmp, "LOCKOUT.state")):
+            gasket = safety_gasket.System5Gasket(embedding_cache=EmbeddingCache())
+            gasket.ache_context_tokens = 8
+            gasket.embedder = CachedEmbedder(backend, gasket.embedding_cache)
+            gasket.router = MagicMock()
+            tokens = [f"t{i:04d} " for i in range(500)]
+            gasket.router.stream_generate.return_value = iter(tokens)
+            gasket.router.generate_token.return_value = "alt "
+
+            output = list(gasket.metabolize_stream("prompt", n=3, buffer_size=5))
+
+            self.assertEqual(output, tokens)
+            longest = max(len(text) for call in backend.calls for text in call)
+            self.assertLessEqual(longest, (8 + 5) * len(tokens[0]))
+            # The alternates still see the full session
+            alt_prompt = gasket.router.generate_token.call_args_list[-1][0][0]
+            self.assertTrue(alt_prompt.startswith("prompt" + tokens[0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,224 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import os
+import sys
+import tempfile
+import threading
+import base64
+
+import numpy as np
+
+# Verify paths
+sys.path.append(os.getcwd())
+
+import modules.embeddings as embeddings
+from modules.embeddings import (SovereignEmbedder, LocalEmbedder, FailoverEmbedder, EmbeddingBackend,
+                                EmbeddingError, embedding_variance)
+
+
+def vector_for(text: str) -> list:
+    return [float(len(text)), float(text.count("a")), 1.0]
+
+
+class TestSovereignEmbedder(unittest.TestCase):
+    def setUp(self):
+        self.session = MagicMock()
+        self.embedder = SovereignEmbedder(endpoint="http://embed.test", session=self.session)
+
+    def tearDown(self):
+        self.embedder.close()
+
+    def test_batch_is_one_request(self):
+        """All completions go out in a single POST when the endpoint accepts lists."""
+        print("\n=== TEST: BATCHED EMBEDDING ===")
+        texts = ["alpha", "beta", "gamma"]
+        self.session.post.return_value = MagicMock(status_code=200, json=lambda: {'embeddings': [vector_for(t) for t in texts]})
+
+        matrix = self.embedder.embed(texts)
+
+        self.assertEqual(self.session.post.call_count, 1)
+        self.assertEqual(self.session.post.call_args.kwargs['json'], {"input": texts})
+        np.testing.assert_array_equal(matrix, np.array([vector_for(t) for t in texts], dtype=np.float32))
+
+    def test_packed_batch_response(self):
+        """The edge function's f32le-base64 payload decodes to the same matrix."""
+        texts = ["alpha", "beta"]
+        vectors = np.array([vector_for(t) for t in texts], dtype='<f4')
+        payload = {'encoding': 'f32le-base64', 'count': 2, 'dims': 3,
+                   'data': base64.b64encode(vectors.tobytes()).decode()}
+        self.session.post.return_value = MagicMock(status_code=200, json=lambda: payload)
+        np.testing.assert_array_equal(self.embedder.embed(texts), vectors)
+
+    def test_fan_out_when_batch_refused(self):
+        """A legacy single-text endpoint is hit concurrently, once per completion, in order."""
+        print("\n=== TEST: CONCURRENT FAN-OUT ===")
+        threads = set()
+
+        def post(url, json, timeout):
+            if isinstance(json['input'], list):
+                return MagicMock(status_code=400)
+            threads.add(threading.get_ident())
+            return MagicMock(status_code=200, json=lambda: {'embedding': vector_for(json['input'])})
+
+        self.session.post.side_effect = post
+        texts = ["a", "bb", "ccc", "dddd"]
+        matrix = self.embedder.embed(texts)
+
+        np.testing.assert_array_equal(matrix[:, 0], [1, 2, 3, 4])
+        self.assertFalse(self.embedder.batch_supported)
+        self.assertNotIn(threading.get_ident(), threads)
+
+        # The refusal is remembered: no second batch attempt
+        self.session.post.reset_mock()
+        self.embedder.embed(texts)
+        self.assertEqual(self.session.post.call_count, len(texts))
+
+    def test_large_input_chunked(self):
+        """Inputs over MAX_BATCH go out as several batches, never as one oversized request."""
+        def post(url, json, timeout):
+            if len(json['input']) > embeddings.MAX_BATCH:
+                return MagicMock(status_code=413)
+            return MagicMock(status_code=200, json=lambda: {'embeddings': [vector_for(t) for t in json['input']]})
+
+        self.session.post.side_effect = post
+        texts = ["a" * (i % 7) for i in range(2 * embeddings.MAX_BATCH + 10)]
+        matrix = self.embedder.embed(texts)
+
+        self.assertEqual([len(c.kwargs['json']['input']) for c in self.session.post.call_args_list],
+                         [embeddings.MAX_BATCH, embeddings.MAX_BATCH, 10])
+        np.testing.assert_array_equal(matrix[:, 0], [len(t) for t in texts])
+        self.assertTrue(self.embedder.batch_supported)
+
+    def test_too_large_is_an_error_not_a_refusal(self):
+        self.session.post.return_value = MagicMock(status_code=413)
+        with self.assertRaises(EmbeddingError):
+            self.embedder.embed(["x", "y"])
+        self.assertTrue(self.embedder.batch_supported)
+
+    def test_server_error_raises(self):
+        self.session.post.return_value = MagicMock(status_code=503)
+        with self.assertRaises(EmbeddingError):
+            self.embedder.embed(["x", "y"])
+
+
+class FakeTextEmbedding:
+    """Stands in for fastembed.TextEmbedding: yields one vector per text."""
+    loads = 0
+
+    def __init__(self, model_name):
+        FakeTextEmbedding.loads += 1
+        self.calls = []
+
+    def embed(self, texts, batch_size=256):
+        self.calls.append(list(texts))
+        for t in texts:
+            yield np.array(vector_for(t))
+
+
+class TestLocalEmbedder(unittest.TestCase):
+    def setUp(self):
+        FakeTextEmbedding.loads = 0
+        self.models = patch.dict(embeddings._LOCAL_MODELS, clear=True)
+        self.models.start()
+        self.fastembed = patch.dict(sys.modules, {'fastembed': MagicMock(TextEmbedding=FakeTextEmbedding)})
+        self.fastembed.start()
+
+    def tearDown(self):
+        self.fastembed.stop()
+        self.models.stop()
+
+    def test_loaded_once_warmed_and_batched(self):
+        first = LocalEmbedder(model_name="bge-test")
+        second = LocalEmbedder(model_name="bge-test")
+
+        self.assertEqual(FakeTextEmbedding.loads, 1)
+        self.assertIs(first.model, second.model)
+        self.assertEqual(first.model.calls, [["warmup"], ["warmup"]])
+
+        texts = ["alpha", "beta", "gamma"]
+        matrix = first.embed(texts)
+        self.assertEqual(first.model.calls[-1], texts)
+        self.assertEqual(matrix.dtype, np.float32)
+        np.testing.assert_array_equal(matrix, np.array([vector_for(t) for t in texts], dtype=np.float32))
+
+
+class FakeBackend(EmbeddingBackend):
+    def __init__(self, model_name, fail=False):
+        self.model_name = model_name
+        self.fail = fail
+        self.calls = 0
+
+    def embed(self, texts):
+        self.calls += 1
+        if self.fail:
+            raise EmbeddingError("API_FAILURE: 503")
+        return np.array([vector_for(t) for t in texts], dtype=np.float32)
+
+
+class TestFailoverEmbedder(unittest.TestCase):
+    def setUp(self):
+        self.remote = FakeBackend("remote")
+        self.local = FakeBackend("local")
+        self.clock = [0.0]
+        self.monotonic = patch.object(embeddings.time, 'monotonic', lambda: self.clock[0])
+        self.monotonic.start()
+        self.router = FailoverEmbedder(self.remote, self.local, slow_ms=100, retry_interval=30)
+
+    def tearDown(self):
+        self.monotonic.stop()
+
+    def test_healthy_primary_serves(self):
+        self.router.embed(["a", "b"])
+        self.assertEqual((self.remote.calls, self.local.calls), (1, 0))
+        self.assertEqual(self.router.model_name, "remote")
+
+    def test_failure_benches_primary_until_retry(self):
+        print("\n=== TEST: EMBEDDING FAILOVER ===")
+        self.remote.fail = True
+        matrix = self.router.embed(["a", "b"])
+        np.testing.assert_array_equal(matrix[:, 0], [1, 1])
+        self.assertEqual(self.router.model_name, "local")
+
+        self.router.embed(["c"])
+        self.assertEqual((self.remote.calls, self.local.calls), (1, 2))
+
+        # After the retry interval the next call probes the primary again
+        self.remote.fail = False
+        self.clock[0] = 31.0
+        self.router.embed(["d"])
+        self.assertEqual((self.remote.calls, self.local.calls), (2, 2))
+        self.assertEqual(self.router.model_name, "remote")
+
+    def test_slow_primary_benched(self):
+        timings = iter([0.0, 0.5])
+        with patch.object(embeddings.time, 'perf_counter', lambda: next(timings)):
+            self.router.embed(["a"])
+        self.assertEqual(self.router.latency_ms, 500)
+        self.assertEqual(self.router.model_name, "local")
+        self.assertEqual(self.router.failovers, 1)
+
+
+class TestGasketBackendSelection(unittest.TestCase):
+    def test_auto_degrades_to_remote_when_local_fails_to_load(self):
+        import modules.safety_gasket as safety_gasket
+
+        for failure in (ImportError("No module named 'fastembed'"), RuntimeError("corrupt ONNX cache"),
+                        OSError("model download failed")):
+            with self.subTest(failure=failure), tempfile.TemporaryDirectory() as tmp, \
+                    patch.object(safety_gasket, 'LOCKOUT_FILE', os.path.join(tmp, "LOCKOUT.state")), \
+                    patch.object(safety_gasket, 'LocalEmbedder', side_effect=failure):
+                gasket = safety_gasket.System5Gasket(embedding_backend="auto")
+                self.assertIsInstance(gasket.embedder.backend, SovereignEmbedder)
+
+
+class TestEmbeddingVariance(unittest.TestCase):
+    def test_matches_centroid_loop(self):
+        rng = np.random.default_rng(0)
+        matrix = rng.normal(size=(5, 384))
+        centroid = np.mean(matrix, axis=0)
+        expected = float(np.mean([np.linalg.norm(e - centroid) for e in matrix]))
+        self.assertAlmostEqual(embedding_variance(matrix), expected, places=12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,8 @@ import logging
 import os
 import sys
 import requests
+import tempfile
+import numpy  # Imported before patch.dict so it is not evicted from sys.modules below
 
 # Ensure modules can be imported
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -13,12 +15,15 @@ with patch.dict(sys.modules, {
     'modules.prophet_connector': MagicMock(),
     'modules.sovereign_router': MagicMock()
 }):
-    from modules.safety_gasket import System5Gasket, LOCKOUT_FILE
+    import modules.safety_gasket as safety_gasket
+    from modules.safety_gasket import System5Gasket
 
 class TestSystem5Crisis(unittest.TestCase):
     def setUp(self):
-        if os.path.exists(LOCKOUT_FILE):
-            os.remove(LOCKOUT_FILE)
+        # Lockouts land in a scratch dir, never the working tree
+        self.tmp = tempfile.TemporaryDirectory()
+        self.lockout = patch.object(safety_gasket, 'LOCKOUT_FILE', os.path.join(self.tmp.name, "LOCKOUT.state"))
+        self.lockout.start()
         
         self.gasket = System5Gasket()
         self.gasket.router = MagicMock()
@@ -28,20 +33,25 @@ class TestSystem5Crisis(unittest.TestCase):
         logging.basicConfig(stream=sys.stdout, level=logging.INFO)
 
     def tearDown(self):
-        if os.path.exists(LOCKOUT_FILE):
-            os.remove(LOCKOUT_FILE)
+        self.lockout.stop()
+        self.tmp.cleanup()
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_1_toctou_entropy_attack(self, mock_post):
         print("\n=== TEST 1: TOCTOU HIGH-ENTROPY ATTACK ===")
         
-        def side_effect(*args, **kwargs):
-            input_text = kwargs.get('json', {}).get('input', '')
+        def embed(input_text):
             # If "POISON" -> High Vector. Else -> Low Vector.
             if "POISON" in input_text:
-                 return MagicMock(status_code=200, json=lambda: {'embedding': [10.0, 10.0, 10.0]})
+                 return [10.0, 10.0, 10.0]
             else:
-                 return MagicMock(status_code=200, json=lambda: {'embedding': [0.0, 0.0, 0.0]})
+                 return [0.0, 0.0, 0.0]
+
+        def side_effect(*args, **kwargs):
+            inputs = kwargs.get('json', {}).get('input', '')
+            if isinstance(inputs, list):
+                 return MagicMock(status_code=200, json=lambda: {'embeddings': [embed(t) for t in inputs]})
+            return MagicMock(status_code=200, json=lambda: {'embedding': embed(inputs)})
         
         mock_post.side_effect = side_effect
 
@@ -61,12 +71,12 @@ class TestSystem5Crisis(unittest.TestCase):
         else:
             print("FAILURE: Iron Dome NOT Triggered.")
 
-        if os.path.exists(LOCKOUT_FILE):
+        if os.path.exists(safety_gasket.LOCKOUT_FILE):
             print("SUCCESS: Lockout File Created.")
         else:
             print("FAILURE: No Lockout File.")
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_2_cloud_drift_panic(self, mock_post):
         print("\n=== TEST 2: CLOUD DRIFT / PANIC FRAME ===")
         
@@ -87,7 +97,7 @@ class TestSystem5Crisis(unittest.TestCase):
 
     def test_3_system_locked_rejection(self):
         print("\n=== TEST 3: LOCKED STATE ===")
-        with open(LOCKOUT_FILE, "w") as f:
+        with open(safety_gasket.LOCKOUT_FILE, "w") as f:
             f.write("LOCKED")
         self.gasket.is_locked = True
         
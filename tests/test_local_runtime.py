@@ -0,0 +1,151 @@
+import unittest
+from unittest.mock import MagicMock
+import os
+import sys
+import time
+
+# Verify paths
+sys.path.append(os.getcwd())
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from modules.local_runtime import LocalModelPool, LocalRuntimeRouter
+
+
+class FakeLlama:
+    """Stands in for llama_cpp.Llama: echoes the prompt tail one word per chunk."""
+    def __init__(self, model_path, n_ctx, n_threads):
+        self.pid = os.getpid()
+
+    def __call__(self, prompt, max_tokens=16, stream=False, temperature=None):
+        if "FAIL" in prompt:
+            raise ValueError("bad prompt")
+        if "DIE" in prompt:
+            os._exit(1)
+        if "SLOW" in prompt:
+            return self._slow(max_tokens)
+        words = prompt.split()[-max_tokens:]
+        parts = [{"choices": [{"text": f"{w}@{self.pid} "}]} for w in words]
+        return iter(parts) if stream else {"choices": [{"text": "".join(p["choices"][0]["text"] for p in parts)}]}
+
+    def _slow(self, max_tokens):
+        for i in range(max_tokens):
+            time.sleep(0.02)
+            yield {"choices": [{"text": f"t{i}@{self.pid} "}]}
+
+
+def fake_loader(model_path, n_ctx, n_threads):
+    return FakeLlama(model_path, n_ctx, n_threads)
+
+
+def broken_loader(model_path, n_ctx, n_threads):
+    raise FileNotFoundError(model_path)
+
+
+class TestLocalModelPool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = LocalModelPool("fake.gguf", workers=2, loader=fake_loader, timeout=10).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+
+    def test_workers_warm_at_start(self):
+        print("\n=== TEST: LOCAL GGUF POOL ===")
+        deadline = time.time() + 10
+        while self.pool.ready_workers < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.pool.ready_workers, 2)
+
+    def test_stream_and_generate(self):
+        chunks = list(self.pool.stream("one two three", max_tokens=2))
+        self.assertEqual([c.split("@")[0] for c in chunks], ["two", "three"])
+        self.assertTrue(self.pool.generate("alpha beta").startswith("alpha@"))
+
+    def test_requests_served_by_warm_workers_without_reload(self):
+        start = time.perf_counter()
+        replies = [self.pool.generate(f"req{i}") for i in range(20)]
+        self.assertLess(time.perf_counter() - start, 5)
+        pids = {r.split("@")[1].strip() for r in replies}
+        self.assertTrue(pids)
+        self.assertNotIn(str(os.getpid()), pids)
+
+    def test_worker_error_surfaces(self):
+        with self.assertRaises(RuntimeError):
+            self.pool.generate("FAIL now")
+        # The worker survives the failed request
+        self.assertTrue(self.pool.generate("still alive"))
+
+
+class TestLocalRuntimeFailures(unittest.TestCase):
+    def test_failed_load_reports_not_ready(self):
+        pool = LocalModelPool("missing.gguf", workers=1, loader=broken_loader, timeout=10).start()
+        try:
+            self.assertFalse(pool.ready)
+            self.assertEqual(pool.failed_workers, 1)
+            with self.assertRaises(RuntimeError):
+                pool.generate("hello")
+        finally:
+            pool.close()
+
+
+class TestWorkerSlots(unittest.TestCase):
+    """A single worker, so anything still holding it shows up as a stall."""
+    def setUp(self):
+        self.pool = LocalModelPool("fake.gguf", workers=1, loader=fake_loader, timeout=10,
+                                   poll_interval=0.05).start()
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_abandoned_stream_frees_its_worker(self):
+        stream = self.pool.stream("SLOW", max_tokens=500)  # ~10s if decoded to the end
+        next(stream)
+        stream.close()
+        start = time.perf_counter()
+        self.assertTrue(self.pool.generate("next request").startswith("next@"))
+        self.assertLess(time.perf_counter() - start, 2)
+        self.assertEqual(self.pool.cancelled, 1)
+
+    def test_dead_worker_is_not_ready(self):
+        start = time.perf_counter()
+        with self.assertRaises(RuntimeError):
+            self.pool.generate("DIE now")
+        self.assertLess(time.perf_counter() - start, 2)  # failed by the reaper, not the 10s timeout
+        self.assertFalse(self.pool.ready)
+        with self.assertRaises(RuntimeError):
+            self.pool.generate("hello")
+
+    def test_survivors_keep_serving_after_a_death(self):
+        pool = LocalModelPool("fake.gguf", workers=2, loader=fake_loader, timeout=10, poll_interval=0.05).start()
+        try:
+            deadline = time.time() + 10
+            while pool.ready_workers < 2 and time.time() < deadline:
+                time.sleep(0.01)
+            with self.assertRaises(RuntimeError):
+                pool.generate("DIE now")
+            self.assertEqual(pool.ready_workers, 1)
+            self.assertTrue(pool.generate("still here").startswith("still@"))
+        finally:
+            pool.close()
+
+
+class TestPanicFrameDevolution(unittest.TestCase):
+    def test_gasket_swaps_to_warm_runtime(self):
+        from modules.safety_gasket import System5Gasket
+
+        pool = MagicMock(started=True, ready=True)
+        gasket = System5Gasket(local_runtime=pool)
+        cloud = gasket.router
+
+        self.assertIn("LOCAL_FALLBACK", gasket.panic_frame_devolution())
+        self.assertIsInstance(gasket.router, LocalRuntimeRouter)
+        gasket.router.generate("hi", "sys", max_tokens=4)
+        pool.generate.assert_called_once_with("sys\n\nUser: hi\nAssistant:", 4, None)
+
+        gasket.restore_cloud_router()
+        self.assertIs(gasket.router, cloud)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,277 @@
+import asyncio
+import threading
+import time
+import unittest
+import os
+import sys
+
+import httpx
+
+# Verify paths
+sys.path.append(os.getcwd())
+
+from modules.market_oracle import MarketOracle, TokenBucket, TOKENS
+
+
+def pair(base, quote=TOKENS["USDC"], price="2500.00", native="2500.0", h1=0.5, h6=1.2):
+    return {"baseToken": {"address": base}, "quoteToken": {"address": quote},
+            "priceUsd": price, "priceNative": native, "priceChange": {"h1": h1, "h6": h6}}
+
+
+class CountingDex:
+    """DexScreener stand-in: one pair per requested address, counting round trips."""
+    def __init__(self, delay=0.0, status=200):
+        self.delay = delay
+        self.status = status
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def _record(self, request):
+        addresses = request.url.path.rsplit('/', 1)[-1].split(',')
+        with self.lock:
+            self.requests.append(addresses)
+        # USDC only ever shows up as a quote token, like on the real API
+        pairs = [pair(a.lower()) for a in addresses if a != TOKENS["USDC"]]
+        return httpx.Response(self.status, json={"pairs": pairs})
+
+    def hits(self, symbol):
+        return sum(TOKENS.get(symbol, symbol) in r for r in self.requests)
+
+    def sync(self, request):
+        time.sleep(self.delay)
+        return self._record(request)
+
+    async def handle(self, request):
+        await asyncio.sleep(self.delay)
+        return self._record(request)
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=50.0, burst=2)
+        start = time.monotonic()
+        for _ in range(7):
+            bucket.acquire()
+        elapsed = time.monotonic() - start
+        # 2 free, 5 paced at 20ms each
+        self.assertGreaterEqual(elapsed, 0.09)
+        self.assertEqual(bucket.throttled, 5)
+
+    def test_async_waiters_paced(self):
+        bucket = TokenBucket(rate=100.0, burst=1)
+
+        async def run():
+            start = time.monotonic()
+            await asyncio.gather(*(bucket.aacquire() for _ in range(6)))
+            return time.monotonic() - start
+
+        self.assertGreaterEqual(asyncio.run(run()), 0.045)
+
+
+class TestMarketOracle(unittest.TestCase):
+    def test_async_single_flight(self):
+        print("\n=== TEST: ORACLE SINGLE-FLIGHT (ASYNC) ===")
+        dex = CountingDex(delay=0.05)
+        oracle = MarketOracle(transport=httpx.MockTransport(dex.handle))
+
+        async def swarm():
+            prices = await asyncio.gather(*(oracle.aget_price("WETH") for _ in range(25)),
+                                          *(oracle.aget_kinetic_entropy("CBETH") for _ in range(25)))
+            await oracle.aclose()
+            return prices
+
+        results = asyncio.run(swarm())
+        print(f"50 clone reads -> upstream requests: {len(dex.requests)}")
+        self.assertEqual(results[:25], [2500.0] * 25)
+        self.assertEqual(len(dex.requests), 1)
+        self.assertEqual((oracle.fetches, oracle.coalesced), (1, 49))
+
+    def test_threaded_single_flight(self):
+        dex = CountingDex(delay=0.05)
+        oracle = MarketOracle(transport=httpx.MockTransport(dex.sync))
+        prices = []
+        threads = [threading.Thread(target=lambda: prices.append(oracle.get_price("WETH"))) for _ in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        oracle.close()
+        self.assertEqual(prices, [2500.0] * 10)
+        self.assertEqual(dex.hits("WETH"), 1)
+
+    def test_cache_ttl_and_rate_limit(self):
+        dex = CountingDex()
+        oracle = MarketOracle(cache_ttl=0.0, rate=20.0, burst=1, transport=httpx.MockTransport(dex.sync))
+        start = time.monotonic()
+        for _ in range(4):
+            oracle.get_price("WETH")
+        self.assertEqual(dex.hits("WETH"), 4)
+        self.assertGreaterEqual(time.monotonic() - start, 0.14)
+
+        dex = CountingDex()
+        cached = MarketOracle(transport=httpx.MockTransport(dex.sync))
+        for _ in range(5):
+            cached.get_price("USDC")
+        self.assertEqual(dex.hits("USDC"), 1)
+
+    def test_upstream_failure_and_unmapped(self):
+        oracle = MarketOracle(transport=httpx.MockTransport(CountingDex(status=429).sync))
+        self.assertEqual(oracle.get_price("WETH"), 0.0)
+        self.assertEqual(oracle.get_kinetic_entropy("UNKNOWN"), 0.0)
+        self.assertIsNone(asyncio.run(oracle.aget_market_data("UNKNOWN")))
+
+    def test_many_one_round_trip(self):
+        print("\n=== TEST: ORACLE BATCHED SNAPSHOT ===")
+        dex = CountingDex()
+        oracle = MarketOracle(transport=httpx.MockTransport(dex.sync))
+        snapshot = oracle.get_market_data_many(["WETH", "CBETH", "USDC", "UNKNOWN"])
+        self.assertEqual(len(dex.requests), 1)
+        self.assertEqual(sorted(dex.requests[0]), sorted(TOKENS.values()))
+        self.assertEqual(snapshot["WETH"]["baseToken"]["address"], TOKENS["WETH"].lower())
+        # Quote-only token falls back to the first pair that quotes it
+        self.assertEqual(snapshot["USDC"]["quoteToken"]["address"], TOKENS["USDC"])
+        self.assertEqual(oracle.price_of(snapshot["USDC"]), 1.0)
+        self.assertIsNone(snapshot["UNKNOWN"])
+        # Per-symbol reads are served from the snapshot
+        for symbol in TOKENS:
+            oracle.get_price(symbol)
+            oracle.get_kinetic_entropy(symbol)
+        self.assertEqual(len(dex.requests), 1)
+
+    def test_quote_side_price_is_derived(self):
+        """A token found only as a quote is priced priceUsd / priceNative, not at the base's price."""
+        weth, usdc = TOKENS["WETH"].lower(), TOKENS["USDC"]
+
+        def handler(request):
+            return httpx.Response(200, json={"pairs": [pair(weth, price="2500.00", native="2500.5", h1=40, h6=60)]})
+
+        oracle = MarketOracle(transport=httpx.MockTransport(handler))
+        snapshot = oracle.get_market_data_many(["WETH", "USDC"])
+        self.assertEqual(oracle.price_of(snapshot["WETH"]), 2500.0)
+        self.assertAlmostEqual(oracle.get_price("USDC"), 2500.0 / 2500.5)
+        self.assertEqual(oracle.ticks["USDC"].last_price, oracle.get_price("USDC"))
+        # WETH's h1/h6 moves say nothing about USDC
+        self.assertEqual(oracle.get_kinetic_entropy("USDC"), 0.0)
+        self.assertEqual(snapshot["USDC"]["quoteToken"]["address"], usdc)
+
+    def test_quote_side_without_native_price_is_skipped(self):
+        weth = TOKENS["WETH"].lower()
+        quoteless = {k: v for k, v in pair(weth).items() if k != "priceNative"}
+        oracle = MarketOracle(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, json={"pairs": [quoteless]})))
+        snapshot = oracle.get_market_data_many(["WETH", "USDC"])
+        self.assertIsNotNone(snapshot["WETH"])
+        self.assertIsNone(snapshot["USDC"])
+        self.assertNotIn("USDC", oracle.ticks)
+
+    def test_many_chunks_large_batches(self):
+        tokens = {f"T{i}": f"0x{i:040x}" for i in range(70)}
+        dex = CountingDex()
+        oracle = MarketOracle(transport=httpx.MockTransport(dex.sync), tokens=tokens, burst=10)
+        snapshot = asyncio.run(oracle.aget_market_data_many(tokens))
+        self.assertEqual([len(r) for r in dex.requests], [30, 30, 10])
+        self.assertTrue(all(snapshot.values()))
+
+    def test_shared_instance(self):
+        self.assertIs(MarketOracle.shared(), MarketOracle.shared())
+
+
+class TestPriceStream(unittest.TestCase):
+    def test_subscribers_receive_pushed_updates(self):
+        print("\n=== TEST: ORACLE PUSH STREAM ===")
+        dex = CountingDex()
+        oracle = MarketOracle(cache_ttl=0.1, transport=httpx.MockTransport(dex.handle))
+
+        async def clone():
+            prices = oracle.subscribe(["WETH", "CBETH", "UNKNOWN"])
+            updates = []
+            while len(updates) < 6:
+                update = await prices.get(timeout=1.0)
+                self.assertIsNotNone(update, "refresher stopped publishing")
+                updates.append(update)
+            prices.close()
+            await oracle.aclose()
+            return updates
+
+        updates = asyncio.run(clone())
+        print(f"6 pushed updates over {len(dex.requests)} upstream requests")
+        self.assertEqual({symbol for symbol, _ in updates}, {"WETH", "CBETH"})
+        self.assertEqual(updates[0][1]["priceUsd"], "2500.00")
+        self.assertEqual(len(dex.requests), 3)  # one batched request per refresh pass
+        self.assertEqual(oracle._subscriptions, [])
+
+    def test_slow_reader_gets_latest_not_backlog(self):
+        # Upstream never answers in time: only the manual publishes reach the reader
+        oracle = MarketOracle(transport=httpx.MockTransport(CountingDex(delay=5).handle))
+
+        async def run():
+            prices = oracle.subscribe(["WETH"])
+            oracle._publish({"WETH": {"priceUsd": "1"}})
+            oracle._publish({"WETH": {"priceUsd": "2"}})
+            await asyncio.sleep(0)
+            first = await prices.get(timeout=0.1)
+            second = await prices.get(timeout=0.05)
+            await oracle.aclose()
+            return first, second
+
+        first, second = asyncio.run(run())
+        self.assertEqual(first, ("WETH", {"priceUsd": "2"}))
+        self.assertIsNone(second)
+
+    def test_subscribe_skips_stale_cache(self):
+        """An entry past cache_ttl is still served to readers but never pushed on subscribe."""
+        oracle = MarketOracle(cache_ttl=5, transport=httpx.MockTransport(CountingDex(delay=5).handle))
+        oracle.cache["WETH"] = ({"priceUsd": "1"}, time.time() - 30)
+        oracle.cache["CBETH"] = ({"priceUsd": "2"}, time.time())
+
+        async def run():
+            prices = oracle.subscribe(["WETH", "CBETH"])
+            first = await prices.get(timeout=0.1)
+            second = await prices.get(timeout=0.05)
+            await oracle.aclose()
+            return first, second
+
+        first, second = asyncio.run(run())
+        self.assertEqual(first, ("CBETH", {"priceUsd": "2"}))
+        self.assertIsNone(second)
+
+    def test_hot_reads_never_wait_on_fetch(self):
+        """With the refresher running, expired entries are served stale and revalidated."""
+        dex = CountingDex(delay=0.2)
+        oracle = MarketOracle(cache_ttl=0.05, refresh_interval=10.0, transport=httpx.MockTransport(dex.handle))
+
+        async def run():
+            oracle.start_refresher()
+            await oracle.aget_price("WETH")  # cold: waits for the first fetch
+            await asyncio.sleep(0.1)          # expired, refresher asleep
+            start = time.monotonic()
+            price = await oracle.aget_price("WETH")
+            elapsed = time.monotonic() - start
+            await asyncio.sleep(0.3)          # background revalidation lands
+            await oracle.aclose()
+            return price, elapsed
+
+        price, elapsed = asyncio.run(run())
+        self.assertEqual(price, 2500.0)
+        self.assertLess(elapsed, 0.05)
+        self.assertEqual(len(dex.requests), 2)
+
+    def test_refresher_warms_recently_read_symbols(self):
+        dex = CountingDex()
+        oracle = MarketOracle(cache_ttl=0.2, refresh_interval=0.05, transport=httpx.MockTransport(dex.handle))
+
+        async def run():
+            await oracle.aget_price("CBETH")
+            oracle.start_refresher()
+            await asyncio.sleep(0.5)
+            fresh = oracle._cached("CBETH") is not None
+            await oracle.aclose()
+            return fresh
+
+        self.assertTrue(asyncio.run(run()))
+        self.assertGreaterEqual(len(dex.requests), 3)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,7 @@
 import unittest
 from unittest.mock import MagicMock, patch
 import os
+import tempfile
 import time
 import sys
 
@@ -11,6 +12,7 @@ sys.path.append(os.getcwd())
 from modules.clone_base import CloneBase
 from modules.auditor_core import AuditorCore
 from modules.territory_manager import TerritoryManager
+import modules.safety_gasket as safety_gasket
 from modules.safety_gasket import System5Gasket
 from modules.market_oracle import MarketOracle
 
@@ -21,6 +23,11 @@ class TestRealityInjection(unittest.TestCase):
     """
 
     def setUp(self):
+        # Lockouts triggered by a test land in a scratch dir, never the working tree
+        self.tmp = tempfile.TemporaryDirectory()
+        self.lockout = patch.object(safety_gasket, 'LOCKOUT_FILE', os.path.join(self.tmp.name, "LOCKOUT.state"))
+        self.lockout.start()
+
         # Mock Dependencies
         self.mock_tm = MagicMock(spec=TerritoryManager)
         self.mock_auditor = MagicMock(spec=AuditorCore)
@@ -34,6 +41,10 @@ class TestRealityInjection(unittest.TestCase):
             'risk_profile': 'High'
         }
 
+    def tearDown(self):
+        self.lockout.stop()
+        self.tmp.cleanup()
+
     def test_1_live_market_entropy(self):
         """
         Verify that the Oracle fetches REAL data from Base Mainnet.
@@ -0,0 +1,123 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+
+# Verify paths
+sys.path.append(os.getcwd())
+
+import modules.routing_policy as routing_policy
+from modules.routing_policy import RoutingPolicy, BackendStats, CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+
+class TestBackendStats(unittest.TestCase):
+    def test_percentiles_and_error_rate_roll(self):
+        stats = BackendStats(window=10)
+        for i in range(1, 21):
+            stats.record(i / 100, ok=i % 5 != 0)
+        # Only the last 10 calls (0.11 .. 0.20) remain
+        self.assertAlmostEqual(stats.percentile(50), 0.155)
+        self.assertAlmostEqual(stats.error_rate, 0.2)
+
+    def test_abandoned_call_times_without_outcome(self):
+        stats = BackendStats()
+        stats.record(1.5, None)
+        stats.record(None, False)
+        self.assertEqual(stats.samples, 1)
+        self.assertEqual(stats.error_rate, 1.0)
+
+
+class TestRoutingPolicy(unittest.TestCase):
+    def setUp(self):
+        self.policy = RoutingPolicy(min_samples=5, max_error_rate=0.5, failure_threshold=100)
+
+    def feed(self, backend, latency, n=5, ok=True):
+        for _ in range(n):
+            self.policy.record(backend, latency if ok else None, ok)
+
+    def test_preference_order_until_both_sampled(self):
+        self.feed("local", 0.01)
+        self.assertEqual(self.policy.order(["primary", "local"]), ["primary", "local"])
+        self.assertIsNone(self.policy.hedge_delay("primary"))
+
+    def test_faster_healthy_backend_first(self):
+        self.feed("primary", 0.8)
+        self.feed("local", 0.2)
+        self.assertEqual(self.policy.order(["primary", "local"]), ["local", "primary"])
+        self.assertEqual(self.policy.order(["local"]), ["local"])
+
+    def test_unhealthy_backend_last(self):
+        self.feed("primary", 0.1)
+        self.feed("local", 0.5)
+        self.feed("primary", None, n=6, ok=False)
+        self.assertFalse(self.policy.healthy("primary"))
+        self.assertEqual(self.policy.order(["primary", "local"]), ["local", "primary"])
+
+    def test_hedge_delay_is_p95(self):
+        for latency in [0.1] * 19 + [2.0]:
+            self.policy.record("primary", latency, True)
+        self.assertAlmostEqual(self.policy.hedge_delay("primary"), 0.195)
+        self.policy.hedge = False
+        self.assertIsNone(self.policy.hedge_delay("primary"))
+
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.clock = [0.0]
+        self.monotonic = patch.object(routing_policy.time, 'monotonic', lambda: self.clock[0])
+        self.monotonic.start()
+        self.breaker = CircuitBreaker(failure_threshold=3, cooldown=10)
+
+    def tearDown(self):
+        self.monotonic.stop()
+
+    def test_closed_open_half_open_cycle(self):
+        print("\n=== TEST: CIRCUIT BREAKER ===")
+        for _ in range(2):
+            self.breaker.record(False)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.breaker.record(False)
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.acquire())
+        self.assertEqual(self.breaker.snapshot()["retry_in"], 10)
+
+        # Cool-down over: exactly one probe is admitted
+        self.clock[0] = 10.0
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertTrue(self.breaker.acquire())
+        self.assertFalse(self.breaker.acquire())
+
+        # Failed probe re-opens for a fresh cool-down
+        self.breaker.record(False)
+        self.assertEqual(self.breaker.state, OPEN)
+        self.clock[0] = 20.0
+        self.assertTrue(self.breaker.acquire())
+        self.breaker.record(True)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.breaker.snapshot(), {"state": CLOSED, "consecutive_failures": 0, "opens": 1, "retry_in": 0.0})
+
+    def test_success_resets_consecutive_failures(self):
+        for ok in [False, False, True, False, False]:
+            self.breaker.record(ok)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_abandoned_probe_frees_slot(self):
+        for _ in range(3):
+            self.breaker.record(False)
+        self.clock[0] = 10.0
+        self.assertTrue(self.breaker.acquire())
+        self.breaker.release()
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertTrue(self.breaker.acquire())
+
+    def test_policy_skips_open_backend(self):
+        policy = RoutingPolicy(failure_threshold=2)
+        policy.record("primary", None, False)
+        policy.record("primary", None, False)
+        self.assertEqual(policy.order(["primary", "local"]), ["local"])
+        self.assertEqual(policy.snapshot()["primary"]["breaker"]["state"], OPEN)
+
+
+if __name__ == '__main__':
+    unittest.main()
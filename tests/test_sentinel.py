@@ -0,0 +1,111 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+from unittest.mock import patch
+
+import pandas as pd
+
+# Verify paths
+sys.path.append(os.getcwd())
+
+from nodes.Sentinel import SentinelFileWatcher, SentinelTimeline, FATIGUE_BREACH
+from nodes.Auditor import Auditor
+from nodes.Backtester import Backtester
+
+sys.path.append(os.path.dirname(__file__))
+from test_backtester import make_tape, legacy_stress_test
+
+
+class TestSentinelFileWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "sentinel_status.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_status(self, status: str, mtime_ns: int):
+        with open(self.path, "w") as f:
+            json.dump({"status": status}, f)
+        os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+    def test_missing_file_fails_open(self):
+        watcher = SentinelFileWatcher(self.path, poll_interval=0.0)
+        self.assertIsNone(watcher.status())
+
+    @patch('nodes.Sentinel.time.monotonic')
+    def test_polls_within_interval(self, mock_clock):
+        """Status flips are seen after at most one poll interval, and cached in between."""
+        print("\n=== TEST: SENTINEL WATCHER POLLING ===")
+        mock_clock.return_value = 100.0
+        self.write_status("NOMINAL", 1_000_000_000)
+        watcher = SentinelFileWatcher(self.path, poll_interval=2.0)
+        self.assertEqual(watcher.status(), "NOMINAL")
+
+        self.write_status(FATIGUE_BREACH, 2_000_000_000)
+        mock_clock.return_value = 101.0
+        with patch('nodes.Sentinel.os.stat') as mock_stat:
+            self.assertEqual(watcher.status(), "NOMINAL")  # cached, no syscall
+            mock_stat.assert_not_called()
+
+        mock_clock.return_value = 102.0
+        self.assertEqual(watcher.status(), FATIGUE_BREACH)
+
+    @patch('nodes.Sentinel.time.monotonic', return_value=0.0)
+    def test_unchanged_file_is_not_reparsed(self, mock_clock):
+        self.write_status(FATIGUE_BREACH, 1_000_000_000)
+        watcher = SentinelFileWatcher(self.path, poll_interval=0.0)
+        self.assertEqual(watcher.status(), FATIGUE_BREACH)
+        with patch('nodes.Sentinel.json.load') as mock_load:
+            self.assertEqual(watcher.status(), FATIGUE_BREACH)
+            mock_load.assert_not_called()
+
+    def test_auditor_locks_on_breach(self):
+        self.write_status(FATIGUE_BREACH, 1_000_000_000)
+        auditor = Auditor(sentinel=SentinelFileWatcher(self.path))
+        verdict = auditor.check_compliance("BUY", 100000.0, 100000.0)
+        self.assertEqual(verdict['status'], "LOCKED")
+        self.assertIn("SENTINEL", verdict['reason'])
+
+
+class TestSentinelTimeline(unittest.TestCase):
+    def test_lookup(self):
+        timeline = SentinelTimeline([("2022-03-01", FATIGUE_BREACH), ("2022-03-05", "NOMINAL")])
+        self.assertIsNone(timeline.status("2022-02-28"))
+        self.assertEqual(timeline.status("2022-03-01"), FATIGUE_BREACH)
+        self.assertEqual(timeline.status("2022-03-04 23:59"), FATIGUE_BREACH)
+        self.assertEqual(timeline.status("2022-03-05"), "NOMINAL")
+        self.assertEqual(timeline.status(), "NOMINAL")
+
+        index = pd.date_range("2022-02-27", periods=8, freq="D")
+        self.assertEqual(list(timeline.statuses(index)), [timeline.status(t) for t in index])
+
+    def test_lookup_mixed_resolutions(self):
+        """Timestamps at second resolution (e.g. from a tape) compare on the same scale as events."""
+        timeline = SentinelTimeline([("2022-03-01", FATIGUE_BREACH), ("2022-03-05", "NOMINAL")])
+        index = pd.date_range("2022-02-27", periods=8, freq="D").as_unit("s")
+        self.assertEqual(list(timeline.statuses(index)), [timeline.status(t) for t in index])
+
+    def test_backtest_lock_window(self):
+        """An injected breach locks exactly the candles it covers."""
+        print("\n=== TEST: BACKTEST SENTINEL TIMELINE ===")
+        df = make_tape(seed=1, vol=0.002)
+        timeline = SentinelTimeline([(df.index[100], FATIGUE_BREACH), (df.index[130], "NOMINAL")])
+        results = Backtester(auditor=Auditor(sentinel=timeline)).run(df)
+        locked = [c['date'] for c in results['compliance_log'] if c['reason'].startswith("SENTINEL")]
+        self.assertEqual(locked, [str(d.date()) for d in df.index[100:130]])
+
+    def test_constant_breach_matches_legacy(self):
+        df = make_tape(seed=2, vol=0.002)
+        timeline = SentinelTimeline(initial=FATIGUE_BREACH)
+        results = Backtester(auditor=Auditor(sentinel=timeline)).run(df)
+        with patch('nodes.Auditor.SentinelFileWatcher', return_value=timeline):
+            expected = legacy_stress_test(df)
+        self.assertEqual(results['compliance_log'], expected['compliance_log'])
+        self.assertEqual(results['final_equity'], expected['final_equity'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,7 @@
 import unittest
 from unittest.mock import MagicMock, patch
 import os
+import tempfile
 import time
 
 # Verify paths (Hack for VSCode/Terminal path differences)
@@ -11,6 +12,7 @@ sys.path.append(os.getcwd())
 from modules.clone_base import CloneBase
 from modules.auditor_core import AuditorCore
 from modules.territory_manager import TerritoryManager
+import modules.safety_gasket as safety_gasket
 from modules.safety_gasket import System5Gasket
 
 class TestSovereignTransactionProtocol(unittest.TestCase):
@@ -19,6 +21,11 @@ class TestSovereignTransactionProtocol(unittest.TestCase):
     """
 
     def setUp(self):
+        # Lockouts triggered by a test land in a scratch dir, never the working tree
+        self.tmp = tempfile.TemporaryDirectory()
+        self.lockout = patch.object(safety_gasket, 'LOCKOUT_FILE', os.path.join(self.tmp.name, "LOCKOUT.state"))
+        self.lockout.start()
+
         # Mock Dependencies
         self.mock_tm = MagicMock(spec=TerritoryManager)
         self.mock_auditor = MagicMock(spec=AuditorCore)
@@ -33,6 +40,10 @@ class TestSovereignTransactionProtocol(unittest.TestCase):
             'risk_profile': 'Low'
         }
 
+    def tearDown(self):
+        self.lockout.stop()
+        self.tmp.cleanup()
+
     def test_1_normal_execution_with_token(self):
         """
         Verify that a valid token ALLOWS execution.
@@ -44,7 +55,6 @@ class TestSovereignTransactionProtocol(unittest.TestCase):
         
         # Mock Gasket internals to ensure health
         clone.gasket.current_scar_index = 1.0
-        clone.gasket.is_locked = False
         
         # Perform the Token Issue call manually to verify format
         token = clone.gasket.issue_constitutional_token("TEST_INTENT")
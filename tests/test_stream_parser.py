@@ -0,0 +1,110 @@
+import unittest
+import os
+import sys
+import json
+
+# Verify paths
+sys.path.append(os.getcwd())
+
+from modules.stream_parser import StreamParser, ParseStats, SSE, NDJSON
+
+TOKENS = ["Hel", "lo", " \"quoted\"", " back\\slash", " ünïcødé ✓", "\n", "tab\t", "", " end"]
+
+
+def compact(obj):
+    """Serialised the way OpenAI and Ollama send it: no whitespace, raw UTF-8."""
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def sse_body(tokens):
+    events = [{'choices': [{'index': 0, 'delta': {'role': 'assistant', 'content': None}}]}]
+    events += [{'id': 'x', 'choices': [{'index': 0, 'delta': {'content': t}, 'finish_reason': None}]} for t in tokens]
+    events += [{'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]}]
+    body = b"".join(b"data: " + compact(e) + b"\n\n" for e in events)
+    return body + b"data: [DONE]\n\n" + b"data: {\"ignored\": true}\n\n"
+
+
+def ndjson_body(tokens):
+    lines = [{'model': 'llama3', 'created_at': 'now', 'response': t, 'done': False} for t in tokens]
+    lines.append({'model': 'llama3', 'response': '', 'done': True, 'context': [1, 2, 3]})
+    return b"".join(compact(l) + b"\n" for l in lines)
+
+
+def legacy_sse(body):
+    """The line/json.loads loop previously in SovereignRouter._stream_openai."""
+    out = []
+    for line in body.split(b"\n"):
+        if line:
+            line = line.decode('utf-8')
+            if line.startswith('data: '):
+                if line == 'data: [DONE]':
+                    break
+                content = json.loads(line[6:])['choices'][0].get('delta', {}).get('content')
+                if content:
+                    out.append(content)
+    return out
+
+
+def legacy_ndjson(body):
+    return [json.loads(line.decode('utf-8')).get('response', '') for line in body.split(b"\n") if line]
+
+
+def parse_in_pieces(kind, body, size):
+    parser = StreamParser(kind)
+    out = []
+    for i in range(0, len(body), size):
+        out += parser.feed(body[i:i + size])
+    return out + parser.flush(), parser
+
+
+class TestStreamParser(unittest.TestCase):
+    def test_sse_matches_legacy_for_any_split(self):
+        body = sse_body(TOKENS)
+        expected = legacy_sse(body)
+        for size in [1, 2, 3, 7, 64, len(body)]:
+            with self.subTest(size=size):
+                deltas, parser = parse_in_pieces(SSE, body, size)
+                self.assertEqual(deltas, expected)
+                self.assertTrue(parser.done)
+
+    def test_ndjson_matches_legacy_for_any_split(self):
+        body = ndjson_body(TOKENS)
+        expected = legacy_ndjson(body)
+        for size in [1, 5, 13, len(body)]:
+            with self.subTest(size=size):
+                self.assertEqual(parse_in_pieces(NDJSON, body, size)[0], expected)
+
+    def test_trailing_line_without_newline(self):
+        parser = StreamParser(NDJSON)
+        self.assertEqual(parser.feed(b'{"response": "a"}\n{"response": "b"}'), ["a"])
+        self.assertEqual(parser.flush(), ["b"])
+
+    def test_fallback_for_unusual_lines(self):
+        """Lines without the string field are decoded in full, as before."""
+        parser = StreamParser(NDJSON)
+        self.assertEqual(parser.feed(b'{"error": "model not found"}\n{"response": 5}\n{"response": "spaced"}\n'),
+                         ["", 5, "spaced"])
+
+    def test_sse_slow_paths(self):
+        """Escaped keys, escaped values and spaced JSON decode the whole event."""
+        parser = StreamParser(SSE)
+        events = [
+            b'data: {"x\\"content":"no","choices":[{"delta":{"content":"yes"}}]}',
+            b'data: {"choices":[{"delta":{"content":"a\\"b\\nc"}}]}',
+            b'data: {"choices": [{"delta": {"content": "spaced"}}]}',
+        ]
+        self.assertEqual(parser.feed(b"\n\n".join(events) + b"\n\n"), ["yes", 'a"b\nc', "spaced"])
+
+    def test_parse_time_recorded_per_chunk(self):
+        stats = ParseStats()
+        parser = StreamParser(NDJSON, stats)
+        parser.feed(ndjson_body(["a", "b"]))
+        parser.feed(b'{"response":"c"}\n')
+        snapshot = stats.snapshot()
+        self.assertEqual((snapshot["chunks"], snapshot["lines"]), (2, 4))
+        self.assertGreater(snapshot["total_ms"], 0)
+        self.assertGreaterEqual(snapshot["max_us"], snapshot["mean_us"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import os
+import sys
+
+import pandas as pd
+
+# Verify paths
+sys.path.append(os.getcwd())
+
+from nodes.Sweep import ParameterSweep, expand_grid, publish_tape, attach_tape, run_config
+
+sys.path.append(os.path.dirname(__file__))
+from test_backtester import make_tape
+
+
+class TestParameterSweep(unittest.TestCase):
+    def test_expand_grid(self):
+        configs = expand_grid({"short_window": [5, 20], "long_window": [20, 30], "hard_stop": [0.03, 0.05]})
+        # (20, 20) is not a crossover and is dropped
+        self.assertEqual(len(configs), 6)
+        self.assertTrue(all(c["soft_stop"] == 0.01 for c in configs))
+        with self.assertRaises(ValueError):
+            expand_grid({"fast_window": [3]})
+
+    def test_shared_tape_roundtrip(self):
+        df = make_tape(seed=4, n=50)
+        df.index = df.index.tz_localize("UTC").as_unit("ns")
+        shm, spec = publish_tape(df)
+        try:
+            view_shm, view = attach_tape(spec)
+            pd.testing.assert_frame_equal(view, df, check_freq=False)
+            del view
+            view_shm.close()
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def test_pool_matches_serial(self):
+        """Fanned-out results equal running each config in-process."""
+        print("\n=== TEST: PARAMETER SWEEP ===")
+        df = make_tape(seed=1, n=600, vol=0.004)
+        grid = {"short_window": [3, 5], "long_window": [20, 30], "hard_stop": [0.03, 0.05]}
+        table = ParameterSweep(df, max_workers=2).run(grid)
+
+        expected = pd.DataFrame([run_config(c, df) for c in expand_grid(grid)])
+        pd.testing.assert_frame_equal(table, expected[table.columns])
+        self.assertEqual(list(table.columns[-6:]), ["final_equity", "max_drawdown", "total_trades",
+                                                    "veto_count", "interdictions", "locked_candles"])
+
+
+if __name__ == '__main__':
+    unittest.main()
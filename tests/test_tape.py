@@ -0,0 +1,62 @@
+import unittest
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Verify paths
+sys.path.append(os.getcwd())
+
+from nodes.Tape import read_ohlc_csv, write_tape, load_tape, is_tape
+from nodes.Sweep import ParameterSweep
+
+sys.path.append(os.path.dirname(__file__))
+from test_backtester import make_tape
+
+
+class TestColumnarTape(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.df = make_tape(seed=8, n=300)
+        self.df.index = self.df.index.as_unit("ns")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_csv_roundtrip(self):
+        """CSV -> tape -> mmap frame preserves the close/high/low frame."""
+        print("\n=== TEST: COLUMNAR TAPE ROUNDTRIP ===")
+        csv_path = os.path.join(self.tmp.name, "btc.csv")
+        tape_path = os.path.join(self.tmp.name, "btc.tape")
+        self.df.rename(columns=str.title).to_csv(csv_path)
+
+        frame = read_ohlc_csv(csv_path)
+        write_tape(frame, tape_path)
+        self.assertTrue(is_tape(tape_path))
+        self.assertFalse(is_tape(csv_path))
+
+        tape = load_tape(tape_path)
+        pd.testing.assert_frame_equal(tape, frame.set_axis(frame.index.as_unit("ns")), check_freq=False)
+
+    def test_columns_are_memory_mapped(self):
+        tape_path = os.path.join(self.tmp.name, "btc.tape")
+        write_tape(self.df, tape_path)
+        tape = load_tape(tape_path)
+        base = tape['close'].to_numpy()
+        while getattr(base, 'base', None) is not None and not isinstance(base, np.memmap):
+            base = base.base
+        self.assertIsInstance(base, np.memmap)
+
+    def test_sweep_from_tape(self):
+        tape_path = os.path.join(self.tmp.name, "btc.tape")
+        write_tape(self.df, tape_path)
+        grid = {"short_window": [3, 5], "long_window": [20]}
+        from_tape = ParameterSweep(max_workers=2, tape_path=tape_path).run(grid)
+        from_frame = ParameterSweep(self.df, max_workers=2).run(grid)
+        pd.testing.assert_frame_equal(from_tape, from_frame)
+
+
+if __name__ == '__main__':
+    unittest.main()
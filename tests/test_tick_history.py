@@ -0,0 +1,135 @@
+import unittest
+import os
+import sys
+
+import numpy as np
+import httpx
+
+# Verify paths
+sys.path.append(os.getcwd())
+
+from modules.tick_history import TickHistory, MAX_TICK_ENTROPY
+from modules.market_oracle import MarketOracle, TOKENS
+from modules.safety_gasket import CONSTITUTIONAL_VARIANCE_LIMIT
+
+
+def random_walk(n, sigma=1e-4, seed=7, start=2500.0, step=10.0):
+    rng = np.random.default_rng(seed)
+    prices = start * np.exp(np.cumsum(rng.normal(0, sigma, n)))
+    times = 1_700_000_000 + step * np.arange(n)
+    return times, prices
+
+
+def realized_entropy(times, prices):
+    """Reference: full recompute over the same ticks."""
+    returns_sq = np.diff(np.log(prices)) ** 2
+    vol = np.sqrt(returns_sq.sum() / max(times[-1] - times[0], 3600.0) * 3600.0)
+    return min(vol * 5.0, MAX_TICK_ENTROPY)
+
+
+class TestTickHistory(unittest.TestCase):
+    def test_incremental_matches_full_recompute(self):
+        times, prices = random_walk(1000)
+        history = TickHistory(capacity=64, rebase_every=10**9)
+        for t, p in zip(times, prices):
+            history.push(t, p)
+        self.assertEqual(history.count, 64)
+        self.assertAlmostEqual(history.kinetic_entropy(), realized_entropy(times[-65:], prices[-65:]), places=9)
+        self.assertEqual(history.returns_sq.shape, (64,))
+
+    def test_backfill_matches_pushing(self):
+        times, prices = random_walk(500, seed=3)
+        pushed = TickHistory(capacity=128)
+        for t, p in zip(times, prices):
+            pushed.push(t, p)
+        filled = TickHistory(capacity=128)
+        # Shuffled, with a duplicate timestamp and a bad price: cleaned up like push()
+        order = np.random.default_rng(0).permutation(len(times))
+        filled.backfill(np.append(times[order], times[0]), np.append(prices[order], -1.0))
+        self.assertAlmostEqual(filled.kinetic_entropy(), pushed.kinetic_entropy(), places=9)
+        # Live ticks continue from the backfilled window
+        for history in (pushed, filled):
+            history.push(times[-1] + 10.0, prices[-1] * 1.001)
+        self.assertAlmostEqual(filled.kinetic_entropy(), pushed.kinetic_entropy(), places=9)
+
+    def test_scale_matches_coarse_formula(self):
+        """A steady 1%/hour realized move maps to the 0.05 constitutional limit."""
+        history = TickHistory(capacity=128)
+        step = 0.01 / np.sqrt(60)  # per-minute return giving 1% hourly volatility
+        price = 100.0
+        for i in range(129):
+            history.push(60.0 * i, price)
+            price *= np.exp(step if i % 2 else -step)
+        self.assertAlmostEqual(history.kinetic_entropy(), 0.05, places=6)
+
+    def test_flash_crash_detected_on_next_tick(self):
+        print("\n=== TEST: TICK-LEVEL FLASH CRASH DETECTION ===")
+        times, prices = random_walk(100)
+        history = TickHistory(capacity=64)
+        history.backfill(times, prices)
+        calm = history.kinetic_entropy()
+        history.push(times[-1] + 10.0, prices[-1] * 0.9)  # -10% in one tick
+        crash = history.kinetic_entropy()
+        print(f"Entropy calm: {calm:.4f} -> after crash tick: {crash:.4f}")
+        self.assertLess(calm, CONSTITUTIONAL_VARIANCE_LIMIT)
+        # Denies trades, but the lockout is left to the coarse h1/h6 reading
+        self.assertGreater(crash, CONSTITUTIONAL_VARIANCE_LIMIT)
+        self.assertEqual(crash, MAX_TICK_ENTROPY)
+
+    def test_single_small_bounce_stays_calm(self):
+        """A 0.2% dip-and-recover is noise, however short the window it lands in."""
+        def bounce(history, step):
+            for i in range(9):
+                history.push(step * i, 2500.0 * (0.998 if i == 4 else 1.0))
+            return history
+
+        # ~20s of ticks: too short a span to estimate anything
+        self.assertIsNone(bounce(TickHistory(), 2.5).kinetic_entropy())
+        # Five minutes of ticks: counted as it is, not extrapolated to an hour
+        entropy = bounce(TickHistory(), 300.0 / 8).kinetic_entropy()
+        self.assertLess(entropy, CONSTITUTIONAL_VARIANCE_LIMIT)
+
+    def test_short_window_not_scaled_up(self):
+        history = TickHistory(min_ticks=1, min_span=300)
+        history.push(0.0, 100.0)
+        history.push(600.0, 101.0)
+        self.assertAlmostEqual(history.hourly_volatility(), np.log(1.01))
+
+    def test_needs_min_ticks(self):
+        history = TickHistory(min_ticks=8)
+        for i in range(9):  # 9 ticks make the 8th return
+            self.assertIsNone(history.kinetic_entropy())
+            history.push(60.0 * i, 100.0 + i)
+        self.assertIsNotNone(history.kinetic_entropy())
+
+
+class TestOracleTickEntropy(unittest.TestCase):
+    def test_oracle_records_ticks_and_raises_entropy(self):
+        prices = iter([2500.0] * 10 + [2000.0])
+
+        def dex(request):
+            pair = {"baseToken": {"address": TOKENS["WETH"]}, "priceUsd": str(next(prices)),
+                    "priceChange": {"h1": 0.1, "h6": 0.2}}
+            return httpx.Response(200, json={"pairs": [pair]})
+
+        oracle = MarketOracle(cache_ttl=0.0, rate=1000.0, tokens={"WETH": TOKENS["WETH"]},
+                              transport=httpx.MockTransport(dex))
+        coarse = oracle.get_kinetic_entropy("WETH")
+        self.assertAlmostEqual(coarse, (0.1 + 0.2 / 6) / 100 * 5)
+        # Seed a calm history, then let the live fetches append to it
+        times, walk = random_walk(50)
+        walk *= 2500.0 / walk[-1]
+        oracle.backfill("WETH", times - times[-1] + oracle.cache["WETH"][1] - 1.0, walk)
+        for _ in range(9):
+            entropy = oracle.get_kinetic_entropy("WETH")
+            self.assertEqual(entropy, max(coarse, oracle.ticks["WETH"].kinetic_entropy()))
+            self.assertLess(entropy, 0.05)
+        # The -20% tick denies trades without tripping the lockout on its own
+        entropy = oracle.get_kinetic_entropy("WETH")
+        self.assertEqual(entropy, MAX_TICK_ENTROPY)
+        self.assertFalse(entropy > CONSTITUTIONAL_VARIANCE_LIMIT * 2)
+        self.assertLessEqual(oracle.ticks["WETH"].count, oracle.tick_capacity)
+
+
+if __name__ == '__main__':
+    unittest.main()
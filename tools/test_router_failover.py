@@ -1,71 +1,299 @@
 import sys
 import os
+import json
+import time
+import asyncio
 import unittest
-from unittest.mock import patch, MagicMock
+
+import httpx
 
 # Add current dir to path
 sys.path.append(os.getcwd())
 
-from modules.sovereign_router import SovereignRouter
+from modules.sovereign_router import SovereignRouter, AsyncSovereignRouter
+from modules.routing_policy import RoutingPolicy, CircuitOpenError
+
+def mock_backends(*responses):
+    """
+    MockTransport answering with `responses` in order. Each entry is an httpx.Response
+    or an exception to raise. Requests are recorded on the returned list.
+    """
+    calls = []
+    pending = list(responses)
+
+    def handler(request):
+        calls.append(request)
+        response = pending.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    return httpx.MockTransport(handler), calls
 
 class TestSovereignRouter(unittest.TestCase):
-    
-    @patch('requests.post')
-    def test_primary_success(self, mock_post):
+
+    def test_primary_success(self):
         """Test that primary (OpenAI) is called when key is valid."""
         # Mock OpenAI response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            'choices': [{'message': {'content': 'Colonial Response'}}]
-        }
-        mock_post.return_value = mock_response
-        
-        router = SovereignRouter(openai_key="valid_key")
+        transport, calls = mock_backends(
+            httpx.Response(200, json={'choices': [{'message': {'content': 'Colonial Response'}}]})
+        )
+
+        router = SovereignRouter(openai_key="valid_key", transport=transport)
         result = router.generate("Test Prompt")
-        
+
         self.assertEqual(result, "Colonial Response")
         # Ensure only 1 call was made (to OpenAI)
-        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(len(calls), 1)
+        router.close()
 
-    @patch('requests.post')
-    def test_failover_on_error(self, mock_post):
+    def test_failover_on_error(self):
         """Test that it fails over to local when OpenAI returns an error."""
         # 1. First call (OpenAI) returns 401
-        mock_openai_err = MagicMock()
-        mock_openai_err.status_code = 401
-        mock_openai_err.text = "Unauthorized"
-        
         # 2. Second call (Local) returns 200
-        mock_local_res = MagicMock()
-        mock_local_res.status_code = 200
-        mock_local_res.json.return_value = {'response': 'Sovereign Response'}
-        
-        mock_post.side_effect = [mock_openai_err, mock_local_res]
-        
-        router = SovereignRouter(openai_key="invalid_key")
+        transport, calls = mock_backends(
+            httpx.Response(401, text="Unauthorized"),
+            httpx.Response(200, json={'response': 'Sovereign Response'})
+        )
+
+        router = SovereignRouter(openai_key="invalid_key", transport=transport)
         result = router.generate("Test Prompt")
-        
+
         self.assertEqual(result, "Sovereign Response")
         # Ensure 2 calls were made
-        self.assertEqual(mock_post.call_count, 2)
+        self.assertEqual(len(calls), 2)
+        router.close()
 
-    @patch('requests.post')
-    def test_failover_on_exception(self, mock_post):
+    def test_failover_on_exception(self):
         """Test that it fails over to local when OpenAI call raises an exception."""
         # 1. First call (OpenAI) raises exception
         # 2. Second call (Local) returns 200
-        mock_local_res = MagicMock()
-        mock_local_res.status_code = 200
-        mock_local_res.json.return_value = {'response': 'Sovereign Response'}
-        
-        mock_post.side_effect = [Exception("Network Error"), mock_local_res]
-        
-        router = SovereignRouter(openai_key="key")
+        transport, calls = mock_backends(
+            httpx.ConnectError("Network Error"),
+            httpx.Response(200, json={'response': 'Sovereign Response'})
+        )
+
+        router = SovereignRouter(openai_key="key", transport=transport)
         result = router.generate("Test Prompt")
-        
+
         self.assertEqual(result, "Sovereign Response")
-        self.assertEqual(mock_post.call_count, 2)
+        self.assertEqual(len(calls), 2)
+        router.close()
+
+    def test_generate_token_is_bounded(self):
+        """Alternate tokens are short completions on whichever backend answers."""
+        transport, calls = mock_backends(httpx.Response(200, json={'response': ' alt'}))
+
+        router = SovereignRouter(transport=transport)
+        result = router.generate_token("Test Prompt", max_tokens=4)
+
+        self.assertEqual(result, " alt")
+        self.assertEqual(json.loads(calls[0].content)['options'], {"num_predict": 4})
+        router.close()
+
+    def test_stream_failover(self):
+        """The blocking stream yields local chunks after the primary stream is refused."""
+        ndjson = b"".join(json.dumps({'response': t}).encode() + b"\n" for t in ["Sov", "ereign"])
+        transport, calls = mock_backends(httpx.Response(503), httpx.Response(200, content=ndjson))
+
+        router = SovereignRouter(openai_key="key", transport=transport)
+        self.assertEqual(list(router.stream_generate("Test Prompt")), ["Sov", "ereign"])
+        self.assertEqual(len(calls), 2)
+        router.close()
+
+class TestAsyncSovereignRouter(unittest.TestCase):
+
+    def test_concurrent_calls_share_client_and_respect_limit(self):
+        """agenerate runs on the caller's loop, one pooled client, at most local_concurrency in flight."""
+        in_flight = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json={'response': 'ok'})
+
+        router = AsyncSovereignRouter(local_concurrency=2, transport=httpx.MockTransport(handler))
+
+        async def main():
+            results = await asyncio.gather(*(router.agenerate(f"p{i}") for i in range(6)))
+            clients = len(router._states)
+            await router.aclose()
+            return results, clients
+
+        results, clients = asyncio.run(main())
+        self.assertEqual(results, ["ok"] * 6)
+        self.assertEqual(clients, 1)
+        self.assertEqual(peak, 2)
+
+    def test_astream_openai(self):
+        sse = b"".join(
+            b"data: " + json.dumps({'choices': [{'delta': {'content': t}}]}).encode() + b"\n\n" for t in ["Hel", "lo"]
+        ) + b"data: [DONE]\n\n"
+        transport, calls = mock_backends(httpx.Response(200, content=sse))
+        router = AsyncSovereignRouter(openai_key="key", transport=transport)
+
+        async def main():
+            chunks = [c async for c in router.astream_generate("Test Prompt")]
+            await router.aclose()
+            return chunks
+
+        self.assertEqual(asyncio.run(main()), ["Hel", "lo"])
+        self.assertTrue(json.loads(calls[0].content)['stream'])
+
+class TestCircuitBreakerRouting(unittest.TestCase):
+
+    def test_open_breaker_skips_primary(self):
+        """After the primary trips its breaker, calls go straight to local without touching it."""
+        print("\n=== TEST: OPEN BREAKER SKIPS PRIMARY ===")
+        local_ok = httpx.Response(200, json={'response': 'Sovereign Response'})
+        transport, calls = mock_backends(httpx.ConnectError("down"), local_ok, local_ok, local_ok)
+        # Error-rate ranking off (max_error_rate=1) so only the breaker decides
+        router = SovereignRouter(openai_key="key", transport=transport,
+                                 policy=RoutingPolicy(max_error_rate=1.0, failure_threshold=1, cooldown=60))
+
+        for _ in range(3):
+            self.assertEqual(router.generate("Test Prompt"), "Sovereign Response")
+
+        self.assertEqual([c.url.host for c in calls], ["api.openai.com", "localhost", "localhost", "localhost"])
+        self.assertEqual(router.policy.snapshot()["primary"]["breaker"]["state"], "open")
+        router.close()
+
+    def test_all_open_fails_fast(self):
+        transport, calls = mock_backends()
+        policy = RoutingPolicy(failure_threshold=1, cooldown=60)
+        policy.record("local", None, False)
+        router = SovereignRouter(transport=transport, policy=policy)
+
+        with self.assertRaises(CircuitOpenError):
+            router.generate("Test Prompt")
+        self.assertEqual(calls, [])
+        router.close()
+
+class TestCompletionCache(unittest.TestCase):
+
+    def test_deterministic_calls_hit_cache_sampled_bypass(self):
+        """temperature=0 is served from disk on repeat; sampled calls always infer."""
+        print("\n=== TEST: COMPLETION CACHE ===")
+        import tempfile
+        from modules.completion_cache import CompletionCache
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = CompletionCache(os.path.join(tmp, "completions.db"))
+            transport, calls = mock_backends(*[httpx.Response(200, json={'response': 'VALID'}) for _ in range(3)])
+            router = SovereignRouter(transport=transport, completion_cache=cache)
+
+            self.assertEqual(router.generate("Verify claim", "oracle", temperature=0), "VALID")
+            self.assertEqual(router.generate("Verify claim", "oracle", temperature=0), "VALID")
+            self.assertEqual(len(calls), 1)
+            self.assertEqual(json.loads(calls[0].content)['options'], {"temperature": 0})
+
+            router.generate("Verify claim", "oracle")
+            router.generate("Verify claim", "oracle", temperature=0.7)
+            self.assertEqual(len(calls), 3)
+            self.assertEqual(cache.stats()["hits"], 1)
+            router.close()
+            cache.close()
+
+    def test_cache_probe_counts_one_lookup_per_call(self):
+        """Probing both backends' keys is one miss, not one per backend."""
+        import tempfile
+        from modules.completion_cache import CompletionCache
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = CompletionCache(os.path.join(tmp, "completions.db"))
+            transport, calls = mock_backends(
+                httpx.Response(200, json={'choices': [{'message': {'content': 'VALID'}}]}))
+            router = SovereignRouter(openai_key="key", transport=transport, completion_cache=cache)
+
+            router.generate("Verify claim", "oracle", temperature=0)
+            router.generate("Verify claim", "oracle", temperature=0)
+            stats = cache.stats()
+            self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+            self.assertEqual(stats["hit_rate"], 0.5)
+            router.close()
+            cache.close()
+
+    def test_cache_io_runs_off_the_event_loop(self):
+        """A slow disk under the completion cache does not stall other coroutines."""
+        import tempfile
+        from modules.completion_cache import CompletionCache
+
+        class SlowDiskCache(CompletionCache):
+            def get_any(self, keys):
+                time.sleep(0.2)
+                return super().get_any(keys)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = SlowDiskCache(os.path.join(tmp, "completions.db"))
+            transport, calls = mock_backends(httpx.Response(200, json={'response': 'VALID'}))
+            router = AsyncSovereignRouter(transport=transport, completion_cache=cache)
+
+            async def main():
+                ticks = 0
+
+                async def ticker():
+                    nonlocal ticks
+                    while True:
+                        await asyncio.sleep(0.01)
+                        ticks += 1
+
+                task = asyncio.ensure_future(ticker())
+                try:
+                    return await router.agenerate("Verify claim", temperature=0), ticks
+                finally:
+                    task.cancel()
+                    await router.aclose()
+
+            response, ticks = asyncio.run(main())
+            self.assertEqual(response, "VALID")
+            self.assertGreater(ticks, 5)
+            cache.close()
+
+class TestLatencyAwareRouting(unittest.TestCase):
+
+    def primed_policy(self, primary_latency, local_latency, samples=20):
+        policy = RoutingPolicy(min_samples=samples)
+        for _ in range(samples):
+            policy.record("primary", primary_latency, True)
+            policy.record("local", local_latency, True)
+        return policy
+
+    def test_hedge_to_local_when_primary_past_p95(self):
+        """A primary stuck past its p95 is raced by local; the faster answer wins."""
+        print("\n=== TEST: HEDGED REQUEST ===")
+        release = asyncio.Event()
+
+        async def handler(request):
+            if request.url.host == "api.openai.com":
+                await release.wait()
+                return httpx.Response(200, json={'choices': [{'message': {'content': 'Colonial Response'}}]})
+            return httpx.Response(200, json={'response': 'Sovereign Response'})
+
+        router = AsyncSovereignRouter(openai_key="key", transport=httpx.MockTransport(handler),
+                                      policy=self.primed_policy(0.02, 0.05))
+
+        async def main():
+            try:
+                return await asyncio.wait_for(router.agenerate("Test Prompt"), 2)
+            finally:
+                release.set()
+                await router.aclose()
+
+        self.assertEqual(asyncio.run(main()), "Sovereign Response")
+        # The abandoned primary contributes its elapsed time as a (censored) latency sample
+        self.assertEqual(router.policy.stats["primary"].samples, 21)
+
+    def test_faster_backend_goes_first(self):
+        transport, calls = mock_backends(httpx.Response(200, json={'response': 'Sovereign Response'}))
+        router = SovereignRouter(openai_key="key", transport=transport, policy=self.primed_policy(0.9, 0.1))
+
+        self.assertEqual(router.generate("Test Prompt"), "Sovereign Response")
+        self.assertEqual([c.url.host for c in calls], ["localhost"])
+        router.close()
 
 if __name__ == "__main__":
     unittest.main()